@@ -0,0 +1,228 @@
+"""A simulated fleet of compute nodes served by local asyncssh servers.
+
+Each simulated node is an SSH server listening on the loopback interface.
+Nodes respond to the commands issued by shinigami (`ps`, `pkill`, and the
+remote collector) with synthetic process data. A client environment is
+written to the state directory so the application can reach the fleet
+without any code changes:
+
+  - `home/.ssh/config` maps each node name to its local port
+  - `home/.ssh/known_hosts` trusts the fleet host key
+  - `bin/sinfo` is a fake `sinfo` executable that lists the fleet nodes
+
+The fleet is intended to run in its own process so the server side CPU
+and memory usage does not skew client side measurements:
+
+    python benchmarks/fleet.py --state-dir /tmp/fleet --nodes 100 --processes 10000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import shlex
+import stat
+import sys
+from pathlib import Path
+from typing import List
+
+import asyncssh
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from shinigami import collector, utils  # noqa: E402
+from shinigami.kill import PS_STATUS_COMMAND  # noqa: E402
+from shinigami.process_table import ProcessTable  # noqa: E402
+from shinigami.state import FINGERPRINT_COMMAND  # noqa: E402
+
+# Message printed to stdout once all servers are listening
+READY_MESSAGE = 'FLEET READY'
+
+# Cluster name used when querying the fake sinfo
+CLUSTER_NAME = 'simulated'
+
+
+def synthetic_ps_output(num_processes: int, orphan_fraction: float = 0.01, seed: int = 0) -> str:
+    """Return synthetic output of `ps -eo pid:10,ppid:10,pgid:10,uid:10,pcpu:6,rss:12,etimes:12,stat:6,cmd:500`
+
+    Args:
+        num_processes: Number of processes to generate
+        orphan_fraction: Fraction of processes that are orphaned user processes
+        seed: Seed for the random number generator
+
+    Returns:
+        The synthetic ps output
+    """
+
+    rng = random.Random(seed)
+    lines = [f'{"PID":>10} {"PPID":>10} {"PGID":>10} {"UID":>10} {"%CPU":>6} {"RSS":>12} {"ELAPSED":>12} {"STAT":<6} CMD']
+    lines.append(f'{1:>10} {0:>10} {1:>10} {0:>10} {0.0:>6} {10240:>12} {86400:>12} {"Ss":<6} /usr/lib/systemd/systemd --switched-root --system')
+    lines.append(f'{2:>10} {1:>10} {2:>10} {0:>10} {0.1:>6} {8192:>12} {86400:>12} {"Ss":<6} /usr/sbin/slurmd -D')
+    for pid in range(3, num_processes + 1):
+        if rng.random() < orphan_fraction:
+            ppid, uid = 1, rng.randint(2000, 2100)
+
+        else:
+            ppid, uid = rng.randint(1, pid - 1), rng.choice((0, 0, 0, rng.randint(2000, 2100)))
+
+        pcpu, rss, etime = round(rng.uniform(0, 100), 1), rng.randint(0, 4 * 10 ** 6), rng.randint(0, 86400)
+        cmd = f'/opt/apps/simulated/bin/worker --task {rng.randint(0, 10 ** 6)} --input /scratch/data/{rng.randint(0, 999):03d}.dat'
+        lines.append(f'{pid:>10} {ppid:>10} {pid:>10} {uid:>10} {pcpu:>6} {rss:>12} {etime:>12} {"S":<6} {cmd}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class SimulatedNodeServer(asyncssh.SSHServer):
+    """SSH server callbacks for a simulated node"""
+
+    def __init__(self, latency: float, failure_rate: float) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    def connection_made(self, conn: asyncssh.SSHServerConnection) -> None:
+        # Simulate transient failures by dropping a fraction of incoming connections
+        if random.random() < self.failure_rate:
+            conn.close()
+
+    async def begin_auth(self, username: str) -> bool:
+        # Simulate the additional round trip of user authentication
+        await asyncio.sleep(self.latency)
+        return False
+
+
+class SimulatedFleet:
+    """Collection of simulated compute nodes"""
+
+    def __init__(
+        self,
+        state_dir: Path,
+        num_nodes: int,
+        num_processes: int,
+        latency: float = 0.0,
+        failure_rate: float = 0.0
+    ) -> None:
+        """Configure a new fleet
+
+        Args:
+            state_dir: Directory to write the client environment to
+            num_nodes: Number of simulated nodes
+            num_processes: Number of processes reported by each node
+            latency: Seconds of simulated network latency per command and per login
+            failure_rate: Probability that an incoming connection is dropped
+        """
+
+        self.state_dir = Path(state_dir)
+        self.nodes = [f'sim{i:05d}' for i in range(num_nodes)]
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.ps_output = synthetic_ps_output(num_processes)
+        self.process_table = ProcessTable.from_ps_output(self.ps_output)
+        self._servers: List[asyncssh.SSHAcceptor] = []
+
+    @property
+    def home_dir(self) -> Path:
+        """Home directory containing the client SSH configuration"""
+
+        return self.state_dir / 'home'
+
+    @property
+    def bin_dir(self) -> Path:
+        """Directory containing the fake `sinfo` executable"""
+
+        return self.state_dir / 'bin'
+
+    async def start(self) -> None:
+        """Start an SSH server for each node and write the client environment"""
+
+        host_key = asyncssh.generate_private_key('ssh-ed25519')
+        ports = []
+        for _ in self.nodes:
+            server = await asyncssh.listen(
+                '127.0.0.1', 0,
+                server_host_keys=[host_key],
+                server_factory=lambda: SimulatedNodeServer(self.latency, self.failure_rate),
+                process_factory=self._handle_process)
+
+            self._servers.append(server)
+            ports.append(server.sockets[0].getsockname()[1])
+
+        ssh_dir = self.home_dir / '.ssh'
+        ssh_dir.mkdir(parents=True, exist_ok=True)
+        (ssh_dir / 'known_hosts').write_text(f'* {host_key.export_public_key().decode().strip()}\n')
+        (ssh_dir / 'config').write_text(''.join(
+            f'Host {node}\n    HostName 127.0.0.1\n    Port {port}\n' for node, port in zip(self.nodes, ports)))
+
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        nodes_path = self.state_dir / 'nodes.txt'
+        nodes_path.write_text(''.join(f'{node} idle\n' for node in self.nodes))
+        sinfo_path = self.bin_dir / 'sinfo'
+        sinfo_path.write_text(f'#!/bin/sh\ncat {nodes_path}\n')
+        sinfo_path.chmod(sinfo_path.stat().st_mode | stat.S_IEXEC)
+
+    async def stop(self) -> None:
+        """Stop all node servers"""
+
+        for server in self._servers:
+            server.close()
+
+        await asyncio.gather(*(server.wait_closed() for server in self._servers))
+
+    async def _handle_process(self, process: asyncssh.SSHServerProcess) -> None:
+        """Respond to a command issued by the client"""
+
+        command = process.command or ''
+        await asyncio.sleep(self.latency)
+
+        if command == PS_STATUS_COMMAND:
+            # Signalled processes always exit, so no processes survive termination
+            process.exit(0)
+
+        elif command.startswith('ps '):
+            process.stdout.write(self.ps_output)
+            process.exit(0)
+
+        elif command == FINGERPRINT_COMMAND:
+            # Process data never changes, so the fingerprint is constant
+            roots = (pid for pid, ppid in zip(self.process_table.pid, self.process_table.ppid) if ppid == 1)
+            process.stdout.write('00000000-0000-4000-8000-000000000000\n' + ''.join(f'{pid} Sat Oct 17 00:00:00 2026\n' for pid in roots))
+            process.exit(0)
+
+        elif command.startswith('pkill '):
+            process.exit(0)
+
+        elif command.startswith('python3 - '):
+            # Emulate the remote collector by filtering the synthetic process table
+            await process.stdin.read()
+            options = json.loads(shlex.split(command)[2])
+            table = utils.exclude_active_slurm_users(self.process_table)
+            table = utils.include_orphaned_processes(table)
+            table = utils.include_user_whitelist(table, options['uid_whitelist'])
+            rows = (
+                f"{row['PID']} {row['PPID']} {row['PGID']} {row['UID']} {row['PCPU']} {row['RSS']} {row['ETIME']} {row['STATE']} {row['CMD']}"
+                for row in table.rows())
+
+            process.stdout.write('\n'.join([collector.HEADER, *rows]) + '\n')
+            process.exit(0)
+
+        else:
+            process.stderr.write(f'Command not supported by the simulated fleet: {command!r}\n')
+            process.exit(127)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run a fleet until the process is terminated"""
+
+    fleet = SimulatedFleet(args.state_dir, args.nodes, args.processes, args.latency, args.failure_rate)
+    await fleet.start()
+    print(READY_MESSAGE, flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a simulated fleet of compute nodes.')
+    parser.add_argument('--state-dir', type=Path, required=True, help='directory to write the client environment to')
+    parser.add_argument('--nodes', type=int, default=100, help='number of simulated nodes')
+    parser.add_argument('--processes', type=int, default=10_000, help='number of processes per node')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated latency in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='probability of dropping a connection')
+    asyncio.run(serve(parser.parse_args()))
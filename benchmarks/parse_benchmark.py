@@ -0,0 +1,97 @@
+"""Benchmark parsers for the process data returned by `ps`.
+
+Synthetic `ps` output is parsed using each available parser and the best
+wall time and peak traced memory are reported for each:
+
+  - `read_fwf`: the fixed width DataFrame parser (requires pandas)
+  - `buffered`: `ProcessTable.from_ps_output` on the fully buffered output
+  - `streaming`: `StreamingPsParser` fed in chunks, keeping commands for candidate rows only
+
+    python benchmarks/parse_benchmark.py --processes 10000 50000 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.fleet import synthetic_ps_output  # noqa: E402
+from shinigami.process_table import ProcessTable, StreamingPsParser  # noqa: E402
+from shinigami.utils import STREAM_CHUNK_SIZE, _keeps_command  # noqa: E402
+
+
+def parse_read_fwf(output: str) -> Any:
+    """Parse output into a DataFrame using fixed width columns"""
+
+    import pandas as pd
+
+    return pd.read_fwf(StringIO(output), widths=[11, 11, 11, 11, 7, 13, 13, 7, 500])
+
+
+def parse_buffered(output: str) -> ProcessTable:
+    """Parse fully buffered output into a table"""
+
+    return ProcessTable.from_ps_output(output)
+
+
+def parse_streaming(output: str) -> ProcessTable:
+    """Parse output fed to a streaming parser in channel sized chunks"""
+
+    parser = StreamingPsParser(keep_cmd=_keeps_command)
+    for start in range(0, len(output), STREAM_CHUNK_SIZE):
+        parser.feed(output[start:start + STREAM_CHUNK_SIZE])
+
+    return parser.close()
+
+
+def measure(parse: Callable[[str], Any], output: str, repeat: int) -> Dict[str, float]:
+    """Return the best wall time and the peak traced memory of a parser"""
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(output)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = parse(output)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark parsers for ps output.')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='number of processes to parse')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed repetitions per parser')
+    args = parser.parse_args()
+
+    parsers = {'buffered': parse_buffered, 'streaming': parse_streaming}
+    try:
+        import pandas  # noqa: F401
+        parsers = {'read_fwf': parse_read_fwf, **parsers}
+
+    except ImportError:
+        print('pandas is not installed, skipping the read_fwf parser', file=sys.stderr)
+
+    results = []
+    for num_processes in args.processes:
+        output = synthetic_ps_output(num_processes)
+        for name, parse in parsers.items():
+            result = {'parser': name, 'processes': num_processes, **measure(parse, output, args.repeat)}
+            results.append(result)
+            print(f'{name:>10} {num_processes:>8} processes: {result["seconds"] * 1000:8.1f} ms, peak {result["peak_bytes"] / 2 ** 20:7.1f} MiB')
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Benchmark the application against a simulated fleet of compute nodes.
+
+A simulated fleet (see `fleet.py`) is started in a subprocess and the
+`Application.scan` and `Application.terminate` commands are run against it
+in the current process. Client side throughput, per-node latency, peak
+memory, and CPU time are written to a JSON results file so results can be
+compared across versions:
+
+    python benchmarks/run_benchmarks.py --nodes 200 --processes 10000 -m 50 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.fleet import CLUSTER_NAME, READY_MESSAGE  # noqa: E402
+from shinigami import __version__  # noqa: E402
+from shinigami.cli import Application  # noqa: E402
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the given percentile of a list of values using the nearest rank method"""
+
+    if not values:
+        return float('nan')
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def start_fleet(args: argparse.Namespace, state_dir: Path) -> subprocess.Popen:
+    """Start a simulated fleet in a subprocess and wait until it is ready"""
+
+    fleet = subprocess.Popen(
+        [
+            sys.executable, str(Path(__file__).with_name('fleet.py')),
+            '--state-dir', str(state_dir),
+            '--nodes', str(args.nodes),
+            '--processes', str(args.processes),
+            '--latency', str(args.latency),
+            '--failure-rate', str(args.failure_rate),
+        ],
+        stdout=subprocess.PIPE, text=True)
+
+    if fleet.stdout.readline().strip() != READY_MESSAGE:
+        fleet.kill()
+        raise RuntimeError('Simulated fleet failed to start')
+
+    return fleet
+
+
+def run_case(name: str, command: Callable[[Path], Awaitable[None]], metrics_path: Path) -> Dict[str, Any]:
+    """Run a single benchmark case and summarize its measurements
+
+    Args:
+        name: The case name
+        command: Coroutine function that runs the application and writes metrics to the given path
+        metrics_path: Path of the JSON lines metrics file
+
+    Returns:
+        A dictionary of benchmark results
+    """
+
+    # Worker processes (see `--workers`) are reaped before the case ends and are included in the child usage
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+    wall_start = time.perf_counter()
+    asyncio.run(command(metrics_path))
+    wall_time = time.perf_counter() - wall_start
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    children_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    records = [json.loads(line) for line in metrics_path.read_text().splitlines()]
+    nodes = [record for record in records if record['type'] == 'node']
+    latencies = [record['duration'] - record['timings'].get('queue', 0) for record in nodes]
+
+    phase_totals: Dict[str, float] = {}
+    for record in nodes:
+        for phase, seconds in record['timings'].items():
+            phase_totals[phase] = phase_totals.get(phase, 0) + seconds
+
+    return {
+        'case': name,
+        'nodes': len(nodes),
+        'failed_nodes': sum(record['error'] is not None for record in nodes),
+        'wall_time': wall_time,
+        'nodes_per_second': len(nodes) / wall_time,
+        'latency_p50': percentile(latencies, 0.50),
+        'latency_p99': percentile(latencies, 0.99),
+        'phase_seconds': phase_totals,
+        'bytes_received': sum(record['bytes_received'] for record in nodes),
+        'cpu_user': usage_end.ru_utime - usage_start.ru_utime + children_end.ru_utime - children_start.ru_utime,
+        'cpu_system': usage_end.ru_stime - usage_start.ru_stime + children_end.ru_stime - children_start.ru_stime,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': usage_end.ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    """Run all benchmark cases and write results to disk"""
+
+    parser = argparse.ArgumentParser(description='Benchmark shinigami against a simulated fleet of compute nodes.')
+    parser.add_argument('--nodes', type=int, default=100, help='number of simulated nodes')
+    parser.add_argument('--processes', type=int, default=10_000, help='number of processes per node')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated latency in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='probability of dropping a connection')
+    parser.add_argument('-m', dest='max_concurrent', type=int, default=50, help='maximum concurrent SSH connections')
+    parser.add_argument('--remote-filter', action='store_true', help='benchmark with on-node process filtering')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes used by the scan case')
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results.json'), help='path of the JSON results file')
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        state_dir = Path(tmp)
+        fleet = start_fleet(args, state_dir)
+        try:
+            # Point the application at the simulated fleet's SSH config and fake sinfo
+            os.environ['HOME'] = str(state_dir / 'home')
+            os.environ['PATH'] = f'{state_dir / "bin"}{os.pathsep}{os.environ["PATH"]}'
+            os.environ.pop('SSH_AUTH_SOCK', None)
+            nodes = (state_dir / 'nodes.txt').read_text().split()[::2]
+
+            common = dict(
+                uid_whitelist=[[1000, 100000]],
+                max_concurrent=args.max_concurrent,
+                ssh_timeout=30,
+                debug=False,
+                remote_filter=args.remote_filter)
+
+            async def scan(metrics_path: Path) -> None:
+                await Application.scan(clusters=[CLUSTER_NAME], ignore_nodes=[], metrics_file=metrics_path, workers=args.workers, **common)
+
+            async def terminate(metrics_path: Path) -> None:
+                await Application.terminate(nodes=nodes, metrics_file=metrics_path, **common)
+
+            results = [
+                run_case('scan', scan, state_dir / 'scan.jsonl'),
+                run_case('terminate', terminate, state_dir / 'terminate.jsonl'),
+            ]
+
+        finally:
+            fleet.terminate()
+            fleet.wait()
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'timestamp': time.time(),
+        'parameters': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        'results': results,
+    }
+
+    args.output.write_text(json.dumps(report, indent=2))
+    for result in results:
+        print(
+            f"{result['case']:>10}: {result['nodes_per_second']:8.1f} nodes/s, "
+            f"p50 {result['latency_p50'] * 1000:7.1f} ms, p99 {result['latency_p99'] * 1000:7.1f} ms, "
+            f"cpu {result['cpu_user'] + result['cpu_system']:6.2f} s, peak rss {result['peak_rss_mb']:6.1f} MB, "
+            f"failed {result['failed_nodes']}")
+
+
+if __name__ == '__main__':
+    main()
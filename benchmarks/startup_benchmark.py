@@ -0,0 +1,83 @@
+"""Benchmark the startup cost of the command-line application.
+
+The `shinigami.cli` module is imported in a fresh interpreter using
+`python -X importtime` and the best cumulative import time is reported,
+along with the slowest top level imports and the wall time of lightweight
+commands such as `shinigami --version`:
+
+    python benchmarks/startup_benchmark.py --repeat 10
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Commands run by health checks that should not load SSH or dataframe support
+COMMANDS = (['--version'], ['--help'], ['scan', '--help'])
+
+
+def import_times(module: str = 'shinigami.cli') -> Dict[str, int]:
+    """Import a module in a fresh interpreter and return the cumulative import time of each module
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        A dictionary mapping module names to cumulative import times in microseconds
+    """
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def command_seconds(args: List[str]) -> float:
+    """Return the wall time of running the application with the given arguments"""
+
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', f'from shinigami.cli import Application; Application.execute({args!r})'],
+        capture_output=True, cwd=ROOT_DIR)
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the startup cost of the command-line application.')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed repetitions per measurement')
+    parser.add_argument('--top', type=int, default=10, help='number of the slowest imports to report')
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times['shinigami.cli'])
+    print(f'import shinigami.cli: {best["shinigami.cli"] / 1000:8.1f} ms')
+    for name, micros in sorted(best.items(), key=lambda item: -item[1])[1:args.top + 1]:
+        print(f'  {name:<40} {micros / 1000:8.1f} ms')
+
+    results = {'import_ms': best['shinigami.cli'] / 1000, 'commands': dict()}
+    for command in COMMANDS:
+        seconds = min(command_seconds(command) for _ in range(args.repeat))
+        results['commands'][' '.join(command)] = seconds * 1000
+        print(f'shinigami {" ".join(command):<20} {seconds * 1000:8.1f} ms')
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
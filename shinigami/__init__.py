@@ -3,10 +3,26 @@ on Slurm based compute nodes. The application scans for and terminates any
 running processes not associated with a currently running Slurm job.
 """
 
-import importlib.metadata
+from typing import Any
 
-try:
-    __version__ = importlib.metadata.version('crc-shinigami')
 
-except importlib.metadata.PackageNotFoundError:  # pragma: no cover
-    __version__ = '0.0.0'
+def __getattr__(name: str) -> Any:
+    """Resolve the package version on first access
+
+    Reading the installed package metadata is comparatively slow, so it is
+    deferred until the version is requested (e.g., by `shinigami --version`).
+    """
+
+    if name != '__version__':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    import importlib.metadata
+
+    try:
+        version = importlib.metadata.version('crc-shinigami')
+
+    except importlib.metadata.PackageNotFoundError:  # pragma: no cover
+        version = '0.0.0'
+
+    globals()['__version__'] = version
+    return version
@@ -4,14 +4,49 @@ import asyncio
 import inspect
 import logging
 import logging.config
+import socket
 import sys
-from argparse import ArgumentParser, RawTextHelpFormatter
+import time
+from argparse import SUPPRESS, Action, ArgumentParser, Namespace, RawTextHelpFormatter
 from json import loads
-from typing import List, Collection, Union
+from pathlib import Path
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
-from asyncssh import SSHClientConnectionOptions
+from . import jobs, utils
+from .intervals import IntervalSet, IntervalSpec
+from .kill import KillEngine
+from .local import LocalKillEngine, terminate_local_processes
+from .metrics import MetricsRecorder, NodeMetrics
+from .policy import PolicySet, ProcessPolicy
+from .pool import ConnectionPool
+from .priority import NodePrioritizer
+from .process_table import ProcessTable
+from .report import REPORT_FORMATS, NodeResult, ResultWriter, open_report
+from .scheduler import AdaptiveLimiter, RetryPolicy, Scheduler
+from .state import NodeStateStore
+from .transport import SSHTransport, Transport
+from .workers import Shard, ShardResult, run_sharded, shard_nodes, split_budget
 
-from . import __version__, utils
+# SSH support is only imported by commands that open connections to keep CLI startup fast
+if TYPE_CHECKING:  # pragma: nocover
+    from asyncssh import SSHClientConnectionOptions
+
+
+class VersionAction(Action):
+    """Print the package version and exit
+
+    Unlike the builtin `version` action, the version is only resolved when
+    the option is used.
+    """
+
+    def __init__(self, option_strings: List[str], dest: str = SUPPRESS, **kwargs) -> None:
+        super().__init__(option_strings, dest, nargs=0, default=SUPPRESS, help="show program's version number and exit", **kwargs)
+
+    def __call__(self, parser: ArgumentParser, namespace: Namespace, values: Any, option_string: Optional[str] = None) -> None:
+        from . import __version__
+
+        parser._print_message(f'{__version__}\n', sys.stdout)
+        parser.exit()
 
 
 class Parser(ArgumentParser):
@@ -23,33 +58,103 @@ class Parser(ArgumentParser):
         # Configure the top level parser
         super().__init__(prog='shinigami', description='Scan Slurm compute nodes and terminate orphan processes.')
         subparsers = self.add_subparsers(required=True, parser_class=ArgumentParser)
-        self.add_argument('--version', action='version', version=__version__)
+        self.add_argument('--version', action=VersionAction)
+
+        # The `base` parser holds argument definitions shared by all commands
+        base = ArgumentParser(add_help=False)
+        collection_group = base.add_argument_group('process collection options')
+        collection_group.add_argument('--config', dest='config_file', metavar='PATH', type=Path, default=None, help='load the filter rules of each cluster from the given JSON settings file')
+        collection_group.add_argument('--job-source', dest='job_source', choices=jobs.JOB_SOURCES, default='process', help='how to identify users running Slurm jobs (Default: process)')
+
+        threshold_group = base.add_argument_group('resource threshold options')
+        threshold_group.add_argument('--min-age', dest='min_age', metavar='SEC', type=float, default=0, help='only terminate processes running for at least the given number of seconds (Default: 0)')
+        threshold_group.add_argument('--min-cpu', dest='min_cpu', metavar='PCT', type=float, default=None, help='only terminate processes using at least the given percentage of a core (or --min-rss memory)')
+        threshold_group.add_argument('--min-rss', dest='min_rss', metavar='MIB', type=float, default=None, help='only terminate processes using at least the given MiB of resident memory (or --min-cpu CPU)')
+
+        kill_group = base.add_argument_group('termination options')
+        kill_group.add_argument('--grace-period', dest='grace_period', metavar='SEC', type=float, default=5, help='seconds to wait after SIGTERM before sending SIGKILL, or 0 to send SIGKILL immediately (Default: 5)')
+
+        metrics_group = base.add_argument_group('metrics options')
+        metrics_group.add_argument('--metrics-file', dest='metrics_file', metavar='PATH', type=Path, default=None, help='append per-node timing metrics to the given JSON lines file')
+        metrics_group.add_argument('--prometheus-file', dest='prometheus_file', metavar='PATH', type=Path, default=None, help='write sweep metrics to the given Prometheus textfile')
+
+        report_group = base.add_argument_group('report options')
+        report_group.add_argument('--report-file', dest='report_file', metavar='PATH', default=None, help='append a result for each node to the given file as soon as it finishes (use - for stdout)')
+        report_group.add_argument('--report-format', dest='report_format', choices=REPORT_FORMATS, default='ndjson', help='format of the node results report (Default: ndjson)')
+
+        debug_group = base.add_argument_group('debugging options')
+        debug_group.add_argument('--debug', action='store_true', help='run the application in debug mode')
+        debug_group.add_argument('-v', action='count', dest='verbosity', default=0, help='set verbosity to warning (-v), info (-vv), or debug (-vvv)')
 
-        # The `common` parser holds reusable argument definitions
-        common = ArgumentParser(add_help=False)
+        # The `common` parser holds argument definitions shared by commands that connect to remote nodes
+        common = ArgumentParser(add_help=False, parents=[base])
         ssh_group = common.add_argument_group('ssh options')
         ssh_group.add_argument('-m', dest='max_concurrent', type=int, default=1, help='maximum concurrent SSH connections (Default: 1)')
         ssh_group.add_argument('-t', dest='ssh_timeout', type=int, default=120, help='SSH connection timeout in seconds (Default: 120)')
+        ssh_group.add_argument('--group-limit', dest='group_limit', type=int, default=None, help='maximum concurrent SSH connections per node group')
+        ssh_group.add_argument('--group-pattern', dest='group_pattern', metavar='REGEX', default=None, help='regex identifying the group (e.g., rack) of each node from its name')
+        ssh_group.add_argument('--adaptive', action='store_true', help='adapt the number of concurrent SSH connections to observed latency and errors, up to the -m limit')
+        ssh_group.add_argument('--min-concurrent', dest='min_concurrent', metavar='N', type=int, default=1, help='minimum concurrent SSH connections in adaptive mode (Default: 1)')
+        ssh_group.add_argument('--remote-filter', action='store_true', help='filter processes on the node (requires python3 on compute nodes)')
+        ssh_group.add_argument('--session', action='store_true', help='run all commands for a node through a single remote shell')
 
-        debug_group = common.add_argument_group('debugging options')
-        debug_group.add_argument('--debug', action='store_true', help='run the application in debug mode')
-        debug_group.add_argument('-v', action='count', dest='verbosity', default=0, help='set verbosity to warning (-v), info (-vv), or debug (-vvv)')
+        retry_group = common.add_argument_group('retry options')
+        retry_group.add_argument('--retries', metavar='N', type=int, default=2, help='retry nodes that fail with a network error up to N times (Default: 2)')
+        retry_group.add_argument('--retry-backoff', dest='retry_backoff', metavar='SEC', type=float, default=1, help='maximum delay before the first retry, doubled for each further retry (Default: 1)')
+        retry_group.add_argument('--deadline', metavar='SEC', type=float, default=None, help='fail any node not finished within SEC seconds of the sweep starting')
+        retry_group.add_argument('--probe-timeout', dest='probe_timeout', metavar='SEC', type=float, default=None, help='check the SSH port (as resolved from the SSH config) is reachable within SEC seconds before connecting')
+
+        priority_group = common.add_argument_group('prioritization options')
+        priority_group.add_argument('--prioritize', action='store_true', help='visit nodes with recently ended jobs, orphans on their last visit, or an idle state first')
+        priority_group.add_argument('--ended-window', dest='ended_window', metavar='SEC', type=float, default=3600, help='seconds to look back for ended jobs when prioritizing nodes (Default: 3600)')
+
+        # The `scan_common` parser holds argument definitions shared by the `scan` and `daemon` commands
+        scan_common = ArgumentParser(add_help=False)
+        scan_group = scan_common.add_argument_group('scanning options')
+        scan_group.add_argument('-c', dest='clusters', metavar='CLUS', nargs='+', required=True, help='Slurm cluster name(s) to scan')
+        scan_group.add_argument('-i', dest='ignore_nodes', metavar='NODE', nargs='*', default=[], help='ignore the given node(s)')
+        scan_group.add_argument('-u', dest='uid_whitelist', metavar='UID', nargs='+', type=loads, default=[0], help='only terminate processes owned by the given user IDs')
+        scan_group.add_argument('-x', dest='uid_exclude', metavar='UID', nargs='+', type=loads, default=[], help='never terminate processes owned by the given user IDs')
+        scan_group.add_argument('--parallel-clusters', action='store_true', help='scan all clusters concurrently using a single work queue')
+        scan_group.add_argument('--workers', metavar='N', type=int, default=1, help='shard nodes across N processes that split the -m connection budget (Default: 1)')
+        scan_group.add_argument('--skip-states', metavar='STATE', nargs='*', default=list(utils.DEFAULT_SKIP_STATES), help='skip nodes in the given Slurm state(s)')
+
+        cache_group = scan_common.add_argument_group('node cache options')
+        cache_group.add_argument('--node-cache', dest='node_cache', metavar='PATH', type=Path, default=None, help='cache the cluster node list at the given path')
+        cache_group.add_argument('--node-cache-ttl', dest='node_cache_ttl', metavar='SEC', type=float, default=300, help='maximum age of the cached node list in seconds (Default: 300)')
+
+        state_group = scan_common.add_argument_group('incremental sweep options')
+        state_group.add_argument('--state-file', dest='state_file', metavar='PATH', type=Path, default=None, help='persist per-node scan state and skip nodes that are unchanged since their last clean scan')
+        state_group.add_argument('--max-backoff', dest='max_backoff', metavar='SEC', type=float, default=3600, help='maximum delay between visits to a clean node (Default: 3600)')
 
         # Subparser for the `Application.scan` method
         scan = subparsers.add_parser(
-            'scan', parents=[common], formatter_class=RawTextHelpFormatter,
+            'scan', parents=[common, scan_common], formatter_class=RawTextHelpFormatter,
             help='terminate processes on one or more clusters',
             description=(
                 "The `scan` function automatically terminates orphaned processes on all compute nodes in a Slurm cluster.\n"
                 "It is provided as a shorthand alternative to calling the `terminate` command with manually defined node names.\n\n"
                 "Slurm nodes are identified using the slurm installation on the current machine.\n"
-                "User IDs can be specified individually (e.g. `-u 1000 1001 1002 1003`) or as ranges (e.g. `-u 1000 [1001,1003]`)."))
+                "User IDs can be specified individually (e.g. `-u 1000 1001 1002 1003`) or as ranges (e.g. `-u 1000 [1001,1003]`).\n"
+                "Ranges include the lower bound and exclude the upper bound. User IDs given with `-x` are removed from the whitelist."))
 
         scan.set_defaults(callable=Application.scan)
-        scan_group = scan.add_argument_group('scanning options')
-        scan_group.add_argument('-c', dest='clusters', metavar='CLUS', nargs='+', required=True, help='Slurm cluster name(s) to scan')
-        scan_group.add_argument('-i', dest='ignore_nodes', metavar='NODE', nargs='*', default=[], help='ignore the given node(s)')
-        scan_group.add_argument('-u', dest='uid_whitelist', metavar='UID', nargs='+', type=loads, default=[0], help='only terminate processes owned by the given user IDs')
+
+        # Subparser for the `Application.daemon` method
+        daemon = subparsers.add_parser(
+            'daemon', parents=[common, scan_common], formatter_class=RawTextHelpFormatter,
+            help='repeatedly scan one or more clusters using persistent connections',
+            description=(
+                "The `daemon` function runs the `scan` command on a fixed interval.\n"
+                "SSH connections to compute nodes are kept open between sweeps and reused.\n"
+                "Idle connections are closed automatically and failed connections are retried with exponential backoff."))
+
+        daemon.set_defaults(callable=Application.daemon)
+        daemon_group = daemon.add_argument_group('daemon options')
+        daemon_group.add_argument('--interval', metavar='SEC', type=float, default=300, help='seconds between the start of consecutive sweeps (Default: 300)')
+        daemon_group.add_argument('--idle-timeout', dest='idle_timeout', metavar='SEC', type=float, default=900, help='close connections unused for this many seconds (Default: 900)')
+        daemon_group.add_argument('--keepalive', dest='keepalive_interval', metavar='SEC', type=float, default=60, help='SSH keepalive interval in seconds (Default: 60)')
+        daemon_group.add_argument('--pool-size', dest='pool_size', metavar='N', type=int, default=None, help='maximum number of open connections')
 
         # Subparser for the `Application.terminate` method
         terminate = subparsers.add_parser(
@@ -58,15 +163,51 @@ class Parser(ArgumentParser):
             description=(
                 "Automatically terminate orphaned processes on one or more Slurm compute nodes.\n\n"
                 "Processes are only terminated under the following conditions:\n"
-                f"    1. The process belongs to a process tree parented by init (PID {utils.INIT_PROCESS_ID})\n"
+                f"    1. The process belongs to a process tree parented by init (PID {utils.INIT_PROCESS_ID}) or a subreaper\n"
                 "    2. The associated user ID is in the given UID whitelist\n"
                 "    3. The user is not running any Slurm jobs on the parent machine\n\n"
-                "User IDs can be specified individually (e.g. `-u 1000 1001 1002 1003`) or as ranges (e.g. `-u 1000 [1001,1003]`)."))
+                "User IDs can be specified individually (e.g. `-u 1000 1001 1002 1003`) or as ranges (e.g. `-u 1000 [1001,1003]`).\n"
+                "Ranges include the lower bound and exclude the upper bound. User IDs given with `-x` are removed from the whitelist."))
 
         terminate.set_defaults(callable=Application.terminate)
         terminate_group = terminate.add_argument_group('termination options')
         terminate_group.add_argument('-n', dest='nodes', metavar='NODE', nargs='+', required=True, help='the DNS name(s) of the node(s) to terminate')
         terminate_group.add_argument('-u', dest='uid_whitelist', metavar='UID', nargs='+', type=loads, default=[0], help='only terminate processes owned by the given user IDs')
+        terminate_group.add_argument('-x', dest='uid_exclude', metavar='UID', nargs='+', type=loads, default=[], help='never terminate processes owned by the given user IDs')
+
+        # Subparser for the `Application.local` method
+        local = subparsers.add_parser(
+            'local', parents=[base], formatter_class=RawTextHelpFormatter,
+            help='terminate processes on the current machine',
+            description=(
+                "Terminate orphaned processes on the machine running the command (e.g., from a Slurm epilog or a systemd timer).\n"
+                "Process data is read directly from /proc and no SSH connections are opened.\n"
+                "Processes are selected using the same conditions as the `terminate` command.\n\n"
+                "User IDs can be specified individually (e.g. `-u 1000 1001 1002 1003`) or as ranges (e.g. `-u 1000 [1001,1003]`).\n"
+                "Ranges include the lower bound and exclude the upper bound. User IDs given with `-x` are removed from the whitelist."))
+
+        local.set_defaults(callable=Application.local)
+        local_group = local.add_argument_group('local options')
+        local_group.add_argument('-u', dest='uid_whitelist', metavar='UID', nargs='+', type=loads, default=[0], help='only terminate processes owned by the given user IDs')
+        local_group.add_argument('-x', dest='uid_exclude', metavar='UID', nargs='+', type=loads, default=[], help='never terminate processes owned by the given user IDs')
+
+    def parse_known_args(self, args: Optional[List[str]] = None, namespace: Optional[Namespace] = None) -> Tuple[Namespace, List[str]]:
+        """Parse command line arguments and combine UID arguments into a single interval set
+
+        Args:
+            args: Optionally parse the given arguments instead of the command line
+            namespace: Optional namespace to populate with parsed values
+
+        Returns:
+            The parsed arguments and a list of unrecognized arguments
+        """
+
+        namespace, extras = super().parse_known_args(args, namespace)
+        if hasattr(namespace, 'uid_whitelist'):
+            # Exclusions are also kept so they can be applied to whitelists defined in a settings file
+            namespace.uid_whitelist = IntervalSet(namespace.uid_whitelist, exclude=namespace.uid_exclude)
+
+        return namespace, extras
 
     def error(self, message: str) -> None:
         """Print a usage message and exits the application
@@ -86,7 +227,7 @@ class Application:
     """Entry point for instantiating and executing the application"""
 
     @staticmethod
-    def _configure_logging(verbosity: int) -> None:
+    def _configure_logging(verbosity: int, console_stream: str = 'ext://sys.stdout') -> None:
         """Configure Python logging
 
         Configured loggers include the following:
@@ -103,6 +244,7 @@ class Application:
 
         Args:
             verbosity: The console verbosity level
+            console_stream: The stream console messages are written to (in `logging.config` notation)
         """
 
         console_log_level = {
@@ -126,7 +268,7 @@ class Application:
             'handlers': {
                 'console_handler': {
                     'class': 'logging.StreamHandler',
-                    'stream': 'ext://sys.stdout',
+                    'stream': console_stream,
                     'formatter': 'console_formatter',
                     'level': console_log_level
                 },
@@ -147,10 +289,43 @@ class Application:
     async def scan(
         clusters: Collection[str],
         ignore_nodes: Collection[str],
-        uid_whitelist: Collection[Union[int, List[int]]],
+        uid_whitelist: utils.UIDWhitelist,
         max_concurrent: int,
         ssh_timeout: int,
-        debug: bool
+        debug: bool,
+        group_limit: Optional[int] = None,
+        group_pattern: Optional[str] = None,
+        parallel_clusters: bool = False,
+        skip_states: Collection[str] = utils.DEFAULT_SKIP_STATES,
+        node_cache: Optional[Path] = None,
+        node_cache_ttl: float = 300,
+        remote_filter: bool = False,
+        session: bool = False,
+        metrics_file: Optional[Path] = None,
+        prometheus_file: Optional[Path] = None,
+        pool: Optional[ConnectionPool] = None,
+        job_source: str = 'process',
+        state_file: Optional[Path] = None,
+        max_backoff: float = 3600,
+        adaptive: bool = False,
+        min_concurrent: int = 1,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retries: int = 2,
+        retry_backoff: float = 1,
+        deadline: Optional[float] = None,
+        probe_timeout: Optional[float] = None,
+        grace_period: float = 5,
+        report_file: Optional[str] = None,
+        report_format: str = 'ndjson',
+        config_file: Optional[Path] = None,
+        uid_exclude: Collection[IntervalSpec] = (),
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None,
+        prioritize: bool = False,
+        ended_window: float = 3600,
+        workers: int = 1,
+        verbosity: int = 0
     ) -> None:
         """Terminate orphaned processes on all clusters/nodes configured in application settings.
 
@@ -161,50 +336,881 @@ class Application:
             max_concurrent: Maximum number of concurrent ssh connections
             ssh_timeout: Timeout for SSH connections
             debug: Optionally log but do not terminate processes
+            group_limit: Maximum number of concurrent ssh connections per node group
+            group_pattern: Regex used to derive the group of each node from its name
+            parallel_clusters: Scan all clusters concurrently instead of one after another
+            skip_states: Skip nodes in any of the given Slurm states
+            node_cache: Optional path used to cache the cluster node list
+            node_cache_ttl: Maximum age of the cached node list in seconds
+            remote_filter: Filter process data on each node instead of fetching the full process table
+            session: Run all commands for a node through a single remote shell
+            metrics_file: Optional path of a JSON lines file to append metrics to
+            prometheus_file: Optional path of a Prometheus textfile to write sweep metrics to
+            pool: Optionally reuse connections from a connection pool
+            job_source: Name of the source used to identify users running Slurm jobs
+            state_file: Optional path used to persist per-node scan state between sweeps
+            max_backoff: Maximum delay in seconds between visits to a clean node
+            adaptive: Adapt the number of concurrent ssh connections to observed latency and errors
+            min_concurrent: Minimum number of concurrent ssh connections in adaptive mode
+            limiter: Optionally reuse an existing adaptive limiter (takes precedence over `adaptive`)
+            retries: Maximum number of retries for nodes failing with a network error
+            retry_backoff: Maximum delay in seconds before the first retry
+            deadline: Optional number of seconds after which unfinished nodes fail
+            probe_timeout: Optionally check the SSH port of each node is reachable within the given seconds before connecting
+            grace_period: Seconds to wait after SIGTERM before sending SIGKILL (0 sends SIGKILL immediately)
+            report_file: Optional path of a file to append node results to (`-` for stdout)
+            report_format: Format of the node results report
+            config_file: Optional path of a JSON settings file defining the filter rules of each cluster
+            uid_exclude: User IDs excluded from every whitelist, including those defined in `config_file`
+            min_age: Only terminate processes running for at least the given number of seconds
+            min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+            min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+            prioritize: Visit nodes most likely to hold orphaned processes first
+            ended_window: Seconds to look back for ended jobs when prioritizing nodes
+            workers: Number of worker processes to shard nodes across
+            verbosity: Console verbosity of worker processes
         """
 
-        # Clusters are handled synchronously, nodes are handled asynchronously
-        for cluster in clusters:
+        from asyncssh import SSHClientConnectionOptions
+
+        if limiter is None and adaptive:
+            limiter = Application._create_limiter(min_concurrent, max_concurrent)
+
+        # A single scheduler is shared across clusters so the connection budget applies globally
+        retry = Application._create_retry_policy(retries, retry_backoff)
+        scheduler = Scheduler(max_concurrent, group_limit, group_pattern, limiter, retry, deadline)
+        ssh_options = SSHClientConnectionOptions(connect_timeout=ssh_timeout)
+        recorder = MetricsRecorder(metrics_file, prometheus_file)
+
+        # Nodes for all clusters are discovered using a single sinfo call
+        sweep_start = time.monotonic()
+        node_states = await utils.get_node_states(clusters, node_cache, node_cache_ttl)
+        logging.info(f'Discovered nodes for {len(clusters)} cluster(s) in {time.monotonic() - sweep_start:.2f}s')
+
+        # Sources such as `squeue` are queried once per sweep for all clusters
+        active_jobs = await jobs.create_job_source(job_source, clusters)
+        state_store = NodeStateStore(state_file, backoff_max=max_backoff) if state_file else None
+
+        prioritizer = None
+        if prioritize:
+            all_states = {node: state for states in node_states.values() for node, state in states.items()}
+            prioritizer = await NodePrioritizer.fetch(clusters, ended_window, all_states, state_store)
+
+        cluster_nodes = {
+            cluster: Application._select_nodes(
+                cluster, node_states[cluster], ignore_nodes, skip_states, state_store, prioritizer)
+            for cluster in clusters
+        }
+
+        node_options = dict(
+            uid_whitelist=uid_whitelist,
+            debug=debug,
+            remote_filter=remote_filter,
+            session=session,
+            job_source=active_jobs,
+            probe_timeout=probe_timeout,
+            kill_engine=KillEngine(grace_period),
+            policies=Application._create_policies(config_file, uid_whitelist, min_age, min_cpu, min_rss, uid_exclude))
+
+        with open_report(report_file, report_format) as report:
+            # Connections and adaptive limits belong to an event loop, so workers do not share the pool or limiter
+            if workers > 1:
+                await Application._scan_sharded(
+                    cluster_nodes=cluster_nodes,
+                    workers=workers,
+                    scheduler=scheduler,
+                    recorder=recorder,
+                    state_store=state_store,
+                    report=report,
+                    verbosity=verbosity,
+                    max_concurrent=max_concurrent,
+                    ssh_timeout=ssh_timeout,
+                    group_limit=group_limit,
+                    group_pattern=group_pattern,
+                    parallel_clusters=parallel_clusters,
+                    adaptive=adaptive or limiter is not None,
+                    min_concurrent=min_concurrent,
+                    retries=retries,
+                    retry_backoff=retry_backoff,
+                    deadline=deadline,
+                    max_backoff=max_backoff,
+                    **node_options)
+
+            else:
+                await Application._scan_clusters(
+                    cluster_nodes=cluster_nodes,
+                    scheduler=scheduler,
+                    recorder=recorder,
+                    parallel_clusters=parallel_clusters,
+                    report=report,
+                    ssh_options=ssh_options,
+                    pool=pool,
+                    state_store=state_store,
+                    **node_options)
+
+        if state_store is not None:
+            state_store.save()
+
+        scheduler.log_stats()
+        recorder.record_sweep(time.monotonic() - sweep_start, scheduler.stats.as_dict())
+
+    @staticmethod
+    def _select_nodes(
+        cluster: str,
+        node_states: Dict[str, str],
+        ignore_nodes: Collection[str],
+        skip_states: Collection[str],
+        state_store: Optional[NodeStateStore] = None,
+        prioritizer: Optional[NodePrioritizer] = None
+    ) -> List[str]:
+        """Return the nodes of a cluster to visit in the current sweep
+
+        Nodes are ordered by the resources held by the processes marked on
+        their last visit (see `NodeStateStore.rank`), so the worst offenders
+        are visited first when a sweep is cut short by its deadline. If a
+        prioritizer is given, nodes are first ordered by their priority score
+        and nodes with recently ended jobs are visited even while backing off.
+
+        Args:
+            cluster: The cluster name
+            node_states: Mapping of node names to their Slurm state
+            ignore_nodes: List of nodes to ignore
+            skip_states: Skip nodes in any of the given Slurm states
+            state_store: Optionally skip clean nodes until their next visit is due and rank the remaining nodes
+            prioritizer: Optionally visit nodes most likely to hold orphaned processes first
+
+        Returns:
+            A list of node names in the order they should be visited
+        """
+
+        skipped = {node for node, state in node_states.items() if utils.is_skipped_state(state, skip_states)}
+        if skipped:
+            logging.info(f'Skipping {len(skipped)} node(s) in cluster {cluster} by state: {", ".join(sorted(skipped))}')
+
+        nodes = set(node_states) - skipped - set(ignore_nodes)
+        if state_store is not None:
+            # A recently ended job may have left processes behind on a node, even if it was clean before
+            ended = {node for node in nodes if prioritizer is not None and 'ended' in prioritizer.signals(node)}
+            backing_off = {node for node in nodes - ended if not state_store.is_due(node)}
+            if backing_off:
+                logging.info(f'Skipping {len(backing_off)} clean node(s) in cluster {cluster} until their next visit')
+
+            nodes -= backing_off
+
+        ranked = state_store.rank(nodes) if state_store is not None else sorted(nodes)
+        if prioritizer is None:
+            return ranked
+
+        prioritized = prioritizer.order(ranked)
+        flagged = sum(1 for node in prioritized if prioritizer.score(node))
+        logging.info(f'Prioritizing {flagged} of {len(prioritized)} node(s) in cluster {cluster}')
+        return prioritized
+
+    @staticmethod
+    async def _scan_clusters(
+        cluster_nodes: Dict[str, Collection[str]],
+        scheduler: Scheduler,
+        recorder: MetricsRecorder,
+        parallel_clusters: bool = False,
+        report: Optional[ResultWriter] = None,
+        **kwargs
+    ) -> None:
+        """Terminate processes on the selected nodes of each cluster
+
+        Args:
+            cluster_nodes: Mapping of cluster names to the nodes to visit
+            scheduler: The scheduler shared by all clusters
+            recorder: Records per-node and per-cluster metrics
+            parallel_clusters: Scan all clusters concurrently instead of one after another
+            report: Optional writer used to stream node results
+            **kwargs: Arguments passed to `iter_results`
+        """
+
+        async def scan_cluster(cluster: str) -> None:
             logging.info(f'Starting scan for nodes in cluster {cluster}')
-            nodes = utils.get_nodes(cluster, ignore_nodes)
-            await Application.terminate(nodes, uid_whitelist, max_concurrent, ssh_timeout, debug)
+            start = time.monotonic()
+
+            # Each cluster gets its own queue so workers are shared fairly between clusters
+            nodes = cluster_nodes[cluster]
+            await Application._terminate_nodes(
+                report=report, scheduler=scheduler, nodes=nodes, recorder=recorder, queue=cluster, **kwargs)
+
+            duration = time.monotonic() - start
+            recorder.record_cluster(cluster, len(nodes), duration)
+            logging.info(f'Finished scan for cluster {cluster}: {len(nodes)} nodes in {duration:.2f}s')
+
+        if parallel_clusters:
+            results = await asyncio.gather(*map(scan_cluster, cluster_nodes), return_exceptions=True)
+            for cluster, result in zip(cluster_nodes, results):
+                if isinstance(result, Exception):
+                    logging.error(f'Error with cluster {cluster}: {result}')
+
+        else:
+            for cluster in cluster_nodes:
+                await scan_cluster(cluster)
+
+    @staticmethod
+    async def _scan_sharded(
+        cluster_nodes: Dict[str, Collection[str]],
+        workers: int,
+        scheduler: Scheduler,
+        recorder: MetricsRecorder,
+        state_store: Optional[NodeStateStore] = None,
+        report: Optional[ResultWriter] = None,
+        verbosity: int = 0,
+        max_concurrent: int = 1,
+        **kwargs
+    ) -> None:
+        """Shard the selected nodes across worker processes and aggregate their results
+
+        The connection budget is divided between workers so their limits sum to
+        `max_concurrent`. No more workers are started than the budget allows.
+        Nodes in the same group are assigned to the same worker so group
+        limits still apply.
+
+        Args:
+            cluster_nodes: Mapping of cluster names to the nodes to visit
+            workers: Number of worker processes
+            scheduler: Scheduler used to group nodes and aggregate statistics
+            recorder: Records the metrics returned by each worker
+            state_store: Optionally skip unchanged nodes and record the outcome of each visit
+            report: Optional writer used to stream node results
+            verbosity: Console verbosity of the worker processes
+            max_concurrent: Maximum number of concurrent ssh connections across all workers
+            **kwargs: Arguments passed to `_scan_shard`
+        """
+
+        shards = shard_nodes(cluster_nodes, min(workers, max_concurrent), scheduler)
+        if not shards:
+            return
+
+        console_stream = 'ext://sys.stderr' if report is not None and report.stream is sys.stdout else 'ext://sys.stdout'
+
+        logging.info(f'Sharding {sum(map(len, cluster_nodes.values()))} node(s) across {len(shards)} worker process(es)')
+        cluster_durations: Dict[str, float] = dict.fromkeys(cluster_nodes, 0.0)
+        shard_results = run_sharded(
+            shards,
+            Application._scan_shard,
+            initializer=Application._configure_logging,
+            initargs=(verbosity, console_stream),
+            shard_kwargs=[{'max_concurrent': budget} for budget in split_budget(max_concurrent, len(shards))],
+            node_state=state_store.nodes if state_store is not None else None,
+            **kwargs)
+
+        async for shard, shard_result in shard_results:
+            if isinstance(shard_result, Exception):
+                logging.error(f'Worker failed for {sum(map(len, shard.values()))} node(s): {shard_result}')
+                continue
+
+            for metrics in shard_result.metrics:
+                recorder.record_node(metrics)
+
+            if report is not None:
+                for result in shard_result.results:
+                    report.write(result)
+
+            if state_store is not None:
+                state_store.nodes.update(shard_result.node_state)
+
+            scheduler.stats.merge(shard_result.stats)
+            for cluster, duration in shard_result.clusters.items():
+                cluster_durations[cluster] = max(cluster_durations[cluster], duration)
+
+        for cluster, duration in cluster_durations.items():
+            recorder.record_cluster(cluster, len(cluster_nodes[cluster]), duration)
+
+    @staticmethod
+    async def _scan_shard(
+        shard: Shard,
+        max_concurrent: int,
+        ssh_timeout: int,
+        group_limit: Optional[int] = None,
+        group_pattern: Optional[str] = None,
+        parallel_clusters: bool = False,
+        adaptive: bool = False,
+        min_concurrent: int = 1,
+        retries: int = 2,
+        retry_backoff: float = 1,
+        deadline: Optional[float] = None,
+        node_state: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_backoff: float = 3600,
+        **kwargs
+    ) -> ShardResult:
+        """Scan a shard of nodes using a dedicated scheduler (executed in a worker process)
+
+        Args:
+            shard: Mapping of cluster names to the nodes assigned to the worker
+            max_concurrent: Maximum number of concurrent ssh connections for the worker
+            ssh_timeout: Timeout for SSH connections
+            group_limit: Maximum number of concurrent ssh connections per node group
+            group_pattern: Regex used to derive the group of each node from its name
+            parallel_clusters: Scan all clusters concurrently instead of one after another
+            adaptive: Adapt the number of concurrent ssh connections to observed latency and errors
+            min_concurrent: Minimum number of concurrent ssh connections in adaptive mode
+            retries: Maximum number of retries for nodes failing with a network error
+            retry_backoff: Maximum delay in seconds before the first retry
+            deadline: Optional number of seconds after which unfinished nodes fail
+            node_state: Optional node state used to skip unchanged nodes
+            max_backoff: Maximum delay in seconds between visits to a clean node
+            **kwargs: Arguments passed to `iter_results`
+
+        Returns:
+            The results, metrics, and statistics collected for the shard
+        """
+
+        from asyncssh import SSHClientConnectionOptions
+
+        limiter = Application._create_limiter(min_concurrent, max_concurrent) if adaptive else None
+        retry = Application._create_retry_policy(retries, retry_backoff)
+        scheduler = Scheduler(max_concurrent, group_limit, group_pattern, limiter, retry, deadline)
+        recorder = MetricsRecorder()
+
+        state_store = None
+        if node_state is not None:
+            state_store = NodeStateStore(backoff_max=max_backoff)
+            state_store.nodes = node_state
+
+        shard_result = ShardResult()
+        await Application._scan_clusters(
+            cluster_nodes=shard,
+            scheduler=scheduler,
+            recorder=recorder,
+            parallel_clusters=parallel_clusters,
+            report=shard_result,
+            ssh_options=SSHClientConnectionOptions(connect_timeout=ssh_timeout),
+            state_store=state_store,
+            **kwargs)
+
+        shard_result.metrics = recorder.nodes
+        shard_result.clusters = {cluster: values['duration'] for cluster, values in recorder.clusters.items()}
+        shard_result.stats = scheduler.stats
+        if state_store is not None:
+            assigned = {node for nodes in shard.values() for node in nodes}
+            shard_result.node_state = {node: state for node, state in state_store.nodes.items() if node in assigned}
+
+        return shard_result
 
     @staticmethod
     async def terminate(
         nodes: Collection[str],
-        uid_whitelist: Collection[Union[int, List[int]]],
+        uid_whitelist: utils.UIDWhitelist,
         max_concurrent: int,
         ssh_timeout: int,
-        debug: bool
+        debug: bool,
+        group_limit: Optional[int] = None,
+        group_pattern: Optional[str] = None,
+        remote_filter: bool = False,
+        session: bool = False,
+        metrics_file: Optional[Path] = None,
+        prometheus_file: Optional[Path] = None,
+        job_source: str = 'process',
+        adaptive: bool = False,
+        min_concurrent: int = 1,
+        retries: int = 2,
+        retry_backoff: float = 1,
+        deadline: Optional[float] = None,
+        probe_timeout: Optional[float] = None,
+        grace_period: float = 5,
+        report_file: Optional[str] = None,
+        report_format: str = 'ndjson',
+        config_file: Optional[Path] = None,
+        uid_exclude: Collection[IntervalSpec] = (),
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None,
+        prioritize: bool = False,
+        ended_window: float = 3600
     ) -> None:
         """Terminate processes on a given node
 
         Args:
-            nodes:
+            nodes: The DNS name(s) of the node(s) to terminate processes on
             uid_whitelist: UID values to terminate orphaned processes for
             max_concurrent: Maximum number of concurrent ssh connections
             ssh_timeout: Timeout for SSH connections
             debug: Optionally log but do not terminate processes
+            group_limit: Maximum number of concurrent ssh connections per node group
+            group_pattern: Regex used to derive the group of each node from its name
+            remote_filter: Filter process data on each node instead of fetching the full process table
+            session: Run all commands for a node through a single remote shell
+            metrics_file: Optional path of a JSON lines file to append metrics to
+            prometheus_file: Optional path of a Prometheus textfile to write sweep metrics to
+            job_source: Name of the source used to identify users running Slurm jobs
+            adaptive: Adapt the number of concurrent ssh connections to observed latency and errors
+            min_concurrent: Minimum number of concurrent ssh connections in adaptive mode
+            retries: Maximum number of retries for nodes failing with a network error
+            retry_backoff: Maximum delay in seconds before the first retry
+            deadline: Optional number of seconds after which unfinished nodes fail
+            probe_timeout: Optionally check the SSH port of each node is reachable within the given seconds before connecting
+            grace_period: Seconds to wait after SIGTERM before sending SIGKILL (0 sends SIGKILL immediately)
+            report_file: Optional path of a file to append node results to (`-` for stdout)
+            report_format: Format of the node results report
+            config_file: Optional path of a JSON settings file defining the filter rules of each cluster
+            uid_exclude: User IDs excluded from every whitelist, including those defined in `config_file`
+            min_age: Only terminate processes running for at least the given number of seconds
+            min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+            min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+            prioritize: Visit nodes most likely to hold orphaned processes first
+            ended_window: Seconds to look back for ended jobs when prioritizing nodes
         """
 
+        from asyncssh import SSHClientConnectionOptions
+
+        limiter = Application._create_limiter(min_concurrent, max_concurrent) if adaptive else None
+        retry = Application._create_retry_policy(retries, retry_backoff)
+        scheduler = Scheduler(max_concurrent, group_limit, group_pattern, limiter, retry, deadline)
         ssh_options = SSHClientConnectionOptions(connect_timeout=ssh_timeout)
+        recorder = MetricsRecorder(metrics_file, prometheus_file)
+
+        start = time.monotonic()
+        active_jobs = await jobs.create_job_source(job_source)
+        if prioritize:
+            prioritizer = await NodePrioritizer.fetch(window=ended_window, nodes=nodes)
+            nodes = prioritizer.order(nodes)
 
-        # Launch a concurrent job for each node in the cluster
-        coroutines = [
-            utils.terminate_errant_processes(
-                node=node,
+        with open_report(report_file, report_format) as report:
+            await Application._terminate_nodes(
+                scheduler=scheduler,
+                nodes=nodes,
                 uid_whitelist=uid_whitelist,
-                ssh_limit=asyncio.Semaphore(max_concurrent),
                 ssh_options=ssh_options,
-                debug=debug)
-            for node in nodes
-        ]
+                debug=debug,
+                remote_filter=remote_filter,
+                session=session,
+                recorder=recorder,
+                job_source=active_jobs,
+                probe_timeout=probe_timeout,
+                kill_engine=KillEngine(grace_period),
+                policies=Application._create_policies(config_file, uid_whitelist, min_age, min_cpu, min_rss, uid_exclude),
+                report=report)
+
+        scheduler.log_stats()
+        recorder.record_sweep(time.monotonic() - start, scheduler.stats.as_dict())
+
+    @staticmethod
+    async def local(
+        uid_whitelist: utils.UIDWhitelist,
+        debug: bool,
+        job_source: str = 'process',
+        grace_period: float = 5,
+        metrics_file: Optional[Path] = None,
+        prometheus_file: Optional[Path] = None,
+        report_file: Optional[str] = None,
+        report_format: str = 'ndjson',
+        config_file: Optional[Path] = None,
+        uid_exclude: Collection[IntervalSpec] = (),
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None
+    ) -> None:
+        """Terminate processes on the current machine without opening SSH connections
+
+        Args:
+            uid_whitelist: UID values to terminate orphaned processes for
+            debug: Optionally log but do not terminate processes
+            job_source: Name of the source used to identify users running Slurm jobs
+            grace_period: Seconds to wait after SIGTERM before sending SIGKILL (0 sends SIGKILL immediately)
+            metrics_file: Optional path of a JSON lines file to append metrics to
+            prometheus_file: Optional path of a Prometheus textfile to write sweep metrics to
+            report_file: Optional path of a file to append the node result to (`-` for stdout)
+            report_format: Format of the node results report
+            config_file: Optional path of a JSON settings file defining the filter rules of each cluster
+            uid_exclude: User IDs excluded from every whitelist, including those defined in `config_file`
+            min_age: Only terminate processes running for at least the given number of seconds
+            min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+            min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+        """
+
+        recorder = MetricsRecorder(metrics_file, prometheus_file)
+        metrics = NodeMetrics(socket.gethostname().split('.')[0])
+        metrics.counts['attempts'] = 1
+
+        start = time.monotonic()
+        try:
+            policies = Application._create_policies(config_file, uid_whitelist, min_age, min_cpu, min_rss, uid_exclude)
+            active_jobs = await jobs.create_job_source(job_source)
+            outcome = await terminate_local_processes(
+                uid_whitelist=uid_whitelist,
+                debug=debug,
+                metrics=metrics,
+                job_source=active_jobs,
+                kill_engine=LocalKillEngine(grace_period),
+                policy=policies.default)
+
+        except Exception as caught:
+            outcome = caught
+
+        result = Application._node_result(outcome, metrics, debug)
+        recorder.record_node(metrics)
+        with open_report(report_file, report_format) as report:
+            if report is not None:
+                report.write(result)
+
+        recorder.record_sweep(time.monotonic() - start)
+
+    @staticmethod
+    async def daemon(
+        clusters: Collection[str],
+        ignore_nodes: Collection[str],
+        uid_whitelist: utils.UIDWhitelist,
+        max_concurrent: int,
+        ssh_timeout: int,
+        debug: bool,
+        group_limit: Optional[int] = None,
+        group_pattern: Optional[str] = None,
+        parallel_clusters: bool = False,
+        skip_states: Collection[str] = utils.DEFAULT_SKIP_STATES,
+        node_cache: Optional[Path] = None,
+        node_cache_ttl: float = 300,
+        remote_filter: bool = False,
+        session: bool = False,
+        metrics_file: Optional[Path] = None,
+        prometheus_file: Optional[Path] = None,
+        interval: float = 300,
+        idle_timeout: float = 900,
+        keepalive_interval: float = 60,
+        pool_size: Optional[int] = None,
+        job_source: str = 'process',
+        state_file: Optional[Path] = None,
+        max_backoff: float = 3600,
+        adaptive: bool = False,
+        min_concurrent: int = 1,
+        retries: int = 2,
+        retry_backoff: float = 1,
+        deadline: Optional[float] = None,
+        probe_timeout: Optional[float] = None,
+        grace_period: float = 5,
+        report_file: Optional[str] = None,
+        report_format: str = 'ndjson',
+        config_file: Optional[Path] = None,
+        uid_exclude: Collection[IntervalSpec] = (),
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None,
+        prioritize: bool = False,
+        ended_window: float = 3600,
+        workers: int = 1,
+        verbosity: int = 0
+    ) -> None:
+        """Repeatedly scan clusters using a pool of persistent SSH connections
+
+        Args:
+            clusters: Slurm cluster names
+            ignore_nodes: List of nodes to ignore
+            uid_whitelist: UID values to terminate orphaned processes for
+            max_concurrent: Maximum number of concurrent ssh connections
+            ssh_timeout: Timeout for SSH connections
+            debug: Optionally log but do not terminate processes
+            group_limit: Maximum number of concurrent ssh connections per node group
+            group_pattern: Regex used to derive the group of each node from its name
+            parallel_clusters: Scan all clusters concurrently instead of one after another
+            skip_states: Skip nodes in any of the given Slurm states
+            node_cache: Optional path used to cache the cluster node list
+            node_cache_ttl: Maximum age of the cached node list in seconds
+            remote_filter: Filter process data on each node instead of fetching the full process table
+            session: Run all commands for a node through a single remote shell
+            metrics_file: Optional path of a JSON lines file to append metrics to
+            prometheus_file: Optional path of a Prometheus textfile to write sweep metrics to
+            interval: Seconds between the start of consecutive sweeps
+            idle_timeout: Close pooled connections unused for this many seconds
+            keepalive_interval: SSH keepalive interval in seconds
+            pool_size: Maximum number of open connections
+            job_source: Name of the source used to identify users running Slurm jobs
+            state_file: Optional path used to persist per-node scan state between sweeps
+            max_backoff: Maximum delay in seconds between visits to a clean node
+            adaptive: Adapt the number of concurrent ssh connections to observed latency and errors
+            min_concurrent: Minimum number of concurrent ssh connections in adaptive mode
+            retries: Maximum number of retries for nodes failing with a network error
+            retry_backoff: Maximum delay in seconds before the first retry
+            deadline: Optional number of seconds after which unfinished nodes fail in each sweep
+            probe_timeout: Optionally check the SSH port of each node is reachable within the given seconds before connecting
+            grace_period: Seconds to wait after SIGTERM before sending SIGKILL (0 sends SIGKILL immediately)
+            report_file: Optional path of a file to append node results to (`-` for stdout)
+            report_format: Format of the node results report
+            config_file: Optional path of a JSON settings file defining the filter rules of each cluster
+            uid_exclude: User IDs excluded from every whitelist, including those defined in `config_file`
+            min_age: Only terminate processes running for at least the given number of seconds
+            min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+            min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+            prioritize: Visit nodes most likely to hold orphaned processes first
+            ended_window: Seconds to look back for ended jobs when prioritizing nodes
+            workers: Number of worker processes to shard nodes across
+            verbosity: Console verbosity of worker processes
+        """
+
+        from asyncssh import SSHClientConnectionOptions
+
+        # The adaptive limit carries over between sweeps
+        limiter = Application._create_limiter(min_concurrent, max_concurrent) if adaptive else None
+        ssh_options = SSHClientConnectionOptions(connect_timeout=ssh_timeout, keepalive_interval=keepalive_interval)
+        pool = ConnectionPool(ssh_options, max_size=pool_size, idle_timeout=idle_timeout)
+
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    await Application.scan(
+                        clusters=clusters,
+                        ignore_nodes=ignore_nodes,
+                        uid_whitelist=uid_whitelist,
+                        max_concurrent=max_concurrent,
+                        ssh_timeout=ssh_timeout,
+                        debug=debug,
+                        group_limit=group_limit,
+                        group_pattern=group_pattern,
+                        parallel_clusters=parallel_clusters,
+                        skip_states=skip_states,
+                        node_cache=node_cache,
+                        node_cache_ttl=node_cache_ttl,
+                        remote_filter=remote_filter,
+                        session=session,
+                        metrics_file=metrics_file,
+                        prometheus_file=prometheus_file,
+                        pool=pool,
+                        job_source=job_source,
+                        state_file=state_file,
+                        max_backoff=max_backoff,
+                        limiter=limiter,
+                        retries=retries,
+                        retry_backoff=retry_backoff,
+                        deadline=deadline,
+                        probe_timeout=probe_timeout,
+                        grace_period=grace_period,
+                        report_file=report_file,
+                        report_format=report_format,
+                        config_file=config_file,
+                        uid_exclude=uid_exclude,
+                        min_age=min_age,
+                        min_cpu=min_cpu,
+                        min_rss=min_rss,
+                        prioritize=prioritize,
+                        ended_window=ended_window,
+                        workers=workers,
+                        verbosity=verbosity)
+
+                # A failed sweep should not stop the daemon
+                except Exception as caught:
+                    logging.error(f'Sweep failed: {caught}')
+
+                evicted = pool.evict_idle()
+                elapsed = time.monotonic() - start
+                logging.info(f'Sweep finished in {elapsed:.2f}s with {len(pool)} pooled connection(s), {evicted} evicted')
+                await asyncio.sleep(max(0.0, interval - elapsed))
+
+        finally:
+            await pool.close()
+
+    @staticmethod
+    def _create_policies(
+        config_file: Optional[Path],
+        uid_whitelist: utils.UIDWhitelist,
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None,
+        uid_exclude: Collection[IntervalSpec] = ()
+    ) -> PolicySet:
+        """Compile the filter rules of each cluster
+
+        Args:
+            config_file: Optional path of a JSON settings file
+            uid_whitelist: UID whitelist used by rules that do not define their own
+            min_age: Minimum process age used by rules that do not define their own
+            min_cpu: CPU threshold used by rules that do not define their own
+            min_rss: Memory threshold used by rules that do not define their own
+            uid_exclude: User IDs removed from the whitelists defined in the settings file
+
+        Returns:
+            The compiled policies of each cluster (a single default policy if no settings file is given)
+        """
+
+        if config_file is None:
+            return PolicySet(ProcessPolicy(uid_whitelist, min_age=min_age, min_cpu=min_cpu, min_rss=min_rss))
+
+        from .settings import Settings
+
+        return Settings.from_file(config_file).compile(
+            uid_whitelist, uid_exclude, min_age=min_age, min_cpu=min_cpu, min_rss=min_rss)
 
-        # Gather results from each concurrent run and check for errors
-        results = await asyncio.gather(*coroutines, return_exceptions=True)
-        for node, result in zip(nodes, results):
-            if isinstance(result, Exception):
-                logging.error(f'Error with node {node}: {result}')
+    @staticmethod
+    def _create_limiter(min_concurrent: int, max_concurrent: int) -> AdaptiveLimiter:
+        """Return an adaptive concurrency limiter for SSH connections
+
+        Args:
+            min_concurrent: Minimum number of concurrent ssh connections
+            max_concurrent: Maximum number of concurrent ssh connections
+
+        Returns:
+            A new limiter instance
+        """
+
+        from asyncssh import ConnectionLost
+
+        # Dropped connections are how sshd signals its `MaxStartups` limit was reached
+        congestion_errors = AdaptiveLimiter.congestion_errors + (ConnectionLost,)
+        return AdaptiveLimiter(min(min_concurrent, max_concurrent), max_concurrent, congestion_errors=congestion_errors)
+
+    @staticmethod
+    def _create_retry_policy(retries: int, retry_backoff: float) -> Optional[RetryPolicy]:
+        """Return a retry policy for nodes failing with a network error
+
+        Args:
+            retries: Maximum number of retries per node
+            retry_backoff: Maximum delay in seconds before the first retry
+
+        Returns:
+            A new policy instance or `None` if retries are disabled
+        """
+
+        if retries < 1:
+            return None
+
+        from asyncssh import ConnectionLost
+
+        return RetryPolicy(retries + 1, retry_backoff, retry_on=RetryPolicy.retry_on + (ConnectionLost,))
+
+    @staticmethod
+    async def iter_results(
+        scheduler: Scheduler,
+        nodes: Collection[str],
+        uid_whitelist: utils.UIDWhitelist,
+        ssh_options: 'SSHClientConnectionOptions',
+        debug: bool,
+        remote_filter: bool = False,
+        session: bool = False,
+        pool: Optional[ConnectionPool] = None,
+        recorder: Optional[MetricsRecorder] = None,
+        queue: Optional[str] = None,
+        job_source: Optional[jobs.ActiveJobSource] = None,
+        state_store: Optional[NodeStateStore] = None,
+        probe_timeout: Optional[float] = None,
+        kill_engine: Optional[KillEngine] = None,
+        transport: Optional[Transport] = None,
+        policies: Optional[PolicySet] = None
+    ) -> AsyncIterator[NodeResult]:
+        """Terminate processes on multiple nodes and yield a result for each node as soon as it finishes
+
+        Args:
+            scheduler: The scheduler managing the SSH connection budget
+            nodes: The DNS name(s) of the node(s) to terminate processes on
+            uid_whitelist: UID values to terminate orphaned processes for
+            ssh_options: Options for configuring outbound SSH connections
+            debug: Optionally log but do not terminate processes
+            remote_filter: Filter process data on each node instead of fetching the full process table
+            session: Run all commands for a node through a single remote shell
+            pool: Optionally reuse connections from a connection pool
+            recorder: Optionally record per-node metrics
+            queue: Name of the scheduler queue to submit jobs to (also used as the cluster name in metrics)
+            job_source: Source of the users running Slurm jobs on each node
+            state_store: Optionally skip nodes that are unchanged since their last clean scan
+            probe_timeout: Optionally check each node is reachable within the given seconds before connecting
+            kill_engine: Terminates marked process groups on each node
+            transport: Runs commands on each node (defaults to an `SSHTransport` built from `ssh_options`, `pool`, and `session`)
+            policies: Optional compiled filter rules, selected for the nodes using the `queue` name (`uid_whitelist` is ignored if given)
+
+        Yields:
+            The result of each node in order of completion
+        """
+
+        recorder = recorder if recorder is not None else MetricsRecorder()
+        transport = transport if transport is not None else SSHTransport(ssh_options, pool, session)
+        policy = policies.for_cluster(queue) if policies is not None else None
+        node_metrics = {node: NodeMetrics(node, queue) for node in nodes}
+
+        async def job(node: str) -> Optional[ProcessTable]:
+            metrics = node_metrics[node]
+            metrics.timings.setdefault('queue', metrics.duration)
+            metrics.counts['attempts'] = metrics.counts.get('attempts', 0) + 1
+
+            # Phase timings accumulate across retries, but the limiter needs the latency of this attempt only
+            connect_start = metrics.timings.get('connect', 0.0)
+            try:
+                marked = await utils.terminate_errant_processes(
+                    node=node,
+                    uid_whitelist=uid_whitelist,
+                    debug=debug,
+                    remote_filter=remote_filter,
+                    metrics=metrics,
+                    job_source=job_source,
+                    state_store=state_store,
+                    probe_timeout=probe_timeout,
+                    kill_engine=kill_engine,
+                    transport=transport,
+                    policy=policy)
+
+            except Exception as caught:
+                if scheduler.limiter is not None:
+                    scheduler.limiter.record_failure(caught)
+
+                raise
+
+            if scheduler.limiter is not None:
+                latency = metrics.timings['connect'] - connect_start if 'connect' in metrics.timings else None
+                scheduler.limiter.record_success(latency)
+
+            return marked
+
+        # Metrics and results are recorded once per node after its final attempt
+        async for node, outcome in scheduler.as_completed(nodes, job, queue):
+            metrics = node_metrics[node]
+            result = Application._node_result(outcome, metrics, debug)
+            recorder.record_node(metrics)
+            yield result
+
+    @staticmethod
+    def _node_result(outcome: Union[ProcessTable, Exception, None], metrics: NodeMetrics, debug: bool) -> NodeResult:
+        """Build the result of a node from the outcome of its final attempt
+
+        Args:
+            outcome: The marked processes, the raised exception, or `None` if the node was skipped as unchanged
+            metrics: The metrics of the node (finished and updated with any error message)
+            debug: Whether processes were only marked and not terminated
+
+        Returns:
+            The node result
+        """
+
+        node, queue = metrics.node, metrics.cluster
+        if isinstance(outcome, Exception):
+            metrics.error = str(outcome)
+            logging.error(f'Error with node {node}: {outcome}')
+            result = NodeResult(node, queue, 'error', error=str(outcome))
+
+        elif outcome is None:
+            result = NodeResult(node, queue, 'unchanged')
+
+        elif outcome.empty:
+            result = NodeResult(node, queue, 'clean')
+
+        else:
+            status = 'marked' if debug else 'terminated'
+            cpu, rss = outcome.total_usage()
+            result = NodeResult(
+                node,
+                queue,
+                status,
+                pids=list(outcome.pid),
+                pgids=outcome.unique_pgids(),
+                survivors=metrics.survivors,
+                cpu=cpu,
+                rss=rss)
+
+        metrics.finish()
+        result.attempts = metrics.counts.get('attempts', 0)
+        result.duration = metrics.duration
+        return result
+
+    @staticmethod
+    async def _terminate_nodes(report: Optional[ResultWriter] = None, **kwargs) -> None:
+        """Terminate processes on multiple nodes and write each node result to a report
+
+        Args:
+            report: Optional writer used to stream node results
+            **kwargs: Arguments passed to `iter_results`
+        """
+
+        async for result in Application.iter_results(**kwargs):
+            if report is not None:
+                report.write(result)
 
     @classmethod
     def execute(cls, arg_list: List[str] = None) -> None:
@@ -215,7 +1221,10 @@ class Application:
         """
 
         args = Parser().parse_args(arg_list)
-        cls._configure_logging(args.verbosity)
+
+        # Keep console messages out of machine-readable reports written to stdout
+        report_to_stdout = str(getattr(args, 'report_file', None)) == '-'
+        cls._configure_logging(args.verbosity, 'ext://sys.stderr' if report_to_stdout else 'ext://sys.stdout')
 
         try:
             # Extract the subset of arguments that are valid for the `args.callable` function
@@ -0,0 +1,220 @@
+"""Self-contained process collector executed directly on compute nodes.
+
+This module is shipped to remote nodes over SSH (e.g., piped to `python3 -`)
+and must therefore only depend on the Python standard library. It reads
+process data from `/proc`, applies the filtering predicates on the node,
+and prints only the candidate processes in the same column layout as `ps`.
+
+Command line usage:
+
+    python3 - '<json options>' < collector.py
+
+where the options are a JSON object with keys `init_pid`, `uid_whitelist`,
+and optionally `active_uids` and `proc_root`.
+"""
+
+import json
+import os
+import sys
+
+HEADER = 'PID PPID PGID UID %CPU RSS ELAPSED STAT CMD'
+
+# Units of the CPU time, start time, and memory values in `/proc/<pid>/stat`
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE_KB = os.sysconf('SC_PAGE_SIZE') // 1024
+
+# Commands of processes that adopt orphans in place of init (mirrors `process_tree.SUBREAPER_COMMANDS`)
+SUBREAPER_COMMANDS = ('systemd --user',)
+
+
+def read_uptime(proc_root='/proc'):
+    """Return the number of seconds since the system booted
+
+    Args:
+        proc_root: Mount point of the proc filesystem
+    """
+
+    try:
+        with open(os.path.join(proc_root, 'uptime')) as uptime_file:
+            return float(uptime_file.read().split()[0])
+
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def read_process(pid, proc_root='/proc', uptime=None):
+    """Return the (pid, ppid, pgid, uid, cmd, pcpu, rss, etime, state) values of a running process
+
+    Resource usage values match the `pcpu`, `rss`, `etimes`, and `stat`
+    columns of `ps`: `pcpu` is the CPU time used over the lifetime of the
+    process as a percentage of its elapsed time, `rss` is given in KiB, and
+    `etime` is given in seconds.
+
+    Args:
+        pid: The process ID
+        proc_root: Mount point of the proc filesystem
+        uptime: Seconds since the system booted (read from `proc_root` if not given)
+
+    Returns:
+        A tuple of process values or `None` if the process no longer exists
+    """
+
+    base = os.path.join(proc_root, str(pid))
+    try:
+        with open(os.path.join(base, 'stat'), 'rb') as stat_file:
+            stat = stat_file.read().decode(errors='replace')
+
+        with open(os.path.join(base, 'status'), 'rb') as status_file:
+            uid_line = next(line for line in status_file if line.startswith(b'Uid:'))
+
+        with open(os.path.join(base, 'cmdline'), 'rb') as cmd_file:
+            cmdline = cmd_file.read()
+
+    except (OSError, StopIteration):
+        return None
+
+    # The command name may contain spaces and parentheses, so split on the last parenthesis
+    comm = stat[stat.index('(') + 1:stat.rindex(')')]
+    fields = stat[stat.rindex(')') + 2:].split()
+    state, ppid, pgid = fields[0], int(fields[1]), int(fields[2])
+
+    # Field indices are offset by three from the field numbers documented in `proc(5)`
+    uptime = read_uptime(proc_root) if uptime is None else uptime
+    cpu_time = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    etime = max(0, int(uptime - int(fields[19]) / CLOCK_TICKS))
+    pcpu = round(100 * cpu_time / etime, 1) if etime else 0.0
+    rss = int(fields[21]) * PAGE_SIZE_KB
+
+    # Use the effective UID to match the behavior of `ps -o uid`
+    uid = int(uid_line.split()[2])
+
+    # Kernel threads have no command line and are displayed by ps as [comm]
+    cmd = cmdline.replace(b'\0', b' ').replace(b'\n', b' ').decode(errors='replace').strip() or '[{}]'.format(comm)
+    return pid, ppid, pgid, uid, cmd, pcpu, rss, etime, state
+
+
+def iter_processes(proc_root='/proc'):
+    """Yield process values for all running processes
+
+    Args:
+        proc_root: Mount point of the proc filesystem
+    """
+
+    uptime = read_uptime(proc_root)
+    for entry in os.listdir(proc_root):
+        if entry.isdigit():
+            process = read_process(int(entry), proc_root, uptime)
+            if process is not None:
+                yield process
+
+
+def uid_is_whitelisted(uid, uid_whitelist):
+    """Return whether a user ID is included in the whitelist
+
+    Args:
+        uid: The user ID
+        uid_whitelist: Individual user IDs and `[min, max)` user ID ranges
+    """
+
+    for elt in uid_whitelist:
+        if isinstance(elt, int):
+            if uid == elt:
+                return True
+
+        elif elt[0] <= uid < elt[1]:
+            return True
+
+    return False
+
+
+def orphaned_pids(processes, init_pid, candidates=None, leaves=()):
+    """Return the IDs of orphaned processes and all of their descendants
+
+    Processes are orphaned if they are parented by init or by a subreaper.
+
+    Args:
+        processes: A list of process tuples (see `read_process`)
+        init_pid: Process ID of the init process
+        candidates: Optionally only start from and descend through the given process IDs
+        leaves: Include but do not descend below the given process IDs
+
+    Returns:
+        A set of process IDs
+    """
+
+    adopters = {init_pid}
+    children = {}
+    for pid, ppid, _, _, cmd, *_ in processes:
+        children.setdefault(ppid, []).append(pid)
+        if any(subreaper in cmd for subreaper in SUBREAPER_COMMANDS):
+            adopters.add(pid)
+
+    def is_candidate(pid):
+        return candidates is None or pid in candidates
+
+    stack = [
+        pid for adopter in adopters for pid in children.get(adopter, ())
+        if pid != init_pid and is_candidate(pid)
+    ]
+
+    orphaned = set()
+    while stack:
+        pid = stack.pop()
+        if pid not in orphaned:
+            orphaned.add(pid)
+            if pid not in leaves:
+                stack.extend(child for child in children.get(pid, ()) if is_candidate(child))
+
+    return orphaned
+
+
+def collect(init_pid, uid_whitelist, proc_root='/proc', active_uids=None):
+    """Return candidate processes for termination
+
+    Applies the same filters as `terminate_errant_processes`: processes owned
+    by users running `slurmd` are excluded, then only orphaned processes
+    owned by whitelisted users are kept.
+
+    Args:
+        init_pid: Process ID of the init process
+        uid_whitelist: Individual user IDs and `[min, max)` user ID ranges
+        proc_root: Mount point of the proc filesystem
+        active_uids: User IDs running Slurm jobs (users running `slurmd` are always included)
+
+    Returns:
+        A list of process tuples (see `read_process`)
+    """
+
+    processes = list(iter_processes(proc_root))
+
+    # Job sources only report job owners, so the owners of `slurmd` (i.e., root) are always excluded
+    slurm_uids = {uid for _, _, _, uid, cmd, *_ in processes if 'slurmd' in cmd}
+    slurm_uids.update(active_uids or ())
+
+    # Orphan subtrees never start from or pass through system daemons like `sshd` or `slurmstepd`
+    candidates = {
+        process[0] for process in processes
+        if process[3] not in slurm_uids and uid_is_whitelisted(process[3], uid_whitelist)
+    }
+
+    root_owned = {process[0] for process in processes if process[3] == 0}
+    orphaned = orphaned_pids(processes, init_pid, candidates, root_owned)
+    return [process for process in processes if process[0] in orphaned]
+
+
+def main(argv):
+    """Print candidate processes using options passed on the command line"""
+
+    options = json.loads(argv[1])
+    lines = [HEADER]
+    processes = collect(
+        options['init_pid'], options['uid_whitelist'], options.get('proc_root', '/proc'), options.get('active_uids'))
+
+    for pid, ppid, pgid, uid, cmd, pcpu, rss, etime, state in processes:
+        lines.append('{} {} {} {} {} {} {} {} {}'.format(pid, ppid, pgid, uid, pcpu, rss, etime, state, cmd))
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
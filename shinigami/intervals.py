@@ -0,0 +1,129 @@
+"""Compact sets of integers stored as sorted, non-overlapping intervals."""
+
+from bisect import bisect_right
+from typing import Any, Collection, Iterable, Iterator, List, Sequence, Tuple, Union
+
+# Individual values (e.g., `1000`) and `[start, stop)` ranges (e.g., `[1000, 2000]`)
+IntervalSpec = Union[int, Sequence[int]]
+
+
+class IntervalSet:
+    """An immutable set of integers represented as half-open intervals
+
+    Intervals are sorted and merged on construction, so membership tests
+    cost a binary search over the interval boundaries regardless of how many
+    values each interval spans. Excluded intervals are subtracted from the
+    included intervals on construction.
+    """
+
+    __slots__ = ('_starts', '_stops')
+
+    def __init__(self, include: Iterable[IntervalSpec] = (), exclude: Iterable[IntervalSpec] = ()) -> None:
+        """Instantiate a new set from individual values and `[start, stop)` ranges
+
+        Args:
+            include: Values and ranges in the set
+            exclude: Values and ranges removed from the set
+        """
+
+        intervals = self._merge(map(self._as_interval, include))
+        for ex_start, ex_stop in self._merge(map(self._as_interval, exclude)):
+            remaining = []
+            for start, stop in intervals:
+                if stop <= ex_start or start >= ex_stop:
+                    remaining.append((start, stop))
+                    continue
+
+                if start < ex_start:
+                    remaining.append((start, ex_start))
+
+                if stop > ex_stop:
+                    remaining.append((ex_stop, stop))
+
+            intervals = remaining
+
+        self._starts = [start for start, _ in intervals]
+        self._stops = [stop for _, stop in intervals]
+
+    @classmethod
+    def coerce(cls, values: Union['IntervalSet', Collection[IntervalSpec]]) -> 'IntervalSet':
+        """Return the given values as an interval set
+
+        Args:
+            values: An existing interval set or a collection of values and ranges
+
+        Returns:
+            The given set, or a new set built from the given values
+        """
+
+        return values if isinstance(values, cls) else cls(values)
+
+    @staticmethod
+    def _as_interval(elt: IntervalSpec) -> Tuple[int, int]:
+        """Return an individual value or range as a `(start, stop)` tuple"""
+
+        if isinstance(elt, int):
+            return elt, elt + 1
+
+        start, stop = elt
+        return int(start), int(stop)
+
+    @staticmethod
+    def _merge(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Sort intervals and merge any that overlap or touch"""
+
+        merged: List[Tuple[int, int]] = []
+        for start, stop in sorted(intervals):
+            if start >= stop:
+                continue
+
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(stop, merged[-1][1]))
+
+            else:
+                merged.append((start, stop))
+
+        return merged
+
+    def __contains__(self, value: Any) -> bool:
+        index = bisect_right(self._starts, value) - 1
+        return index >= 0 and value < self._stops[index]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._starts, self._stops)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+
+        return self._starts == other._starts and self._stops == other._stops
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.to_list()})'
+
+    def isin(self, values: Any) -> Any:
+        """Vectorized membership test for an array of values
+
+        Args:
+            values: A numpy array or pandas Series of integers
+
+        Returns:
+            A boolean numpy array indicating which values are in the set
+        """
+
+        import numpy as np
+
+        values = np.asarray(values)
+        if not self._starts:
+            return np.zeros(values.shape, dtype=bool)
+
+        index = np.searchsorted(np.asarray(self._starts), values, side='right') - 1
+        return (index >= 0) & (values < np.asarray(self._stops)[index.clip(0)])
+
+    def to_list(self) -> List[IntervalSpec]:
+        """Return the set as a JSON serializable list of values and `[start, stop)` ranges"""
+
+        return [start if stop == start + 1 else [start, stop] for start, stop in self]
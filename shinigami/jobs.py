@@ -0,0 +1,264 @@
+"""Sources of the user IDs running active Slurm jobs on each node."""
+
+import asyncio
+import glob
+import logging
+import re
+from typing import Collection, Dict, List, Optional, Set, TYPE_CHECKING, Union
+
+from .session import RemoteShell
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+
+# Names accepted by `create_job_source`
+JOB_SOURCES = ('process', 'cgroup', 'squeue')
+
+# Slurm creates one `uid_<uid>/job_<id>` cgroup per running job (cgroup v1 layout)
+CGROUP_PATTERNS = ('/sys/fs/cgroup/*/slurm*/uid_*/job_*', '/sys/fs/cgroup/slurm*/uid_*/job_*')
+CGROUP_UID_REGEX = re.compile(r'/uid_(\d+)/job_\d+$')
+
+# Only jobs in these states have processes running on their allocated nodes
+SQUEUE_STATES = 'RUNNING,COMPLETING,SUSPENDED'
+
+
+class ActiveJobSource:
+    """Identifies the users running Slurm jobs on a node
+
+    Returning `None` from `active_uids` indicates the source has no
+    information and active users are identified by scanning process commands
+    for `slurmd` (the default behavior).
+    """
+
+    name = 'process'
+
+    async def active_uids(self, node: str, runner: Optional[Union['asyncssh.SSHClientConnection', RemoteShell]]) -> Optional[Set[int]]:
+        """Return the user IDs running jobs on a node
+
+        Args:
+            node: The node name
+            runner: Open SSH connection or remote shell on the node, or `None` for the local machine
+
+        Returns:
+            A set of user IDs or `None` if unknown
+        """
+
+        return None
+
+
+class CgroupJobSource(ActiveJobSource):
+    """Reads job ownership from the Slurm cgroup hierarchy on each node
+
+    Only the cgroup v1 layout records the job owner in the cgroup path. If no
+    `uid_*/job_*` cgroup is found (e.g., on cgroup v2 nodes or when the
+    hierarchy is mounted elsewhere), job ownership is unknown and active
+    users are identified by scanning process commands instead.
+    """
+
+    name = 'cgroup'
+
+    async def active_uids(self, node: str, runner: Optional[Union['asyncssh.SSHClientConnection', RemoteShell]]) -> Optional[Set[int]]:
+        """Return the user IDs owning a job cgroup on the node
+
+        Args:
+            node: The node name
+            runner: Open SSH connection or remote shell on the node, or `None` for the local machine
+
+        Returns:
+            A set of user IDs, or `None` if no job cgroups were found
+        """
+
+        if runner is None:
+            uids = parse_cgroup_paths('\n'.join(path for pattern in CGROUP_PATTERNS for path in glob.iglob(pattern)))
+
+        else:
+            # Unmatched glob patterns are printed verbatim and ignored when parsing
+            result = await runner.run(f"printf '%s\\n' {' '.join(CGROUP_PATTERNS)}")
+            uids = parse_cgroup_paths(result.stdout)
+
+        # An empty result cannot be told apart from a missing hierarchy, and reporting no active users would
+        # remove the protection of running jobs
+        return uids or None
+
+
+class SqueueJobSource(ActiveJobSource):
+    """Looks up job ownership in an index built from a single `squeue` call"""
+
+    name = 'squeue'
+
+    def __init__(self, node_uids: Dict[str, Set[int]]) -> None:
+        """Instantiate a new source from an existing index
+
+        Args:
+            node_uids: Mapping of node names to the user IDs running jobs on them
+        """
+
+        self.node_uids = node_uids
+
+    @classmethod
+    async def fetch(cls, clusters: Optional[Collection[str]] = None) -> 'SqueueJobSource':
+        """Build a new index from the running jobs on one or more clusters
+
+        Args:
+            clusters: Optional names of the clusters to query (defaults to the local cluster)
+
+        Returns:
+            A new source instance
+        """
+
+        command = ['squeue', '-h', '-t', SQUEUE_STATES, '-o', '%N %U']
+        if clusters:
+            command.extend(('-M', ','.join(clusters)))
+
+        logging.debug('Fetching running jobs from squeue')
+        sub_proc = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+        stdout, stderr = await sub_proc.communicate()
+        if stderr:
+            raise RuntimeError(stderr)
+
+        return cls(parse_squeue_output(stdout.decode()))
+
+    async def active_uids(self, node: str, runner: Optional[Union['asyncssh.SSHClientConnection', RemoteShell]]) -> Optional[Set[int]]:
+        """Return the user IDs running jobs on the node
+
+        Args:
+            node: The node name
+            runner: Unused
+
+        Returns:
+            A set of user IDs
+        """
+
+        return self.node_uids.get(node, set())
+
+
+async def create_job_source(name: str, clusters: Optional[Collection[str]] = None) -> ActiveJobSource:
+    """Return a new active job source by name
+
+    Args:
+        name: One of the names in `JOB_SOURCES`
+        clusters: Clusters queried by sources that are built up front
+
+    Returns:
+        A new source instance
+    """
+
+    if name == SqueueJobSource.name:
+        return await SqueueJobSource.fetch(clusters)
+
+    if name == CgroupJobSource.name:
+        return CgroupJobSource()
+
+    if name == ActiveJobSource.name:
+        return ActiveJobSource()
+
+    raise ValueError(f'Unknown job source: {name}')
+
+
+def parse_cgroup_paths(output: str) -> Set[int]:
+    """Return the user IDs found in a list of Slurm job cgroup paths
+
+    Args:
+        output: Newline delimited cgroup paths
+
+    Returns:
+        A set of user IDs
+    """
+
+    uids = set()
+    for line in output.splitlines():
+        match = CGROUP_UID_REGEX.search(line.strip())
+        if match:
+            uids.add(int(match.group(1)))
+
+    return uids
+
+
+def parse_squeue_output(output: str) -> Dict[str, Set[int]]:
+    """Parse the output of `squeue -h -o '%N %U'` into a node to user ID index
+
+    Cluster headers printed when querying multiple clusters are ignored.
+
+    Args:
+        output: The squeue output
+
+    Returns:
+        A dictionary mapping node names to the user IDs running jobs on them
+    """
+
+    node_uids: Dict[str, Set[int]] = dict()
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) != 2 or line.startswith('CLUSTER:'):
+            continue
+
+        nodelist, uid = fields
+        for node in expand_hostlist(nodelist):
+            node_uids.setdefault(node, set()).add(int(uid))
+
+    return node_uids
+
+
+def expand_hostlist(hostlist: str) -> List[str]:
+    """Expand a Slurm hostlist expression into individual host names
+
+    For example, `c[01-03,07],gpu1` is expanded to `c01`, `c02`, `c03`, `c07`, and `gpu1`.
+
+    Args:
+        hostlist: The hostlist expression
+
+    Returns:
+        A list of host names
+    """
+
+    hosts = []
+    for expression in _split_hostlist(hostlist):
+        expanded = ['']
+        for prefix, ranges in re.findall(r'([^\[]*)(?:\[([^\]]*)\])?', expression):
+            suffixes = [prefix]
+            if ranges:
+                suffixes = [prefix + value for value in _expand_ranges(ranges)]
+
+            expanded = [head + tail for head in expanded for tail in suffixes]
+
+        hosts.extend(expanded)
+
+    return hosts
+
+
+def _split_hostlist(hostlist: str) -> List[str]:
+    """Split a hostlist on commas that are not enclosed in brackets"""
+
+    expressions = []
+    depth, start = 0, 0
+    for index, char in enumerate(hostlist):
+        if char == '[':
+            depth += 1
+
+        elif char == ']':
+            depth -= 1
+
+        elif char == ',' and depth == 0:
+            expressions.append(hostlist[start:index])
+            start = index + 1
+
+    expressions.append(hostlist[start:])
+    return [expression for expression in expressions if expression]
+
+
+def _expand_ranges(ranges: str) -> List[str]:
+    """Expand a comma separated list of values and zero padded ranges (e.g., `01-03,07`)"""
+
+    values = []
+    for item in ranges.split(','):
+        low, _, high = item.partition('-')
+        if not high:
+            values.append(low)
+            continue
+
+        width = len(low)
+        values.extend(str(value).zfill(width) for value in range(int(low), int(high) + 1))
+
+    return values
@@ -0,0 +1,218 @@
+"""Batched termination of process groups with signal escalation and verification."""
+
+import asyncio
+import logging
+import time
+from typing import Collection, Dict, List, Set, Tuple, Union, TYPE_CHECKING
+
+from .metrics import NodeMetrics
+from .session import RemoteShell
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+
+# Maximum number of process groups signalled by a single command (keeps command lines far below `ARG_MAX`)
+KILL_BATCH_SIZE = 500
+
+# Lists the process ID, process group ID, and state code of every process
+PS_STATUS_COMMAND = 'ps -eo pid=,pgid=,stat='
+
+
+class KillResult:
+    """Outcome of terminating a collection of process groups
+
+    Process groups are `terminated` if all of their processes exited within
+    the grace period after `SIGTERM`, and `killed` if they exited after
+    `SIGKILL`. Any processes still running afterwards are reported in
+    `survivors` along with their state code (e.g., `D` for uninterruptible
+    sleep).
+    """
+
+    __slots__ = ('pgids', 'terminated', 'killed', 'survivors')
+
+    def __init__(self, pgids: Collection[int]) -> None:
+        """Instantiate a new result
+
+        Args:
+            pgids: IDs of the signalled process groups
+        """
+
+        self.pgids = sorted(pgids)
+        self.terminated: List[int] = []
+        self.killed: List[int] = []
+        self.survivors: Dict[int, str] = dict()
+
+    @property
+    def surviving_pgids(self) -> List[int]:
+        """IDs of the process groups with at least one surviving process"""
+
+        return sorted(set(self.pgids) - set(self.terminated) - set(self.killed))
+
+
+class KillEngine:
+    """Terminates process groups on a node using a single connection
+
+    Process groups are sent `SIGTERM` in batches of at most `batch_size`
+    groups per command. Groups with processes still running after
+    `grace_period` seconds are sent `SIGKILL`, and the process table is
+    checked once more after `kill_timeout` seconds to identify processes that
+    could not be killed. A grace period of zero sends `SIGKILL` immediately.
+
+    When running in a `RemoteShell`, each round of signals and the following
+    status check are sent to the node in a single round trip.
+    """
+
+    def __init__(
+        self,
+        grace_period: float = 5,
+        kill_timeout: float = 1,
+        poll_interval: float = 0.5,
+        batch_size: int = KILL_BATCH_SIZE
+    ) -> None:
+        """Instantiate a new engine
+
+        Args:
+            grace_period: Seconds to wait for process groups to exit after `SIGTERM`
+            kill_timeout: Seconds to wait for process groups to exit after `SIGKILL`
+            poll_interval: Seconds between checks for surviving processes
+            batch_size: Maximum number of process groups signalled by a single command
+        """
+
+        if batch_size < 1:
+            raise ValueError('Batch size must be at least 1')
+
+        self.grace_period = grace_period
+        self.kill_timeout = kill_timeout
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+
+    def signal_commands(self, signal: str, pgids: Collection[int]) -> List[str]:
+        """Return the commands used to send a signal to the given process groups
+
+        Args:
+            signal: The signal name (e.g., `TERM`)
+            pgids: IDs of the process groups to signal
+
+        Returns:
+            One `pkill` command per batch of process groups
+        """
+
+        pgids = sorted(pgids)
+        batches = (pgids[start:start + self.batch_size] for start in range(0, len(pgids), self.batch_size))
+        return [f'pkill --signal {signal} --pgroup {",".join(map(str, batch))}' for batch in batches]
+
+    async def kill(self, runner: Union['asyncssh.SSHClientConnection', RemoteShell], pgids: Collection[int]) -> KillResult:
+        """Terminate the given process groups and verify they exited
+
+        Args:
+            runner: Open SSH connection or remote shell on the node
+            pgids: IDs of the process groups to terminate
+
+        Returns:
+            The outcome of terminating each process group
+        """
+
+        result = KillResult(pgids)
+        remaining = set(result.pgids)
+        if self.grace_period > 0:
+            alive = await self._signal_and_wait(runner, 'TERM', remaining, self.grace_period)
+            remaining = {pgid for pgid, _ in alive.values()}
+            result.terminated = sorted(set(result.pgids) - remaining)
+
+        if remaining:
+            alive = await self._signal_and_wait(runner, 'KILL', remaining, self.kill_timeout)
+            result.survivors = {pid: state for pid, (_, state) in alive.items()}
+            result.killed = sorted(remaining - {pgid for pgid, _ in alive.values()})
+
+        return result
+
+    async def _signal_and_wait(
+        self,
+        runner: Union['asyncssh.SSHClientConnection', RemoteShell],
+        signal: str,
+        pgids: Set[int],
+        timeout: float
+    ) -> Dict[int, Tuple[int, str]]:
+        """Signal process groups and wait up to `timeout` seconds for them to exit
+
+        Returns:
+            A mapping of surviving process IDs to their process group ID and state code
+        """
+
+        alive = await self._signal(runner, signal, pgids)
+        deadline = time.monotonic() + timeout
+        while alive and time.monotonic() < deadline:
+            await asyncio.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+            alive = await self._status(runner, pgids)
+
+        logging.debug(f'{len(alive)} process(es) survived SIG{signal}')
+        return alive
+
+    async def _signal(
+        self,
+        runner: Union['asyncssh.SSHClientConnection', RemoteShell],
+        signal: str,
+        pgids: Set[int]
+    ) -> Dict[int, Tuple[int, str]]:
+        """Send a signal to process groups and return the processes still running immediately afterwards"""
+
+        commands = self.signal_commands(signal, pgids)
+        if isinstance(runner, RemoteShell):
+            *signal_results, status_result = await runner.run_pipelined([*commands, PS_STATUS_COMMAND])
+
+        else:
+            signal_results = [await runner.run(command) for command in commands]
+            status_result = await runner.run(PS_STATUS_COMMAND)
+
+        # `pkill` exits with status 1 if none of the process groups exist anymore
+        for signal_result in signal_results:
+            if signal_result.exit_status not in (0, 1):
+                raise RuntimeError(f'Command {signal_result.command!r} exited with status {signal_result.exit_status}')
+
+        return self._alive(status_result.stdout, pgids)
+
+    async def _status(
+        self,
+        runner: Union['asyncssh.SSHClientConnection', RemoteShell],
+        pgids: Set[int]
+    ) -> Dict[int, Tuple[int, str]]:
+        """Return the running processes in the given process groups"""
+
+        return self._alive((await runner.run(PS_STATUS_COMMAND)).stdout, pgids)
+
+    @staticmethod
+    def _alive(output: str, pgids: Collection[int]) -> Dict[int, Tuple[int, str]]:
+        """Return running processes in the given process groups from the output of `PS_STATUS_COMMAND`
+
+        Zombie processes have already exited and are not included.
+        """
+
+        alive = dict()
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) != 3:
+                continue
+
+            pid, pgid, state = int(fields[0]), int(fields[1]), fields[2]
+            if pgid in pgids and not state.startswith('Z'):
+                alive[pid] = (pgid, state)
+
+        return alive
+
+
+def record_kill(node: str, result: KillResult, metrics: NodeMetrics) -> None:
+    """Log the outcome of terminating process groups and add it to the node metrics
+
+    Args:
+        node: The name of the node (used for logging)
+        result: The outcome of terminating process groups on the node
+        metrics: The node metrics
+    """
+
+    metrics.count('terminated_pgids', len(result.terminated))
+    metrics.count('killed_pgids', len(result.terminated) + len(result.killed))
+    metrics.count('surviving_pgids', len(result.surviving_pgids))
+    metrics.survivors = sorted(result.survivors)
+    if result.survivors:
+        states = ', '.join(f'{pid} ({state})' for pid, state in sorted(result.survivors.items()))
+        logging.warning(f'[{node}] Processes survived termination: {states}')
@@ -0,0 +1,191 @@
+"""Local execution backend for terminating processes on the current machine without SSH.
+
+Process data is read directly from `/proc` (reusing the `collector` module)
+and process groups are signalled using `os.killpg`, so no subprocesses are
+started. This backend is intended for running shinigami on each compute node,
+e.g., from a Slurm epilog or a systemd timer.
+"""
+
+import logging
+import os
+import signal
+import socket
+from typing import Dict, Optional, Set, Tuple
+
+from . import collector
+from .jobs import ActiveJobSource
+from .kill import KillEngine, record_kill
+from .metrics import NodeMetrics
+from .policy import ProcessPolicy
+from .process_table import ProcessTable
+from .utils import UIDWhitelist, filter_processes
+
+
+def read_process_table(proc_root: str = '/proc') -> ProcessTable:
+    """Return the process table of the local machine
+
+    Args:
+        proc_root: Mount point of the proc filesystem
+
+    Returns:
+        A table with the same columns as `utils.get_remote_processes`, including resource usage
+    """
+
+    processes = list(collector.iter_processes(proc_root))
+    if not processes:
+        return ProcessTable()
+
+    # Collected values are ordered like the table columns
+    return ProcessTable(*zip(*processes))
+
+
+def ancestor_pgids(process_table: ProcessTable, pid: int) -> Set[int]:
+    """Return the process groups of a process and all of its ancestors
+
+    Args:
+        process_table: The process table containing the process
+        pid: ID of the process
+
+    Returns:
+        A set of process group IDs
+    """
+
+    parents = dict(zip(process_table.pid, zip(process_table.ppid, process_table.pgid)))
+    pgids = set()
+    while pid in parents and pid > 1:
+        pid, pgid = parents[pid]
+        pgids.add(pgid)
+
+    return pgids
+
+
+def read_process_states(pgids: Set[int], proc_root: str = '/proc') -> Dict[int, Tuple[int, str]]:
+    """Return running processes in the given process groups
+
+    Zombie processes have already exited and are not included.
+
+    Args:
+        pgids: IDs of the process groups to check
+        proc_root: Mount point of the proc filesystem
+
+    Returns:
+        A mapping of process IDs to their process group ID and state code
+    """
+
+    alive = dict()
+    for entry in os.listdir(proc_root):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open(os.path.join(proc_root, entry, 'stat'), 'rb') as stat_file:
+                stat = stat_file.read().decode(errors='replace')
+
+        except OSError:
+            continue
+
+        # The command name may contain spaces and parentheses, so split on the last parenthesis
+        state, _, pgid = stat[stat.rindex(')') + 2:].split()[:3]
+        if int(pgid) in pgids and state != 'Z':
+            alive[int(entry)] = (int(pgid), state)
+
+    return alive
+
+
+class LocalKillEngine(KillEngine):
+    """Terminates process groups on the local machine using `os.killpg`
+
+    The signal escalation and verification behavior matches `KillEngine`.
+    Methods accepting a `runner` argument ignore it.
+    """
+
+    def __init__(self, grace_period: float = 5, kill_timeout: float = 1, poll_interval: float = 0.5, proc_root: str = '/proc') -> None:
+        """Instantiate a new engine
+
+        Args:
+            grace_period: Seconds to wait for process groups to exit after `SIGTERM`
+            kill_timeout: Seconds to wait for process groups to exit after `SIGKILL`
+            poll_interval: Seconds between checks for surviving processes
+            proc_root: Mount point of the proc filesystem
+        """
+
+        super().__init__(grace_period, kill_timeout, poll_interval)
+        self.proc_root = proc_root
+
+    async def _signal(self, runner: None, signal_name: str, pgids: Set[int]) -> Dict[int, Tuple[int, str]]:
+        """Send a signal to process groups and return the processes still running immediately afterwards"""
+
+        signum = getattr(signal, f'SIG{signal_name}')
+        for pgid in pgids:
+            try:
+                os.killpg(pgid, signum)
+
+            except ProcessLookupError:
+                pass
+
+        return await self._status(runner, pgids)
+
+    async def _status(self, runner: None, pgids: Set[int]) -> Dict[int, Tuple[int, str]]:
+        """Return the running processes in the given process groups"""
+
+        return read_process_states(pgids, self.proc_root)
+
+
+async def terminate_local_processes(
+    uid_whitelist: UIDWhitelist,
+    debug: bool,
+    metrics: Optional[NodeMetrics] = None,
+    job_source: Optional[ActiveJobSource] = None,
+    kill_engine: Optional[LocalKillEngine] = None,
+    proc_root: str = '/proc',
+    policy: Optional[ProcessPolicy] = None
+) -> ProcessTable:
+    """Terminate orphaned processes on the local machine
+
+    Processes are filtered using the same pipeline as `utils.terminate_errant_processes`.
+
+    Args:
+        uid_whitelist: Do not terminate processes owned by the given UIDs
+        debug: Log which process to terminate but do not terminate them
+        metrics: Optionally record per-phase timings and process counts
+        job_source: Source of the users running Slurm jobs on the machine (defaults to scanning process commands)
+        kill_engine: Terminates marked process groups (defaults to a `LocalKillEngine` with default settings)
+        proc_root: Mount point of the proc filesystem
+        policy: Optional compiled filter rules (`uid_whitelist` is ignored if given)
+
+    Returns:
+        The processes marked for termination
+    """
+
+    node = socket.gethostname().split('.')[0]
+    metrics = metrics if metrics is not None else NodeMetrics(node)
+    job_source = job_source if job_source is not None else ActiveJobSource()
+    kill_engine = kill_engine if kill_engine is not None else LocalKillEngine(proc_root=proc_root)
+
+    with metrics.phase('jobs'):
+        active_uids = await job_source.active_uids(node, None)
+
+    logging.info(f'[{node}] Scanning for processes')
+    with metrics.phase('fetch'):
+        process_table = read_process_table(proc_root)
+
+    metrics.count('processes', len(process_table))
+    with metrics.phase('filter'):
+        # When started by a systemd timer or an orphaned shell, this process and its parents look orphaned too
+        protected = ancestor_pgids(process_table, os.getpid())
+        process_table = filter_processes(process_table, uid_whitelist, active_uids, metrics, policy)
+        process_table = process_table.filter(pgid not in protected for pgid in process_table.pgid)
+
+    for row in process_table.rows():  # pragma: nocover
+        logging.info(f'[{node}] Marking for termination {row}')
+
+    if process_table.empty or debug:
+        return process_table
+
+    pgids = process_table.unique_pgids()
+    logging.info(f"[{node}] Sending termination signal for process groups {','.join(map(str, pgids))}")
+    with metrics.phase('kill'):
+        kill_result = await kill_engine.kill(None, pgids)
+
+    record_kill(node, kill_result, metrics)
+    return process_table
@@ -0,0 +1,208 @@
+"""Timing and throughput instrumentation for sweeps over compute nodes."""
+
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class NodeMetrics:
+    """Per-phase timings and counters collected while processing a single node
+
+    Timings are recorded in seconds for named phases (e.g., `queue`, `connect`,
+    `fetch`, `parse`, `filter`, `kill`). Counters record values such as the
+    number of processes remaining after each filter.
+    """
+
+    def __init__(self, node: str, cluster: Optional[str] = None) -> None:
+        """Start collecting metrics for a node
+
+        Args:
+            node: The node name
+            cluster: Optional name of the cluster the node belongs to
+        """
+
+        self.node = node
+        self.cluster = cluster
+        self.created = time.monotonic()
+        self.finished: Optional[float] = None
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = dict()
+        self.bytes_received = 0
+        self.survivors: List[int] = []
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager that adds the elapsed time to the given phase
+
+        Args:
+            name: The phase name
+        """
+
+        start = time.monotonic()
+        try:
+            yield
+
+        finally:
+            self.timings[name] += time.monotonic() - start
+
+    def count(self, name: str, value: int) -> None:
+        """Record a named counter value
+
+        Args:
+            name: The counter name
+            value: The counter value
+        """
+
+        self.counts[name] = value
+
+    def finish(self) -> None:
+        """Stop the node duration timer"""
+
+        if self.finished is None:
+            self.finished = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the start and end (or current time) of metric collection"""
+
+        return (self.finished or time.monotonic()) - self.created
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the collected metrics as a JSON serializable dictionary"""
+
+        return {
+            'type': 'node',
+            'node': self.node,
+            'cluster': self.cluster,
+            'duration': self.duration,
+            'timings': dict(self.timings),
+            'counts': self.counts,
+            'bytes_received': self.bytes_received,
+            'survivors': self.survivors,
+            'error': self.error,
+        }
+
+
+class MetricsRecorder:
+    """Writes node and sweep metrics as JSON lines and/or a Prometheus textfile
+
+    Node and cluster records are appended to the JSON lines file as soon as
+    they are recorded. The Prometheus file is rewritten atomically at the end
+    of each sweep so it can be read by the node exporter textfile collector.
+    """
+
+    def __init__(self, jsonl_path: Optional[Path] = None, prometheus_path: Optional[Path] = None) -> None:
+        """Instantiate a new recorder
+
+        Args:
+            jsonl_path: Optional path of a JSON lines file to append records to
+            prometheus_path: Optional path of a Prometheus textfile to write sweep summaries to
+        """
+
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.nodes: List[NodeMetrics] = []
+        self.clusters: Dict[str, Dict[str, float]] = dict()
+
+    def record_node(self, metrics: NodeMetrics) -> None:
+        """Record the metrics of a processed node
+
+        Args:
+            metrics: The node metrics
+        """
+
+        metrics.finish()
+        self.nodes.append(metrics)
+        self._write_jsonl(metrics.as_dict())
+
+    def record_cluster(self, cluster: str, nodes: int, duration: float) -> None:
+        """Record the summary of a scanned cluster
+
+        Args:
+            cluster: The cluster name
+            nodes: Number of scanned nodes
+            duration: Seconds spent scanning the cluster
+        """
+
+        self.clusters[cluster] = {'nodes': nodes, 'duration': duration}
+        self._write_jsonl({'type': 'cluster', 'cluster': cluster, 'nodes': nodes, 'duration': duration})
+
+    def record_sweep(self, duration: float, scheduler_stats: Optional[Dict[str, float]] = None) -> None:
+        """Record the summary of a completed sweep and write the Prometheus textfile
+
+        Args:
+            duration: Seconds spent on the sweep
+            scheduler_stats: Optional queueing statistics from the scheduler
+        """
+
+        summary = {
+            'type': 'sweep',
+            'duration': duration,
+            'nodes': len(self.nodes),
+            'failed_nodes': sum(metrics.error is not None for metrics in self.nodes),
+            'scheduler': scheduler_stats or {},
+        }
+
+        self._write_jsonl(summary)
+        if self.prometheus_path is not None:
+            self._write_prometheus(summary)
+
+    def _write_jsonl(self, record: Dict[str, Any]) -> None:
+        """Append a record to the JSON lines file"""
+
+        if self.jsonl_path is None:
+            return
+
+        with open(self.jsonl_path, 'a') as jsonl_file:
+            jsonl_file.write(json.dumps(record) + '\n')
+
+    def _write_prometheus(self, summary: Dict[str, Any]) -> None:
+        """Atomically write sweep metrics in the Prometheus text exposition format"""
+
+        phase_totals: Dict[str, float] = defaultdict(float)
+        for metrics in self.nodes:
+            for phase, seconds in metrics.timings.items():
+                phase_totals[phase] += seconds
+
+        lines = [
+            '# HELP shinigami_sweep_duration_seconds Duration of the last sweep.',
+            '# TYPE shinigami_sweep_duration_seconds gauge',
+            f'shinigami_sweep_duration_seconds {summary["duration"]}',
+            '# HELP shinigami_sweep_timestamp_seconds Completion time of the last sweep.',
+            '# TYPE shinigami_sweep_timestamp_seconds gauge',
+            f'shinigami_sweep_timestamp_seconds {time.time()}',
+            '# HELP shinigami_sweep_nodes Number of nodes processed in the last sweep.',
+            '# TYPE shinigami_sweep_nodes gauge',
+            f'shinigami_sweep_nodes{{status="ok"}} {summary["nodes"] - summary["failed_nodes"]}',
+            f'shinigami_sweep_nodes{{status="error"}} {summary["failed_nodes"]}',
+            '# HELP shinigami_sweep_phase_seconds Seconds spent in each phase summed over all nodes.',
+            '# TYPE shinigami_sweep_phase_seconds gauge',
+            *(f'shinigami_sweep_phase_seconds{{phase="{phase}"}} {seconds}' for phase, seconds in sorted(phase_totals.items())),
+            '# HELP shinigami_sweep_bytes_received Bytes of process data received in the last sweep.',
+            '# TYPE shinigami_sweep_bytes_received gauge',
+            f'shinigami_sweep_bytes_received {sum(metrics.bytes_received for metrics in self.nodes)}',
+            '# HELP shinigami_sweep_terminated_process_groups Process groups terminated in the last sweep.',
+            '# TYPE shinigami_sweep_terminated_process_groups gauge',
+            f'shinigami_sweep_terminated_process_groups {sum(metrics.counts.get("killed_pgids", 0) for metrics in self.nodes)}',
+            '# HELP shinigami_cluster_duration_seconds Duration of the last scan of each cluster.',
+            '# TYPE shinigami_cluster_duration_seconds gauge',
+            *(f'shinigami_cluster_duration_seconds{{cluster="{name}"}} {values["duration"]}' for name, values in self.clusters.items()),
+            '# HELP shinigami_cluster_nodes Number of nodes scanned in the last scan of each cluster.',
+            '# TYPE shinigami_cluster_nodes gauge',
+            *(f'shinigami_cluster_nodes{{cluster="{name}"}} {values["nodes"]}' for name, values in self.clusters.items()),
+            '# HELP shinigami_node_duration_seconds Time spent processing each node in the last sweep.',
+            '# TYPE shinigami_node_duration_seconds gauge',
+            *(f'shinigami_node_duration_seconds{{node="{metrics.node}"}} {metrics.duration}' for metrics in self.nodes),
+            '# HELP shinigami_scheduler_stat Scheduler queueing statistics for the last sweep.',
+            '# TYPE shinigami_scheduler_stat gauge',
+            *(f'shinigami_scheduler_stat{{stat="{name}"}} {value}' for name, value in summary['scheduler'].items()),
+        ]
+
+        tmp_path = self.prometheus_path.with_name(f'{self.prometheus_path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.prometheus_path)
@@ -0,0 +1,207 @@
+"""Process filter rules compiled into predicates evaluated in a single pass."""
+
+import re
+from typing import Collection, Dict, Iterable, Optional, Pattern, Union
+
+from .intervals import IntervalSet, IntervalSpec
+from .metrics import NodeMetrics
+from .process_table import ProcessTable
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Combine regular expressions into a single alternation
+
+    Args:
+        patterns: Regular expressions matched anywhere in a string
+
+    Returns:
+        A compiled pattern matching any of the given expressions, or `None` if no expressions are given
+    """
+
+    patterns = list(patterns)
+    if not patterns:
+        return None
+
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+class ProcessPolicy:
+    """Selects the processes to terminate on a node
+
+    All filter rules are compiled once on construction. Processes are
+    selected if they:
+      1. Are not owned by a user running a Slurm job
+      2. Are orphaned
+      3. Are owned by a whitelisted user
+      4. Do not share a process group with a command matching any `allow_commands` pattern
+      5. Have a command matching a `deny_commands` pattern (if any are given)
+      6. Have been running for at least `min_age` seconds
+      7. Use at least `min_cpu` percent of a core or `min_rss` MiB of memory (if either is given)
+
+    Rules are checked in the above order for each process in a single pass
+    over the process table. The number of processes remaining after each
+    rule is recorded in the node metrics.
+
+    Processes are terminated by signalling their process group, so allowed
+    commands protect every member of their group. For example, an orphaned
+    shell script is not terminated while it shares a group with an allowed
+    `tmux` server it started.
+
+    Resource rules compare against the resource usage columns of the process
+    table. Tables without resource usage (e.g., built from older `ps` output)
+    report zero usage, so no processes pass the `min_cpu` and `min_rss` rules.
+    """
+
+    rules = (
+        'exclude_active_slurm_users',
+        'include_orphaned_processes',
+        'include_user_whitelist',
+        'exclude_allowed_commands',
+        'include_denied_commands',
+        'include_min_age',
+        'include_resource_usage',
+    )
+
+    def __init__(
+        self,
+        uid_whitelist: Union[IntervalSet, Collection[IntervalSpec]],
+        allow_commands: Iterable[str] = (),
+        deny_commands: Iterable[str] = (),
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None
+    ) -> None:
+        """Compile a new policy
+
+        Args:
+            uid_whitelist: Only terminate processes owned by the given UIDs
+            allow_commands: Never terminate processes with a command matching any of the given regular expressions
+            deny_commands: Only terminate processes with a command matching any of the given regular expressions
+            min_age: Only terminate processes running for at least the given number of seconds
+            min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+            min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+        """
+
+        self.uid_whitelist = IntervalSet.coerce(uid_whitelist)
+        self.allow_commands = compile_patterns(allow_commands)
+        self.deny_commands = compile_patterns(deny_commands)
+        self.min_age = min_age
+        self.min_cpu = min_cpu
+        self.min_rss = min_rss
+
+    @property
+    def changes_over_time(self) -> bool:
+        """Whether the policy can select a process it rejected earlier without the process table changing"""
+
+        return self.min_age > 0 or self.min_cpu is not None or self.min_rss is not None
+
+    @property
+    def matches_commands(self) -> bool:
+        """Whether the policy matches the commands of all selected processes (not only orphan roots)"""
+
+        return self.allow_commands is not None or self.deny_commands is not None
+
+    def select(
+        self,
+        table: ProcessTable,
+        orphaned: Collection[int],
+        active_uids: Optional[Collection[int]] = None,
+        metrics: Optional[NodeMetrics] = None
+    ) -> ProcessTable:
+        """Return the processes to terminate
+
+        Args:
+            table: Process data for a single node
+            orphaned: IDs of orphaned processes and their descendants
+            active_uids: Optional user IDs known to be running jobs (defaults to users running `slurmd` commands)
+            metrics: Optionally record the number of processes remaining after each rule
+
+        Returns:
+            A new table with the selected processes
+        """
+
+        if active_uids is None:
+            active_uids = {uid for uid, cmd in zip(table.uid, table.cmd) if 'slurmd' in cmd}
+
+        active_uids = set(active_uids)
+        orphaned = orphaned if isinstance(orphaned, (set, frozenset)) else set(orphaned)
+        allow_search = self.allow_commands.search if self.allow_commands is not None else None
+        deny_search = self.deny_commands.search if self.deny_commands is not None else None
+
+        # Signalling a group would also terminate the allowed processes it contains
+        allowed_pgids = set()
+        if allow_search is not None:
+            allowed_pgids = {pgid for pgid, cmd in zip(table.pgid, table.cmd) if allow_search(cmd)}
+
+        # Disabled resource thresholds are replaced with values that can never be reached
+        check_usage = self.min_cpu is not None or self.min_rss is not None
+        min_cpu = self.min_cpu if self.min_cpu is not None else float('inf')
+        min_rss_kib = self.min_rss * 1024 if self.min_rss is not None else float('inf')
+
+        # Index of the first rule rejecting each process (or `len(rules)` if it is selected)
+        selected = len(self.rules)
+        rejections = [0] * (selected + 1)
+        mask = []
+        rows = zip(table.pid, table.pgid, table.uid, table.cmd, table.pcpu, table.rss, table.etime)
+        for pid, pgid, uid, cmd, pcpu, rss, etime in rows:
+            if uid in active_uids:
+                rule = 0
+
+            elif pid not in orphaned:
+                rule = 1
+
+            elif uid not in self.uid_whitelist:
+                rule = 2
+
+            elif pgid in allowed_pgids:
+                rule = 3
+
+            elif deny_search is not None and not deny_search(cmd):
+                rule = 4
+
+            elif etime < self.min_age:
+                rule = 5
+
+            elif check_usage and pcpu < min_cpu and rss < min_rss_kib:
+                rule = 6
+
+            else:
+                rule = selected
+
+            rejections[rule] += 1
+            mask.append(rule == selected)
+
+        if metrics is not None:
+            remaining = len(table)
+            for name, rejected in zip(self.rules, rejections):
+                remaining -= rejected
+                metrics.count(f'after_{name}', remaining)
+
+        return table.filter(mask)
+
+
+class PolicySet:
+    """Process policies for each cluster with a shared default"""
+
+    def __init__(self, default: ProcessPolicy, clusters: Optional[Dict[str, ProcessPolicy]] = None) -> None:
+        """Instantiate a new policy set
+
+        Args:
+            default: Policy used for nodes outside any configured cluster
+            clusters: Mapping of cluster names to cluster specific policies
+        """
+
+        self.default = default
+        self.clusters = clusters or dict()
+
+    def for_cluster(self, cluster: Optional[str]) -> ProcessPolicy:
+        """Return the policy of a cluster
+
+        Args:
+            cluster: The cluster name, or `None` for nodes outside any cluster
+
+        Returns:
+            The cluster specific policy if configured, otherwise the default policy
+        """
+
+        return self.clusters.get(cluster, self.default)
@@ -0,0 +1,186 @@
+"""Pooling of persistent SSH connections to compute nodes."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+
+
+class ConnectionPool:
+    """Cache of authenticated SSH connections that are reused across sweeps
+
+    Connections are opened on first use and kept open until they are idle for
+    longer than `idle_timeout` seconds, are closed by the remote host, or are
+    evicted to keep the pool within `max_size` connections. Connection
+    liveness is maintained by the SSH keepalive settings in `ssh_options`.
+
+    Failed connection attempts are retried with exponential backoff. While a
+    node is backing off, requests for a connection fail immediately instead
+    of waiting for another connection timeout.
+    """
+
+    def __init__(
+        self,
+        ssh_options: Optional['asyncssh.SSHClientConnectionOptions'] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: float = 600,
+        backoff_base: float = 1,
+        backoff_max: float = 300
+    ) -> None:
+        """Instantiate a new connection pool
+
+        Args:
+            ssh_options: Options for configuring outbound SSH connections
+            max_size: Maximum number of open connections
+            idle_timeout: Close connections that are unused for this many seconds
+            backoff_base: Initial reconnect delay in seconds
+            backoff_max: Maximum reconnect delay in seconds
+        """
+
+        self.ssh_options = ssh_options
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Connections are ordered from least to most recently used
+        self._connections: Dict[str, 'asyncssh.SSHClientConnection'] = OrderedDict()
+        self._last_used: Dict[str, float] = dict()
+        self._in_use: Dict[str, int] = defaultdict(int)
+        self._failures: Dict[str, int] = defaultdict(int)
+        self._retry_after: Dict[str, float] = dict()
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._watchers: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._connections
+
+    @asynccontextmanager
+    async def connection(self, node: str) -> AsyncIterator['asyncssh.SSHClientConnection']:
+        """Borrow an open connection to a node
+
+        A new connection is opened if the pool does not already hold one.
+
+        Args:
+            node: The DNS resolvable name of the node
+
+        Yields:
+            An open SSH connection
+        """
+
+        import asyncssh
+
+        conn = await self._get(node)
+        self._in_use[node] += 1
+        try:
+            yield conn
+
+        except (asyncssh.DisconnectError, OSError):
+            self._discard(node, conn)
+            raise
+
+        finally:
+            self._in_use[node] -= 1
+            self._last_used[node] = time.monotonic()
+
+    def evict_idle(self) -> int:
+        """Close connections that have been idle for longer than the idle timeout
+
+        Returns:
+            The number of closed connections
+        """
+
+        cutoff = time.monotonic() - self.idle_timeout
+        idle_nodes = [
+            node for node in self._connections
+            if not self._in_use[node] and self._last_used.get(node, 0) < cutoff
+        ]
+
+        for node in idle_nodes:
+            logging.debug(f'[{node}] Closing idle SSH connection')
+            self._discard(node, self._connections[node])
+
+        return len(idle_nodes)
+
+    async def close(self) -> None:
+        """Close all open connections"""
+
+        connections = list(self._connections.items())
+        for node, conn in connections:
+            self._discard(node, conn)
+
+        await asyncio.gather(*(conn.wait_closed() for _, conn in connections), return_exceptions=True)
+
+    async def _get(self, node: str) -> 'asyncssh.SSHClientConnection':
+        """Return a pooled connection or open a new one"""
+
+        import asyncssh
+
+        async with self._locks[node]:
+            conn = self._connections.get(node)
+            if conn is not None:
+                self._connections.move_to_end(node)
+                return conn
+
+            delay = self._retry_after.get(node, 0) - time.monotonic()
+            if delay > 0:
+                raise ConnectionError(f'Reconnect delayed for {delay:.1f}s after {self._failures[node]} failed attempt(s)')
+
+            logging.debug(f'[{node}] Opening SSH connection')
+            try:
+                conn = await asyncssh.connect(node, options=self.ssh_options)
+
+            except Exception:
+                self._failures[node] += 1
+                backoff = min(self.backoff_base * 2 ** (self._failures[node] - 1), self.backoff_max)
+                self._retry_after[node] = time.monotonic() + backoff
+                raise
+
+            self._failures.pop(node, None)
+            self._retry_after.pop(node, None)
+            self._evict_lru()
+
+            self._connections[node] = conn
+            self._last_used[node] = time.monotonic()
+            watcher = asyncio.create_task(self._watch(node, conn))
+            self._watchers.add(watcher)
+            watcher.add_done_callback(self._watchers.discard)
+            return conn
+
+    async def _watch(self, node: str, conn: 'asyncssh.SSHClientConnection') -> None:
+        """Remove a connection from the pool once it is closed (e.g., after a failed keepalive)"""
+
+        await conn.wait_closed()
+        if self._connections.get(node) is conn:
+            logging.debug(f'[{node}] SSH connection closed by remote host')
+            self._discard(node, conn)
+
+    def _evict_lru(self) -> None:
+        """Close least recently used connections until there is room for a new connection"""
+
+        if self.max_size is None:
+            return
+
+        for node in list(self._connections):
+            if len(self._connections) < self.max_size:
+                break
+
+            if not self._in_use[node]:
+                self._discard(node, self._connections[node])
+
+    def _discard(self, node: str, conn: 'asyncssh.SSHClientConnection') -> None:
+        """Close a connection and remove it from the pool"""
+
+        if self._connections.get(node) is conn:
+            del self._connections[node]
+            self._last_used.pop(node, None)
+
+        conn.close()
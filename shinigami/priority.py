@@ -0,0 +1,216 @@
+"""Ordering of the nodes visited in a sweep by the likelihood of finding orphaned processes."""
+
+import asyncio
+import logging
+from typing import Collection, Dict, Iterable, List, Optional, Set
+
+from .jobs import expand_hostlist
+from .state import NodeStateStore
+
+# States of jobs that are no longer running on their allocated nodes
+SACCT_ENDED_STATES = 'CANCELLED,COMPLETED,FAILED,NODE_FAIL,OUT_OF_MEMORY,PREEMPTED,TIMEOUT'
+
+
+def parse_sacct_output(output: str) -> Set[str]:
+    """Parse the output of `sacct -n -P -o NodeList` into a set of node names
+
+    Jobs that never started report a node list of `None assigned` and are ignored.
+
+    Args:
+        output: The sacct output
+
+    Returns:
+        The names of all nodes allocated to the listed jobs
+    """
+
+    nodes = set()
+    for line in output.splitlines():
+        nodelist = line.split('|', 1)[0].strip()
+        if nodelist and not nodelist.startswith('None'):
+            nodes.update(expand_hostlist(nodelist))
+
+    return nodes
+
+
+async def _run_slurm_command(*command: str) -> str:
+    """Run a Slurm command and return its output
+
+    Raises:
+        RuntimeError: If the command writes to stderr
+    """
+
+    sub_proc = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+    stdout, stderr = await sub_proc.communicate()
+    if stderr:
+        raise RuntimeError(stderr.decode().strip())
+
+    return stdout.decode()
+
+
+async def get_recently_ended(clusters: Optional[Collection[str]] = None, window: float = 3600) -> Set[str]:
+    """Return the nodes allocated to jobs that ended within the given time window
+
+    Args:
+        clusters: Optional names of the clusters to query (defaults to the local cluster)
+        window: Number of seconds to look back from the current time
+
+    Returns:
+        A set of node names
+    """
+
+    command = [
+        'sacct', '-a', '-X', '-n', '-P', '-o', 'NodeList',
+        '-s', SACCT_ENDED_STATES, '-S', f'now-{int(window)}', '-E', 'now']
+
+    if clusters:
+        command.extend(('-M', ','.join(clusters)))
+
+    logging.debug('Fetching recently ended jobs from sacct')
+    return parse_sacct_output(await _run_slurm_command(*command))
+
+
+async def get_listed_node_states(nodes: Collection[str]) -> Dict[str, str]:
+    """Return the Slurm state of the given nodes on the local cluster
+
+    Args:
+        nodes: The node names
+
+    Returns:
+        A mapping of node names to their state
+    """
+
+    output = await _run_slurm_command('sinfo', '-N', '-h', '-o', '%N %T', '-n', ','.join(nodes))
+    node_states = dict()
+    for line in output.splitlines():
+        node, _, state = line.strip().partition(' ')
+        if node:
+            node_states.setdefault(node, state.strip().lower())
+
+    return node_states
+
+
+class NodePrioritizer:
+    """Orders nodes so those most likely to hold orphaned processes are visited first
+
+    Each node is scored using signals that are cheap to collect for a whole
+    cluster at once:
+      - `ended`: A job on the node recently ended or is completing
+      - `orphans`: Processes were marked for termination on the node's last visit
+      - `idle`: The node is idle, so any user process left on it is orphaned
+
+    Nodes are ordered by the sum of the weights of their signals. Nodes with
+    equal scores keep their given order (e.g., the order of
+    `NodeStateStore.rank`). Combined with a sweep deadline, this cleans the
+    nodes most likely to be leaking resources before the time budget runs out.
+    """
+
+    weights = {'ended': 4, 'orphans': 2, 'idle': 1}
+
+    def __init__(
+        self,
+        recently_ended: Collection[str] = (),
+        node_states: Optional[Dict[str, str]] = None,
+        state_store: Optional[NodeStateStore] = None
+    ) -> None:
+        """Instantiate a new prioritizer
+
+        Args:
+            recently_ended: Names of nodes allocated to recently ended jobs
+            node_states: Optional mapping of node names to their Slurm state
+            state_store: Optional node history used to identify nodes with orphans on their last visit
+        """
+
+        self.recently_ended = set(recently_ended)
+        self.node_states = node_states or dict()
+        self.state_store = state_store
+
+    @classmethod
+    async def fetch(
+        cls,
+        clusters: Optional[Collection[str]] = None,
+        window: float = 3600,
+        node_states: Optional[Dict[str, str]] = None,
+        state_store: Optional[NodeStateStore] = None,
+        nodes: Optional[Collection[str]] = None
+    ) -> 'NodePrioritizer':
+        """Build a new prioritizer from the jobs that ended on one or more clusters
+
+        Prioritization is best effort. If Slurm cannot be queried, nodes are
+        ordered using the remaining signals.
+
+        Args:
+            clusters: Optional names of the clusters to query (defaults to the local cluster)
+            window: Seconds to look back for ended jobs
+            node_states: Optional mapping of node names to their Slurm state
+            state_store: Optional node history used to identify nodes with orphans on their last visit
+            nodes: Optionally query the state of the given nodes if `node_states` is not given
+
+        Returns:
+            A new prioritizer instance
+        """
+
+        try:
+            recently_ended = await get_recently_ended(clusters, window)
+
+        except (OSError, RuntimeError) as caught:
+            logging.warning(f'Could not fetch recently ended jobs: {caught}')
+            recently_ended = set()
+
+        if node_states is None and nodes:
+            try:
+                node_states = await get_listed_node_states(nodes)
+
+            except (OSError, RuntimeError) as caught:
+                logging.warning(f'Could not fetch node states: {caught}')
+
+        return cls(recently_ended, node_states, state_store)
+
+    def signals(self, node: str) -> List[str]:
+        """Return the names of the signals observed for a node
+
+        Args:
+            node: The node name
+
+        Returns:
+            A list of signal names (see the `weights` attribute)
+        """
+
+        state = self.node_states.get(node, '').rstrip('*~#!%$@^-')
+        signals = []
+        if node in self.recently_ended or state.startswith('comp'):
+            signals.append('ended')
+
+        if self.state_store is not None and self.state_store.nodes.get(node, {}).get('clean_scans', 1) == 0:
+            signals.append('orphans')
+
+        if state == 'idle':
+            signals.append('idle')
+
+        return signals
+
+    def score(self, node: str) -> int:
+        """Return the priority score of a node
+
+        Args:
+            node: The node name
+
+        Returns:
+            The sum of the weights of the node's signals
+        """
+
+        return sum(self.weights[signal] for signal in self.signals(node))
+
+    def order(self, nodes: Iterable[str]) -> List[str]:
+        """Order nodes by descending priority score
+
+        Args:
+            nodes: The node names to order
+
+        Returns:
+            A list of node names with nodes of equal score in their given order
+        """
+
+        scores = {node: self.score(node) for node in nodes}
+        return sorted(scores, key=lambda node: -scores[node])
@@ -0,0 +1,224 @@
+"""Lightweight columnar storage for process data."""
+
+from array import array
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ProcessTable:
+    """Column oriented table of process data
+
+    Numeric columns are stored as typed arrays and the command column as a
+    list of strings. Rows are selected using boolean masks, which avoids
+    the import and memory overhead of a DataFrame on the per-node hot path.
+
+    Columns are accessible by attribute (`table.pid`) or by name (`table['PID']`).
+
+    Resource usage columns are optional. If not given, they are filled with
+    zeros (or empty state codes) so every table has the same columns.
+    """
+
+    __slots__ = ('pid', 'ppid', 'pgid', 'uid', 'cmd', 'pcpu', 'rss', 'etime', 'state')
+    columns = ('PID', 'PPID', 'PGID', 'UID', 'CMD', 'PCPU', 'RSS', 'ETIME', 'STATE')
+
+    def __init__(
+        self,
+        pid: Iterable[int] = (),
+        ppid: Iterable[int] = (),
+        pgid: Iterable[int] = (),
+        uid: Iterable[int] = (),
+        cmd: Iterable[str] = (),
+        pcpu: Optional[Iterable[float]] = None,
+        rss: Optional[Iterable[int]] = None,
+        etime: Optional[Iterable[int]] = None,
+        state: Optional[Iterable[str]] = None
+    ) -> None:
+        """Instantiate a new table from column values
+
+        Args:
+            pid: Process IDs
+            ppid: Parent process IDs
+            pgid: Process group IDs
+            uid: Process owner user IDs
+            cmd: Process commands
+            pcpu: Optional CPU usage over the lifetime of each process as a percentage of one core
+            rss: Optional resident set sizes in KiB
+            etime: Optional seconds elapsed since each process started
+            state: Optional process state codes (e.g., `R`, `S`, or `D`)
+        """
+
+        self.pid = array('q', pid)
+        self.ppid = array('q', ppid)
+        self.pgid = array('q', pgid)
+        self.uid = array('q', uid)
+        self.cmd = list(cmd)
+
+        rows = len(self.pid)
+        self.pcpu = array('d', pcpu) if pcpu is not None else array('d', bytes(8 * rows))
+        self.rss = array('q', rss) if rss is not None else array('q', bytes(8 * rows))
+        self.etime = array('q', etime) if etime is not None else array('q', bytes(8 * rows))
+        self.state = list(state) if state is not None else [''] * rows
+
+        if not all(len(getattr(self, column)) == rows for column in self.__slots__):
+            raise ValueError('All columns must have the same length')
+
+    @classmethod
+    def from_ps_output(cls, output: str) -> 'ProcessTable':
+        """Create a table from the output of `ps -eo pid,ppid,pgid,uid,cmd`
+
+        The first line of output is assumed to be a header. Output including
+        resource usage columns (see `StreamingPsParser`) is also supported.
+
+        Args:
+            output: The ps output
+
+        Returns:
+            A new table instance
+        """
+
+        parser = StreamingPsParser()
+        parser.feed(output)
+        return parser.close()
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def __getitem__(self, column: str) -> Any:
+        if column not in self.columns:
+            raise KeyError(column)
+
+        return getattr(self, column.lower())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ProcessTable):
+            return NotImplemented
+
+        return all(getattr(self, col) == getattr(other, col) for col in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} rows)'
+
+    @property
+    def empty(self) -> bool:
+        """Whether the table has no rows"""
+
+        return len(self) == 0
+
+    def filter(self, mask: Iterable[bool]) -> 'ProcessTable':
+        """Return a new table containing the rows selected by a boolean mask
+
+        Args:
+            mask: Boolean values indicating which rows to keep
+
+        Returns:
+            A new table instance
+        """
+
+        mask = list(mask)
+        return ProcessTable(*(compress(getattr(self, col), mask) for col in self.__slots__))
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over table rows as dictionaries keyed by column name"""
+
+        for values in zip(*(getattr(self, column) for column in self.__slots__)):
+            yield dict(zip(self.columns, values))
+
+    def unique_pgids(self) -> List[int]:
+        """Return the unique process group IDs in order of appearance"""
+
+        return list(dict.fromkeys(self.pgid))
+
+    def total_usage(self) -> Tuple[float, int]:
+        """Return the combined CPU usage (percent of a core) and resident memory (KiB) of all processes"""
+
+        return round(sum(self.pcpu), 1), sum(self.rss)
+
+
+class StreamingPsParser:
+    """Incremental parser for the output of `ps -eo pid,ppid,pgid,uid,cmd`
+
+    Output can be fed in chunks of any size as it is received, so the raw
+    output text is never buffered in full. Numeric columns are parsed
+    directly into the integer arrays of a `ProcessTable`. Commands of rows
+    rejected by the `keep_cmd` predicate are not stored; these rows are kept
+    with an empty command, so the table still grows with the number of
+    processes.
+
+    If the header includes a `%CPU` column, the output is assumed to include
+    resource usage columns in the layout of `ps -eo pid,ppid,pgid,uid,pcpu,rss,etimes,stat,cmd`.
+    """
+
+    def __init__(self, keep_cmd: Optional[Callable[[int, int, int, int, str], bool]] = None) -> None:
+        """Instantiate a new parser
+
+        Args:
+            keep_cmd: Called with the pid, ppid, pgid, uid, and command of each row and returns whether to store the command
+        """
+
+        self.keep_cmd = keep_cmd
+        self.table = ProcessTable()
+        self._partial_line = ''
+        self._header_seen = False
+        self._resources = False
+
+    def feed(self, data: str) -> None:
+        """Parse a chunk of ps output
+
+        Args:
+            data: The next chunk of output
+        """
+
+        lines = (self._partial_line + data).split('\n')
+        self._partial_line = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> ProcessTable:
+        """Parse any remaining buffered output and return the parsed table
+
+        Returns:
+            The table of parsed process data
+        """
+
+        if self._partial_line:
+            self._parse_line(self._partial_line)
+            self._partial_line = ''
+
+        return self.table
+
+    def _parse_line(self, line: str) -> None:
+        """Parse a single line of output and append it to the table"""
+
+        # The first line of output is a header
+        if not self._header_seen:
+            self._header_seen = True
+            self._resources = '%CPU' in line
+            return
+
+        num_fields = 8 if self._resources else 4
+        fields = line.split(None, num_fields)
+        if len(fields) < num_fields:
+            return
+
+        pid, ppid, pgid, uid = int(fields[0]), int(fields[1]), int(fields[2]), int(fields[3])
+        cmd = fields[num_fields].rstrip() if len(fields) > num_fields else ''
+        if self.keep_cmd is not None and not self.keep_cmd(pid, ppid, pgid, uid, cmd):
+            cmd = ''
+
+        table = self.table
+        table.pid.append(pid)
+        table.ppid.append(ppid)
+        table.pgid.append(pgid)
+        table.uid.append(uid)
+        table.cmd.append(cmd)
+        if self._resources:
+            table.pcpu.append(float(fields[4]))
+            table.rss.append(int(fields[5]))
+            table.etime.append(int(fields[6]))
+            table.state.append(fields[7])
+
+        else:
+            table.pcpu.append(0.0)
+            table.rss.append(0)
+            table.etime.append(0)
+            table.state.append('')
@@ -0,0 +1,157 @@
+"""Parent/child index over the processes running on a single node."""
+
+import re
+from collections import defaultdict
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Set
+
+from .process_table import ProcessTable
+
+# Commands of processes that adopt orphaned descendants in place of init (see `PR_SET_CHILD_SUBREAPER`)
+SUBREAPER_COMMANDS = ('systemd --user',)
+
+
+class ProcessTree:
+    """Index of the parent/child relationships between processes
+
+    The index is built once per node scan in linear time. Orphan detection
+    and subtree selection are answered from the index without rescanning the
+    process data.
+
+    A process is considered orphaned if it was reparented to the init process
+    or to a subreaper (e.g., `systemd --user`). Descendants of orphaned
+    processes are also considered orphaned, even if they belong to a
+    different process group.
+
+    Every daemon started by init (e.g., `sshd` or `slurmstepd`) is a child of
+    init, so orphan queries accept a set of candidate processes. Subtrees are
+    then only started from and walked through candidates, and never descend
+    below processes given as leaves (e.g., root owned processes). This keeps
+    the sessions and jobs running under system daemons out of the result.
+    """
+
+    def __init__(
+        self,
+        pid: Iterable[int],
+        ppid: Iterable[int],
+        cmd: Optional[Iterable[str]] = None,
+        init_pid: int = 1,
+        subreaper_commands: Sequence[str] = SUBREAPER_COMMANDS
+    ) -> None:
+        """Build a new index from process data
+
+        Args:
+            pid: Process IDs
+            ppid: Parent process IDs
+            cmd: Optional process commands used to identify subreapers
+            init_pid: Process ID of the init process
+            subreaper_commands: Substrings identifying the commands of subreaper processes
+        """
+
+        self.init_pid = init_pid
+        self.parent: Dict[int, int] = dict(zip(pid, ppid))
+        self.children: Dict[int, List[int]] = defaultdict(list)
+        for child, parent in self.parent.items():
+            self.children[parent].append(child)
+
+        self.subreapers: Set[int] = set()
+        if cmd is not None and subreaper_commands:
+            # A single precompiled alternation is much faster than testing each substring in turn
+            is_subreaper = re.compile('|'.join(map(re.escape, subreaper_commands))).search
+            self.subreapers = {process for process, command in zip(self.parent, cmd) if is_subreaper(command)}
+
+    @classmethod
+    def from_table(cls, table: ProcessTable, init_pid: int = 1) -> 'ProcessTree':
+        """Build a new index from a process table
+
+        Args:
+            table: Process data for a single node
+            init_pid: Process ID of the init process
+
+        Returns:
+            A new index instance
+        """
+
+        return cls(table.pid, table.ppid, table.cmd, init_pid=init_pid)
+
+    def ancestors(self, pid: int) -> List[int]:
+        """Return the ancestors of a process ordered from parent to root
+
+        Args:
+            pid: The process ID
+
+        Returns:
+            A list of process IDs
+        """
+
+        ancestors = []
+        seen = {pid}
+        parent = self.parent.get(pid)
+        while parent is not None and parent not in seen:
+            ancestors.append(parent)
+            seen.add(parent)
+            parent = self.parent.get(parent)
+
+        return ancestors
+
+    def subtree(
+        self,
+        roots: Iterable[int],
+        candidates: Optional[Collection[int]] = None,
+        leaves: Collection[int] = ()
+    ) -> Set[int]:
+        """Return the given processes and all of their descendants
+
+        Args:
+            roots: Process IDs at the top of each subtree
+            candidates: Optionally stop descending at processes not in the given collection
+            leaves: Include but do not descend below the given processes
+
+        Returns:
+            A set of process IDs
+        """
+
+        selected = set()
+        stack = list(roots)
+        while stack:
+            pid = stack.pop()
+            if pid not in selected:
+                selected.add(pid)
+                if pid in leaves:
+                    continue
+
+                stack.extend(
+                    child for child in self.children.get(pid, ()) if candidates is None or child in candidates)
+
+        return selected
+
+    def orphan_roots(self, candidates: Optional[Collection[int]] = None) -> List[int]:
+        """Return processes parented directly by the init process or a subreaper
+
+        Args:
+            candidates: Optionally only return processes in the given collection
+
+        Returns:
+            A list of process IDs
+        """
+
+        adopters = self.subreapers | {self.init_pid}
+        return [
+            pid for pid, ppid in self.parent.items()
+            if ppid in adopters and pid != self.init_pid and (candidates is None or pid in candidates)
+        ]
+
+    def orphaned(self, candidates: Optional[Collection[int]] = None, leaves: Collection[int] = ()) -> Set[int]:
+        """Return all orphaned processes and their descendants
+
+        Args:
+            candidates: Optionally only start from and descend through processes in the given collection
+            leaves: Include but do not descend below the given processes
+
+        Returns:
+            A set of process IDs
+        """
+
+        if candidates is not None and not isinstance(candidates, (set, frozenset)):
+            candidates = set(candidates)
+
+        return self.subtree(self.orphan_roots(candidates), candidates, set(leaves))
@@ -0,0 +1,150 @@
+"""Per-node sweep results and their machine-readable report formats."""
+
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+# Supported values of the `--report-format` option
+REPORT_FORMATS = ('ndjson', 'csv')
+
+
+class NodeResult:
+    """The outcome of processing a single node
+
+    The `status` is one of:
+      - `clean`: No processes were marked for termination
+      - `terminated`: Marked process groups were sent a termination signal
+      - `marked`: Processes were marked but not terminated (debug mode)
+      - `unchanged`: The scan was skipped because the node had not changed since its last clean scan
+      - `error`: The node could not be processed
+    """
+
+    __slots__ = ('node', 'cluster', 'status', 'pids', 'pgids', 'survivors', 'cpu', 'rss', 'error', 'attempts', 'duration')
+    columns = __slots__
+
+    def __init__(
+        self,
+        node: str,
+        cluster: Optional[str],
+        status: str,
+        pids: Optional[List[int]] = None,
+        pgids: Optional[List[int]] = None,
+        survivors: Optional[List[int]] = None,
+        cpu: float = 0.0,
+        rss: int = 0,
+        error: Optional[str] = None,
+        attempts: int = 1,
+        duration: float = 0.0
+    ) -> None:
+        """Instantiate a new result
+
+        Args:
+            node: The node name
+            cluster: Optional name of the cluster the node belongs to
+            status: The outcome of processing the node
+            pids: IDs of processes marked for termination
+            pgids: IDs of process groups marked for termination
+            survivors: IDs of processes still running after termination
+            cpu: Combined CPU usage of the marked processes in percent of a core
+            rss: Combined resident memory of the marked processes in KiB
+            error: Error message if the node could not be processed
+            attempts: Number of attempts made to process the node
+            duration: Seconds spent on the node, including time spent queued
+        """
+
+        self.node = node
+        self.cluster = cluster
+        self.status = status
+        self.pids = pids or []
+        self.pgids = pgids or []
+        self.survivors = survivors or []
+        self.cpu = cpu
+        self.rss = rss
+        self.error = error
+        self.attempts = attempts
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(node={self.node!r}, status={self.status!r})'
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON serializable dictionary"""
+
+        return {column: getattr(self, column) for column in self.columns}
+
+
+class ResultWriter:
+    """Writes node results to a text stream as NDJSON or CSV
+
+    Each result is written and flushed as soon as it is received so
+    downstream tools can act on results while a sweep is running.
+    """
+
+    def __init__(self, stream: TextIO, fmt: str = 'ndjson', header: bool = True) -> None:
+        """Instantiate a new writer
+
+        Args:
+            stream: The text stream to write to
+            fmt: The report format (one of `REPORT_FORMATS`)
+            header: Whether to write a header row (CSV only)
+        """
+
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f'Unknown report format: {fmt}')
+
+        self.stream = stream
+        self.fmt = fmt
+        self._csv_writer = None
+        if fmt == 'csv':
+            self._csv_writer = csv.writer(stream)
+            if header:
+                self._csv_writer.writerow(NodeResult.columns)
+
+    def write(self, result: NodeResult) -> None:
+        """Write a single result
+
+        Args:
+            result: The result to write
+        """
+
+        if self._csv_writer is None:
+            self.stream.write(json.dumps(result.as_dict()) + '\n')
+
+        else:
+            row = result.as_dict()
+            row['pids'] = ' '.join(map(str, result.pids))
+            row['pgids'] = ' '.join(map(str, result.pgids))
+            row['survivors'] = ' '.join(map(str, result.survivors))
+            self._csv_writer.writerow(row[column] for column in NodeResult.columns)
+
+        self.stream.flush()
+
+
+@contextmanager
+def open_report(path: Optional[Path], fmt: str = 'ndjson') -> Iterator[Optional[ResultWriter]]:
+    """Open a result writer for the given path
+
+    Results are appended to existing files. A CSV header is only written to
+    new or empty files.
+
+    Args:
+        path: Path of the report file, `-` for stdout, or `None` to disable the report
+        fmt: The report format (one of `REPORT_FORMATS`)
+
+    Yields:
+        A result writer or `None` if no path is given
+    """
+
+    if path is None:
+        yield None
+
+    elif str(path) == '-':
+        # Console logging is redirected to stderr by `Application.execute` in this case
+        yield ResultWriter(sys.stdout, fmt)
+
+    else:
+        with open(path, 'a', newline='') as stream:
+            yield ResultWriter(stream, fmt, header=stream.tell() == 0)
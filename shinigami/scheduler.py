@@ -0,0 +1,537 @@
+"""Scheduling of concurrent per-node jobs under a shared connection budget."""
+
+import asyncio
+import logging
+import random
+import re
+import statistics
+import time
+from collections import defaultdict, deque
+from itertools import chain
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Deque, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+
+class SchedulerStats:
+    """Queueing statistics collected by a `Scheduler` instance"""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics"""
+
+        self.submitted = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+        self.max_running = 0
+        self.retries = 0
+        self.deadline_exceeded = 0
+        self.wait_times: List[float] = []
+
+    def merge(self, other: 'SchedulerStats') -> None:
+        """Add the statistics of another scheduler (e.g., one running in a worker process)
+
+        Args:
+            other: The statistics to add
+        """
+
+        self.submitted += other.submitted
+        self.completed += other.completed
+        self.max_queue_depth = max(self.max_queue_depth, other.max_queue_depth)
+        self.max_running += other.max_running
+        self.retries += other.retries
+        self.deadline_exceeded += other.deadline_exceeded
+        self.wait_times.extend(other.wait_times)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return a summary of the collected statistics
+
+        Returns:
+            A dictionary of job counts, queue depth, and wait time summaries (in seconds)
+        """
+
+        waits = sorted(self.wait_times) or [0.0]
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'max_queue_depth': self.max_queue_depth,
+            'max_running': self.max_running,
+            'retries': self.retries,
+            'deadline_exceeded': self.deadline_exceeded,
+            'wait_mean': statistics.fmean(waits),
+            'wait_p50': waits[int(0.50 * (len(waits) - 1))],
+            'wait_p95': waits[int(0.95 * (len(waits) - 1))],
+            'wait_max': waits[-1],
+        }
+
+
+class AdaptiveLimiter:
+    """Additive-increase/multiplicative-decrease (AIMD) concurrency limit
+
+    The limit starts at `min_limit` and grows by one for every successful
+    job (doubling each round of jobs) until the first congestion signal.
+    Afterwards, it grows by one per round of jobs. Congestion signals
+    (connection timeouts, refused or dropped connections, or a connect
+    latency exceeding both `latency_floor` seconds and `latency_tolerance`
+    times the fastest observed latency) multiply the limit by
+    `backoff_factor`. The limit is decreased
+    at most once per `cooldown` seconds so a burst of failures from the same
+    round of jobs only counts once.
+    """
+
+    # Errors indicating the remote hosts or shared services are overloaded
+    congestion_errors: Tuple[Type[BaseException], ...] = (TimeoutError, asyncio.TimeoutError, ConnectionRefusedError, ConnectionResetError)
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float = 3,
+        latency_floor: float = 1,
+        backoff_factor: float = 0.5,
+        cooldown: float = 1,
+        congestion_errors: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> None:
+        """Instantiate a new limiter
+
+        Args:
+            min_limit: Lower bound of the concurrency limit
+            max_limit: Upper bound of the concurrency limit
+            latency_tolerance: Ratio to the fastest observed latency above which latency is treated as congestion
+            latency_floor: Latency in seconds below which latency is never treated as congestion
+            backoff_factor: Factor applied to the limit on congestion
+            cooldown: Minimum seconds between consecutive decreases
+            congestion_errors: Optionally override the exception types treated as congestion
+        """
+
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError('Concurrency bounds must satisfy 1 <= min_limit <= max_limit')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        if congestion_errors is not None:
+            self.congestion_errors = congestion_errors
+
+        self._limit = float(min_limit)
+        self._slow_start = True
+        self._min_latency: Optional[float] = None
+        self._last_decrease = float('-inf')
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit"""
+
+        return int(self._limit)
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        """Update the limit after a successful job
+
+        Args:
+            latency: Optional connect latency of the job in seconds
+        """
+
+        if latency is not None:
+            self._min_latency = latency if self._min_latency is None else min(self._min_latency, latency)
+            if latency > max(self._min_latency * self.latency_tolerance, self.latency_floor):
+                self._decrease(f'connect latency {latency:.3f}s')
+                return
+
+        self._limit += 1 if self._slow_start else 1 / self._limit
+        self._limit = min(self._limit, self.max_limit)
+
+    def record_failure(self, caught: BaseException) -> None:
+        """Update the limit after a failed job
+
+        Errors that do not indicate congestion leave the limit unchanged.
+
+        Args:
+            caught: The exception raised by the job
+        """
+
+        if isinstance(caught, self.congestion_errors):
+            self._decrease(f'{type(caught).__name__}: {caught}')
+
+    def _decrease(self, reason: str) -> None:
+        """Multiplicatively decrease the limit unless a decrease happened recently"""
+
+        self._slow_start = False
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+        logging.debug(f'Reduced concurrency limit to {self.limit} after {reason}')
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retrying failed jobs"""
+
+    # Errors indicating a transient network failure
+    retry_on: Tuple[Type[BaseException], ...] = (OSError, asyncio.TimeoutError)
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff_base: float = 1,
+        backoff_max: float = 30,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None
+    ) -> None:
+        """Instantiate a new retry policy
+
+        Args:
+            attempts: Maximum number of attempts per job (including the first)
+            backoff_base: Upper bound of the first retry delay in seconds
+            backoff_max: Maximum upper bound of any retry delay in seconds
+            retry_on: Optionally override the exception types that are retried
+        """
+
+        if attempts < 1:
+            raise ValueError('attempts must be a positive integer')
+
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        if retry_on is not None:
+            self.retry_on = retry_on
+
+    def should_retry(self, caught: BaseException, attempt: int) -> bool:
+        """Return whether a failed attempt should be retried
+
+        Args:
+            caught: The exception raised by the failed attempt
+            attempt: The number of the failed attempt (starting at 1)
+        """
+
+        return attempt < self.attempts and isinstance(caught, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Return a randomized delay before the next attempt
+
+        Args:
+            attempt: The number of the failed attempt (starting at 1)
+
+        Returns:
+            The delay in seconds
+        """
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class _Job:
+    """A single unit of work waiting in the scheduler queue"""
+
+    __slots__ = ('node', 'group', 'func', 'future', 'submitted')
+
+    def __init__(self, node: str, group: Optional[str], func: Callable[[str], Awaitable[Any]], future: asyncio.Future) -> None:
+        self.node = node
+        self.group = group
+        self.func = func
+        self.future = future
+        self.submitted = time.monotonic()
+
+
+class Scheduler:
+    """Bounded worker pool that owns the SSH connection budget
+
+    Jobs are queued and executed by at most `max_concurrent` workers.
+    The same scheduler instance can be shared by multiple callers (e.g., across
+    clusters) so the connection budget applies globally. Connections can
+    optionally be capped per node group (e.g., per rack or switch), where the
+    group of each node is determined by matching `group_pattern` against the
+    node name.
+
+    Jobs can be submitted to separate named queues (e.g., one per cluster).
+    Workers serve the queues round-robin so a large queue cannot starve a
+    smaller one.
+
+    If an `AdaptiveLimiter` is given, the number of running jobs is capped by
+    the limiter's current limit instead of `max_concurrent`. Callers are
+    responsible for reporting job outcomes to the limiter.
+
+    Failed jobs are resubmitted according to an optional `RetryPolicy`.
+    Workers are released while waiting to retry. Once the optional deadline
+    passes, queued jobs fail without running, running jobs are cancelled,
+    and no further retries are scheduled.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        group_limit: Optional[int] = None,
+        group_pattern: Optional[str] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        deadline: Optional[float] = None
+    ) -> None:
+        """Instantiate a new scheduler
+
+        Args:
+            max_concurrent: Maximum number of jobs to run concurrently
+            group_limit: Maximum number of concurrent jobs per node group
+            group_pattern: Regex used to derive a node's group from its name
+            limiter: Optionally adapt the concurrency limit to observed latency and errors
+            retry: Optionally retry failed jobs
+            deadline: Optional number of seconds after which unfinished jobs fail
+        """
+
+        if max_concurrent < 1:
+            raise ValueError('max_concurrent must be a positive integer')
+
+        if group_limit is not None and group_limit < 1:
+            raise ValueError('group_limit must be a positive integer')
+
+        self.max_concurrent = max_concurrent
+        self.group_limit = group_limit
+        self.group_pattern = re.compile(group_pattern) if group_pattern else None
+        self.limiter = limiter
+        self.retry = retry
+        self.deadline = time.monotonic() + deadline if deadline is not None else None
+        self.stats = SchedulerStats()
+
+        self._pending: Dict[Optional[str], Deque[_Job]] = dict()
+        self._active: Dict[Optional[str], int] = defaultdict(int)
+        self._workers: Set[asyncio.Task] = set()
+        self._condition = asyncio.Condition()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """The maximum number of jobs allowed to run at the current time"""
+
+        if self.limiter is None:
+            return self.max_concurrent
+
+        return min(self.limiter.limit, self.max_concurrent)
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of jobs waiting for a free worker"""
+
+        return sum(map(len, self._pending.values()))
+
+    def group_of(self, node: str) -> Optional[str]:
+        """Return the group name for a given node
+
+        If the group pattern defines a capture group, the first captured value
+        is used as the group name. Otherwise, the full match is used.
+
+        Args:
+            node: The node name
+
+        Returns:
+            The group name or `None` if the node does not belong to a group
+        """
+
+        if self.group_pattern is None:
+            return None
+
+        match = self.group_pattern.search(node)
+        if match is None:
+            return None
+
+        return match.group(1) if self.group_pattern.groups else match.group(0)
+
+    async def submit(self, node: str, func: Callable[[str], Awaitable[Any]], queue: Optional[str] = None) -> Any:
+        """Queue a job and wait for its result, retrying failures according to the retry policy
+
+        Args:
+            node: The node to run the job against
+            func: Coroutine function called with the node name once a worker is free
+            queue: Name of the queue to submit the job to
+
+        Returns:
+            The return value of `func`
+        """
+
+        attempt = 1
+        while True:
+            try:
+                return await self._submit_once(node, func, queue)
+
+            except Exception as caught:
+                if self.retry is None or not self.retry.should_retry(caught, attempt):
+                    raise
+
+                delay = self.retry.delay(attempt)
+                if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+                    raise
+
+                logging.debug(f'[{node}] Retrying in {delay:.2f}s after attempt {attempt} failed: {caught}')
+                self.stats.retries += 1
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _submit_once(self, node: str, func: Callable[[str], Awaitable[Any]], queue: Optional[str] = None) -> Any:
+        """Queue a single attempt of a job and wait for its result"""
+
+        job = _Job(node, self.group_of(node), func, asyncio.get_running_loop().create_future())
+        self._pending.setdefault(queue, deque()).append(job)
+        self.stats.submitted += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue_depth)
+
+        self._spawn_workers()
+        async with self._condition:
+            self._condition.notify_all()
+
+        return await job.future
+
+    async def map(self, nodes: Collection[str], func: Callable[[str], Awaitable[Any]], queue: Optional[str] = None) -> Dict[str, Any]:
+        """Run a job for each node and collect the results
+
+        Exceptions raised by a job are returned in place of its result.
+
+        Args:
+            nodes: The nodes to run jobs against
+            func: Coroutine function called with each node name
+            queue: Name of the queue to submit jobs to
+
+        Returns:
+            A dictionary mapping each node to its result or exception
+        """
+
+        nodes = list(nodes)
+        results = await asyncio.gather(*(self.submit(node, func, queue) for node in nodes), return_exceptions=True)
+        return dict(zip(nodes, results))
+
+    async def as_completed(
+        self,
+        nodes: Collection[str],
+        func: Callable[[str], Awaitable[Any]],
+        queue: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Run a job for each node and yield results in order of completion
+
+        Exceptions raised by a job are yielded in place of its result.
+
+        Args:
+            nodes: The nodes to run jobs against
+            func: Coroutine function called with each node name
+            queue: Name of the queue to submit jobs to
+
+        Yields:
+            Tuples with a node name and its result or exception
+        """
+
+        async def run(node: str) -> Tuple[str, Any]:
+            try:
+                return node, await self.submit(node, func, queue)
+
+            except Exception as caught:
+                return node, caught
+
+        tasks = [asyncio.ensure_future(run(node)) for node in nodes]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def log_stats(self) -> None:
+        """Log a summary of the scheduler statistics"""
+
+        summary = ', '.join(
+            f'{key}={value:.3f}' if isinstance(value, float) else f'{key}={value}'
+            for key, value in self.stats.as_dict().items())
+
+        logging.info(f'Scheduler statistics: {summary}')
+
+    def _spawn_workers(self) -> None:
+        """Start new workers until the worker limit or the queue size is reached"""
+
+        while len(self._workers) < min(self.max_concurrent, self.queue_depth + self._running()):
+            task = asyncio.create_task(self._worker())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    def _running(self) -> int:
+        """Return the number of jobs currently being executed"""
+
+        return sum(self._active.values())
+
+    def _is_eligible(self, job: _Job) -> bool:
+        """Return whether a job can start without exceeding its group limit"""
+
+        return job.group is None or self.group_limit is None or self._active[job.group] < self.group_limit
+
+    def _queued_jobs(self) -> Iterator[_Job]:
+        """Iterate over all queued jobs"""
+
+        return chain.from_iterable(self._pending.values())
+
+    def _pop_eligible(self) -> Optional[_Job]:
+        """Remove and return the next queued job that is eligible to start
+
+        Queues are visited in round-robin order. The queue a job is taken from
+        is moved to the back of the rotation.
+        """
+
+        for name, queue in self._pending.items():
+            for index, job in enumerate(queue):
+                if self._is_eligible(job):
+                    del queue[index]
+                    del self._pending[name]
+                    if queue:
+                        self._pending[name] = queue
+
+                    return job
+
+        return None
+
+    async def _run_before_deadline(self, job: _Job) -> Any:
+        """Run a job, cancelling it if the deadline passes first"""
+
+        if self.deadline is None:
+            return await job.func(job.node)
+
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            self.stats.deadline_exceeded += 1
+            raise RuntimeError('Sweep deadline exceeded before the job started')
+
+        try:
+            return await asyncio.wait_for(job.func(job.node), remaining)
+
+        except asyncio.TimeoutError:
+            if time.monotonic() < self.deadline:
+                raise
+
+            self.stats.deadline_exceeded += 1
+            raise RuntimeError('Sweep deadline exceeded while the job was running')
+
+    async def _worker(self) -> None:
+        """Execute queued jobs until the queue is empty"""
+
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: not self.queue_depth or (
+                    self._running() < self.concurrency_limit and any(map(self._is_eligible, self._queued_jobs()))))
+
+                job = self._pop_eligible()
+                if job is None:
+                    return
+
+                self._active[job.group] += 1
+                self.stats.max_running = max(self.stats.max_running, self._running())
+
+            self.stats.wait_times.append(time.monotonic() - job.submitted)
+            logging.debug(f'[{job.node}] Acquired worker after {self.stats.wait_times[-1]:.3f}s, queue depth {self.queue_depth}')
+
+            try:
+                result = await self._run_before_deadline(job)
+
+            except Exception as caught:
+                if not job.future.done():
+                    job.future.set_exception(caught)
+
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+
+            finally:
+                self.stats.completed += 1
+                async with self._condition:
+                    self._active[job.group] -= 1
+                    self._condition.notify_all()
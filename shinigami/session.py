@@ -0,0 +1,141 @@
+"""Interactive shell sessions for running multiple commands over one SSH channel."""
+
+import uuid
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+
+
+class CommandResult:
+    """Output and exit status of a command executed in a `RemoteShell`"""
+
+    __slots__ = ('command', 'stdout', 'stderr', 'exit_status')
+
+    def __init__(self, command: str, stdout: str, stderr: str, exit_status: int) -> None:
+        self.command = command
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_status = exit_status
+
+    def check(self) -> 'CommandResult':
+        """Raise an error if the command exited with a nonzero status
+
+        Returns:
+            The unmodified result instance
+        """
+
+        if self.exit_status != 0:
+            raise RuntimeError(f'Command {self.command!r} exited with status {self.exit_status}: {self.stderr.strip()}')
+
+        return self
+
+
+class RemoteShell:
+    """A single remote shell used to run a sequence of commands
+
+    Running commands through one long-lived shell avoids opening a new SSH
+    channel and remote shell for every command. Multiple commands can also be
+    written to the shell before any output is read, so independent commands
+    cost a single round trip.
+
+    The `run` method is call compatible with `asyncssh.SSHClientConnection.run`
+    for the arguments used by this package.
+    """
+
+    def __init__(self, process: 'asyncssh.SSHClientProcess') -> None:
+        """Wrap an existing remote shell process
+
+        Args:
+            process: A remote `sh` process with open stdin, stdout, and stderr
+        """
+
+        self._process = process
+
+    @classmethod
+    async def open(cls, conn: 'asyncssh.SSHClientConnection') -> 'RemoteShell':
+        """Start a new remote shell
+
+        Args:
+            conn: Open SSH connection to the machine
+
+        Returns:
+            A new shell instance
+        """
+
+        return cls(await conn.create_process('sh'))
+
+    async def __aenter__(self) -> 'RemoteShell':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Exit the remote shell"""
+
+        self._process.stdin.write_eof()
+        self._process.close()
+        await self._process.wait_closed()
+
+    async def run(self, command: str, input: Optional[str] = None, check: bool = False) -> CommandResult:
+        """Run a single command in the remote shell
+
+        Args:
+            command: The shell command to run
+            input: Optional data passed to the command's stdin
+            check: Raise an error if the command exits with a nonzero status
+
+        Returns:
+            The command output and exit status
+        """
+
+        result, = await self.run_pipelined([command], [input])
+        return result.check() if check else result
+
+    async def run_pipelined(self, commands: Sequence[str], inputs: Optional[Sequence[Optional[str]]] = None) -> List[CommandResult]:
+        """Run multiple commands in a single round trip
+
+        All commands are written to the shell before any output is read.
+        Commands run sequentially on the remote machine regardless of the exit
+        status of earlier commands.
+
+        Args:
+            commands: The shell commands to run
+            inputs: Optional data passed to the stdin of each command
+
+        Returns:
+            The output and exit status of each command
+        """
+
+        inputs = inputs or [None] * len(commands)
+        markers = [uuid.uuid4().hex for _ in commands]
+        script = ''.join(self._wrap(command, input, marker) for command, input, marker in zip(commands, inputs, markers))
+        self._process.stdin.write(script)
+
+        results = []
+        for command, marker in zip(commands, markers):
+            stdout = await self._process.stdout.readuntil(f'\n{marker} ')
+            exit_status = int(await self._process.stdout.readline())
+            stderr = await self._process.stderr.readuntil(f'\n{marker}\n')
+            results.append(CommandResult(
+                command=command,
+                stdout=stdout[:-len(marker) - 2],
+                stderr=stderr[:-len(marker) - 2],
+                exit_status=exit_status))
+
+        return results
+
+    @staticmethod
+    def _wrap(command: str, input: Optional[str], marker: str) -> str:
+        """Return shell code that runs a command and prints end-of-output markers"""
+
+        # Commands are grouped so they never read from the shell's own stdin
+        # Input is passed using a quoted heredoc so it is not subject to shell expansion
+        if input is not None:
+            command = f"{{ {command}\n}} <<'{marker}'\n{input.rstrip()}\n{marker}"
+
+        else:
+            command = f'{{ {command}\n}} </dev/null'
+
+        return f'{command}\nprintf \'\\n%s %d\\n\' {marker} "$?"; printf \'\\n%s\\n\' {marker} >&2\n'
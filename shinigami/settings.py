@@ -0,0 +1,163 @@
+"""Typed settings files defining the process filter rules of each cluster.
+
+Settings are read from a JSON file. Values missing from the file can be
+provided by environment variables prefixed with `SHINIGAMI_` (nested values
+are separated by `__`, e.g., `SHINIGAMI_DEFAULTS__ALLOW_COMMANDS`). An example
+settings file:
+
+    {
+      "defaults": {"uid_whitelist": [[1000, 100000]], "allow_commands": ["^tmux"]},
+      "clusters": {
+        "gpu": {"uid_exclude": [1234], "min_cpu": 50, "min_rss": 4096}
+      }
+    }
+
+Cluster rules override the corresponding default rules.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Union
+
+from pydantic import BaseModel, NonNegativeFloat, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .intervals import IntervalSet, IntervalSpec
+from .policy import PolicySet, ProcessPolicy
+
+
+class FilterRules(BaseModel):
+    """Filter rules applied to the processes of a node
+
+    Attributes:
+        uid_whitelist: Only terminate processes owned by the given UIDs (defaults to the `-u` command line option)
+        uid_exclude: Never terminate processes owned by the given UIDs (in addition to the `-x` command line option)
+        allow_commands: Never terminate processes with a command matching any of the given regular expressions
+        deny_commands: Only terminate processes with a command matching any of the given regular expressions
+        min_age: Only terminate processes running for at least the given number of seconds
+        min_cpu: Only terminate processes using at least the given percentage of a core (or `min_rss` memory)
+        min_rss: Only terminate processes using at least the given MiB of memory (or `min_cpu` CPU)
+
+    Resource thresholds default to the corresponding command line options.
+    """
+
+    uid_whitelist: Optional[List[IntervalSpec]] = None
+    uid_exclude: List[IntervalSpec] = []
+    allow_commands: List[str] = []
+    deny_commands: List[str] = []
+    min_age: Optional[NonNegativeFloat] = None
+    min_cpu: Optional[NonNegativeFloat] = None
+    min_rss: Optional[NonNegativeFloat] = None
+
+    @field_validator('allow_commands', 'deny_commands')
+    @classmethod
+    def _validate_patterns(cls, patterns: List[str]) -> List[str]:
+        """Ensure each command pattern is a valid regular expression"""
+
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+
+            except re.error as caught:
+                raise ValueError(f'Invalid command pattern {pattern!r}: {caught}') from caught
+
+        return patterns
+
+    def merge(self, overrides: 'FilterRules') -> 'FilterRules':
+        """Return a copy of the rules updated with the explicitly set values of another instance
+
+        Args:
+            overrides: Rules taking precedence over the current rules
+
+        Returns:
+            A new rules instance
+        """
+
+        return self.model_copy(update={field: getattr(overrides, field) for field in overrides.model_fields_set})
+
+    def compile(
+        self,
+        uid_whitelist: Union[IntervalSet, List[IntervalSpec]],
+        min_age: float = 0,
+        min_cpu: Optional[float] = None,
+        min_rss: Optional[float] = None,
+        uid_exclude: Collection[IntervalSpec] = ()
+    ) -> ProcessPolicy:
+        """Compile the rules into a process policy
+
+        Args:
+            uid_whitelist: UID whitelist used if the rules do not define their own
+            min_age: Minimum process age used if the rules do not define their own
+            min_cpu: CPU threshold used if the rules do not define their own
+            min_rss: Memory threshold used if the rules do not define their own
+            uid_exclude: UIDs removed from the whitelist in addition to the excluded UIDs of the rules
+
+        Returns:
+            A new policy instance
+        """
+
+        if self.uid_whitelist is not None:
+            uid_whitelist = IntervalSet(self.uid_whitelist)
+
+        exclude = [*self.uid_exclude, *uid_exclude]
+        uid_whitelist = IntervalSet(IntervalSet.coerce(uid_whitelist).to_list(), exclude=exclude)
+        return ProcessPolicy(
+            uid_whitelist,
+            self.allow_commands,
+            self.deny_commands,
+            min_age=self.min_age if self.min_age is not None else min_age,
+            min_cpu=self.min_cpu if self.min_cpu is not None else min_cpu,
+            min_rss=self.min_rss if self.min_rss is not None else min_rss)
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from a settings file and the environment
+
+    Attributes:
+        defaults: Filter rules applied to every node
+        clusters: Mapping of cluster names to rules overriding the defaults
+    """
+
+    model_config = SettingsConfigDict(env_prefix='SHINIGAMI_', env_nested_delimiter='__', extra='forbid')
+
+    defaults: FilterRules = FilterRules()
+    clusters: Dict[str, FilterRules] = dict()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Settings':
+        """Load settings from a JSON file
+
+        Args:
+            path: Path of the settings file
+
+        Returns:
+            A new settings instance
+        """
+
+        with open(path) as settings_file:
+            return cls(**json.load(settings_file))
+
+    def compile(
+        self,
+        uid_whitelist: Union[IntervalSet, List[IntervalSpec]],
+        uid_exclude: Collection[IntervalSpec] = (),
+        **thresholds: Optional[float]
+    ) -> PolicySet:
+        """Compile the filter rules of every cluster
+
+        Args:
+            uid_whitelist: UID whitelist used by rules that do not define their own
+            uid_exclude: UIDs removed from every whitelist (e.g., the `-x` command line option)
+            **thresholds: Resource thresholds used by rules that do not define their own (see `FilterRules.compile`)
+
+        Returns:
+            A policy set with one policy per configured cluster
+        """
+
+        clusters = {
+            name: self.defaults.merge(rules).compile(uid_whitelist, uid_exclude=uid_exclude, **thresholds)
+            for name, rules in self.clusters.items()
+        }
+
+        return PolicySet(self.defaults.compile(uid_whitelist, uid_exclude=uid_exclude, **thresholds), clusters)
@@ -0,0 +1,197 @@
+"""Persistent per-node scan state used to skip unchanged nodes between sweeps."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Set
+
+# Prints the boot ID, the ancestors of the probe shell (prefixed with `probe`), and the ID and start time of every
+# process parented by init or a subreaper. The bracket keeps `pgrep` from matching the probe's own command line.
+FINGERPRINT_COMMAND = (
+    'cat /proc/sys/kernel/random/boot_id; '
+    'p=$$; while [ "$p" -gt 1 ]; do echo "probe $p"; p=$(( $(ps -o ppid= -p "$p") + 0 )); done; '
+    "ps -o pid=,lstart= --ppid \"1$(pgrep -d, -f '[s]ystemd --user' | sed 's/^./,&/')\""
+)
+
+
+def parse_fingerprint(output: str) -> str:
+    """Return a node fingerprint from the output of `FINGERPRINT_COMMAND`
+
+    The fingerprint combines the boot ID with a digest of the ID and start
+    time of every process parented by init or a subreaper. Newly orphaned
+    processes are reparented to one of these, and jobs starting or ending
+    add or remove a `slurmstepd` daemon, so either changes the fingerprint.
+    Processes started by the probe itself (including its SSH session when
+    sshd is socket activated) are excluded, so probing an idle node
+    repeatedly returns the same fingerprint.
+
+    Args:
+        output: The command output
+
+    Returns:
+        The fingerprint string
+    """
+
+    boot_id, *lines = output.strip().splitlines()
+    probe = {line.split()[1] for line in lines if line.startswith('probe ')}
+    processes = sorted(
+        ' '.join(line.split()) for line in lines
+        if line.strip() and not line.startswith('probe ') and line.split()[0] not in probe)
+
+    digest = hashlib.sha1('\n'.join(processes).encode()).hexdigest()
+    return f'{boot_id.strip()}:{digest}'
+
+
+class NodeStateStore:
+    """Fingerprints and scan history for each node, persisted as JSON
+
+    Nodes whose last scan found nothing to terminate are considered clean.
+    Clean nodes are revisited with exponential backoff, and a revisited node
+    whose fingerprint has not changed since its last clean scan does not
+    need a full process scan. The resources held by the processes marked on
+    each visit are used to rank nodes so the worst offenders are visited
+    first.
+    """
+
+    def __init__(self, path: Optional[Path] = None, backoff_base: float = 300, backoff_max: float = 3600) -> None:
+        """Instantiate a new store and load any state saved at the given path
+
+        Args:
+            path: Optional path of the JSON file used to persist node state
+            backoff_base: Delay in seconds before revisiting a node after its first clean scan
+            backoff_max: Maximum delay in seconds before revisiting a clean node
+        """
+
+        self.path = path
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.nodes: Dict[str, Dict[str, Any]] = dict()
+
+        if path is not None:
+            try:
+                self.nodes = json.loads(path.read_text())
+
+            except FileNotFoundError:
+                pass
+
+            except (OSError, ValueError) as caught:
+                logging.warning(f'Ignoring unreadable node state file {path}: {caught}')
+
+    def save(self) -> None:
+        """Atomically write the node state to disk"""
+
+        if self.path is None:
+            return
+
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(self.nodes))
+        os.replace(tmp_path, self.path)
+
+    def is_due(self, node: str, now: Optional[float] = None) -> bool:
+        """Return whether a node should be visited in the current sweep
+
+        Args:
+            node: The node name
+            now: Optional current time in seconds since the epoch
+
+        Returns:
+            Whether the node's backoff delay has expired
+        """
+
+        now = now if now is not None else time.time()
+        return self.nodes.get(node, {}).get('next_visit', 0) <= now
+
+    def is_unchanged(self, node: str, fingerprint: str) -> bool:
+        """Return whether a node is clean and its fingerprint matches the last scan
+
+        Args:
+            node: The node name
+            fingerprint: The current node fingerprint
+
+        Returns:
+            Whether a full scan of the node can be skipped
+        """
+
+        record = self.nodes.get(node)
+        return record is not None and record['clean_scans'] > 0 and record['fingerprint'] == fingerprint
+
+    def survivors(self, node: str, fingerprint: str) -> Set[int]:
+        """Return the IDs of processes that survived termination on a node since it last booted
+
+        Args:
+            node: The node name
+            fingerprint: The current node fingerprint
+
+        Returns:
+            A set of process IDs
+        """
+
+        record = self.nodes.get(node)
+        if record is None or _boot_id(record['fingerprint']) != _boot_id(fingerprint):
+            return set()
+
+        return set(record.get('survivors', ()))
+
+    def record(
+        self,
+        node: str,
+        fingerprint: str,
+        clean: bool,
+        now: Optional[float] = None,
+        survivors: Collection[int] = (),
+        cpu: float = 0.0,
+        rss: int = 0
+    ) -> None:
+        """Record the outcome of visiting a node
+
+        Args:
+            node: The node name
+            fingerprint: The node fingerprint observed during the visit
+            clean: Whether the node had no processes to terminate
+            now: Optional current time in seconds since the epoch
+            survivors: IDs of processes on the node that could not be terminated
+            cpu: Total CPU usage of the marked processes in percent of a core
+            rss: Total resident memory of the marked processes in KiB
+        """
+
+        now = now if now is not None else time.time()
+        record = self.nodes.get(node, {})
+        clean_scans = record.get('clean_scans', 0) + 1 if clean else 0
+        delay = min(self.backoff_base * 2 ** (clean_scans - 1), self.backoff_max) if clean_scans else 0
+        self.nodes[node] = {
+            'fingerprint': fingerprint,
+            'clean_scans': clean_scans,
+            'last_visit': now,
+            'next_visit': now + delay,
+            'survivors': sorted(survivors),
+            'cpu': cpu,
+            'rss': rss,
+        }
+
+    def rank(self, nodes: Collection[str]) -> List[str]:
+        """Order nodes by the resources held by the processes marked on their last visit
+
+        Nodes are ordered by CPU usage and then memory usage, largest first.
+        Nodes without recorded usage follow in alphabetical order.
+
+        Args:
+            nodes: The node names to order
+
+        Returns:
+            A list of node names
+        """
+
+        def key(node: str) -> tuple:
+            record = self.nodes.get(node, {})
+            return -record.get('cpu', 0), -record.get('rss', 0), node
+
+        return sorted(nodes, key=key)
+
+
+def _boot_id(fingerprint: str) -> str:
+    """Return the boot ID component of a node fingerprint"""
+
+    return fingerprint.split(':', 1)[0]
@@ -0,0 +1,289 @@
+"""Transports used to run commands on compute nodes.
+
+A transport opens a command runner on a node. Runners expose a `run` method
+that is call compatible with `asyncssh.SSHClientConnection.run` for the
+arguments used by this package, so the scanning and termination logic does
+not depend on how commands reach the node.
+"""
+
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncContextManager, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union, TYPE_CHECKING
+
+from .pool import ConnectionPool
+from .session import CommandResult, RemoteShell
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+
+
+async def probe_tcp(node: str, port: int = 22, timeout: float = 2) -> None:
+    """Check a node accepts TCP connections before starting an SSH handshake
+
+    A failed probe is much cheaper than a failed SSH connection attempt, which
+    can block a worker for the full SSH connect timeout.
+
+    Args:
+        node: The DNS resolvable name of the node
+        port: The TCP port to connect to
+        timeout: Seconds to wait for the connection
+
+    Raises:
+        ConnectionError: If the node does not accept the connection in time
+    """
+
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(node, port), timeout)
+
+    except (OSError, asyncio.TimeoutError) as caught:
+        raise ConnectionError(f'TCP port {port} is unreachable: {caught or type(caught).__name__}') from caught
+
+    writer.close()
+
+
+class Transport:
+    """Base class for opening command runners on nodes
+
+    Subclasses must implement the `connect` method.
+    """
+
+    name: str = None
+
+    async def probe(self, node: str, timeout: float) -> None:
+        """Check a node is reachable before connecting
+
+        The default implementation does nothing.
+
+        Args:
+            node: The name of the node
+            timeout: Seconds to wait for the node to respond
+
+        Raises:
+            ConnectionError: If the node is unreachable
+        """
+
+    def connect(self, node: str) -> AsyncContextManager:
+        """Open a command runner on a node
+
+        Args:
+            node: The name of the node
+
+        Returns:
+            An async context manager yielding the command runner
+        """
+
+        raise NotImplementedError  # pragma: nocover
+
+
+class SSHTransport(Transport):
+    """Runs commands over SSH using `asyncssh`"""
+
+    name = 'ssh'
+
+    def __init__(
+        self,
+        ssh_options: Optional['asyncssh.SSHClientConnectionOptions'] = None,
+        pool: Optional[ConnectionPool] = None,
+        session: bool = False
+    ) -> None:
+        """Instantiate a new transport
+
+        Args:
+            ssh_options: Options for configuring outbound SSH connections
+            pool: Optionally reuse pooled connections instead of opening new ones (`ssh_options` is ignored)
+            session: Run all commands for a node through a single remote shell
+        """
+
+        self.ssh_options = ssh_options
+        self.pool = pool
+        self.session = session
+        self._addresses: Dict[str, Tuple[str, int]] = dict()
+
+    async def resolve_address(self, node: str) -> Tuple[str, int]:
+        """Return the host and port SSH connections to a node are opened on
+
+        The address is resolved the same way as by `connect`, honoring the
+        `HostName` and `Port` settings of the SSH options and the user's SSH
+        config. Resolved addresses are cached for the lifetime of the transport.
+
+        Args:
+            node: The name of the node
+
+        Returns:
+            A tuple with the host name and port
+        """
+
+        if node not in self._addresses:
+            import asyncssh
+
+            # Building the options reads config and key files, so keep it off the event loop
+            ssh_options = self.pool.ssh_options if self.pool is not None else self.ssh_options
+            options = await asyncio.get_running_loop().run_in_executor(
+                None, partial(asyncssh.SSHClientConnectionOptions, ssh_options, host=node))
+
+            self._addresses[node] = (options.host, options.port)
+
+        return self._addresses[node]
+
+    async def probe(self, node: str, timeout: float) -> None:
+        """Check the SSH port of a node is reachable unless a pooled connection is already open
+
+        The probed host and port are taken from the resolved SSH options (see `resolve_address`).
+
+        Args:
+            node: The DNS resolvable name of the node
+            timeout: Seconds to wait for the connection
+
+        Raises:
+            ConnectionError: If the node does not accept the connection in time
+        """
+
+        if not (self.pool is not None and node in self.pool):
+            host, port = await self.resolve_address(node)
+            await probe_tcp(host, port, timeout=timeout)
+
+    @asynccontextmanager
+    async def connect(self, node: str) -> AsyncIterator[Union['asyncssh.SSHClientConnection', RemoteShell]]:
+        """Open an SSH connection (or a remote shell) on a node
+
+        Args:
+            node: The DNS resolvable name of the node
+
+        Yields:
+            The open connection, or a remote shell if `session` is enabled
+        """
+
+        import asyncssh
+
+        connection = self.pool.connection(node) if self.pool is not None else asyncssh.connect(node, options=self.ssh_options)
+        async with connection as conn:
+            if not self.session:
+                yield conn
+                return
+
+            async with await RemoteShell.open(conn) as shell:
+                yield shell
+
+
+class LocalRunner:
+    """Runs commands on the local machine in subprocesses"""
+
+    async def run(self, command: str, input: Optional[str] = None, check: bool = False) -> CommandResult:
+        """Run a shell command
+
+        Args:
+            command: The command to run
+            input: Optional data written to the command's stdin
+            check: Raise an error if the command exits with a nonzero status
+
+        Returns:
+            The command output and exit status
+        """
+
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL if input is None else asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE)
+
+        stdout, stderr = await process.communicate(None if input is None else input.encode())
+        result = CommandResult(command, stdout.decode(errors='replace'), stderr.decode(errors='replace'), process.returncode)
+        return result.check() if check else result
+
+
+class LocalTransport(Transport):
+    """Runs the commands for every node on the local machine
+
+    Node names are ignored. This transport is useful for testing against the
+    local process table or when the command is already running on the node.
+    """
+
+    name = 'local'
+
+    @asynccontextmanager
+    async def connect(self, node: str) -> AsyncIterator[LocalRunner]:
+        """Open a command runner on the local machine
+
+        Args:
+            node: The name of the node (ignored)
+
+        Yields:
+            A runner executing commands in local subprocesses
+        """
+
+        yield LocalRunner()
+
+
+class FakeRunner:
+    """Returns canned command output and records the commands it was asked to run"""
+
+    def __init__(self, responses: Mapping[str, Union[str, CommandResult]], commands: List[str]) -> None:
+        """Instantiate a new runner
+
+        Args:
+            responses: Mapping of commands to their output or complete result
+            commands: List each command is appended to
+        """
+
+        self.responses = responses
+        self.commands = commands
+
+    async def run(self, command: str, input: Optional[str] = None, check: bool = False) -> CommandResult:
+        """Return the canned result of a command
+
+        Commands without a canned response succeed with empty output.
+
+        Args:
+            command: The command to run
+            input: Ignored
+            check: Raise an error if the command result has a nonzero exit status
+
+        Returns:
+            The command output and exit status
+        """
+
+        self.commands.append(command)
+        result = self.responses.get(command, '')
+        if isinstance(result, str):
+            result = CommandResult(command, result, '', 0)
+
+        return result.check() if check else result
+
+
+class FakeTransport(Transport):
+    """An in-memory transport serving canned command output for each node
+
+    Connecting to a node without any configured responses raises a
+    `ConnectionRefusedError`. The commands run on each node are recorded in
+    the `commands` attribute.
+    """
+
+    name = 'fake'
+
+    def __init__(self, responses: Mapping[str, Mapping[str, Union[str, CommandResult]]]) -> None:
+        """Instantiate a new transport
+
+        Args:
+            responses: Mapping of node names to a mapping of commands and their output or complete result
+        """
+
+        self.responses = responses
+        self.commands: Dict[str, List[str]] = defaultdict(list)
+
+    @asynccontextmanager
+    async def connect(self, node: str) -> AsyncIterator[FakeRunner]:
+        """Open a fake command runner on a node
+
+        Args:
+            node: The name of the node
+
+        Yields:
+            A runner serving the canned responses of the node
+        """
+
+        if node not in self.responses:
+            raise ConnectionRefusedError(f'Unknown node {node}')
+
+        yield FakeRunner(self.responses[node], self.commands[node])
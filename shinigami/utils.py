@@ -1,161 +1,592 @@
 """Utilities for fetching system information and terminating processes."""
 
 import asyncio
+import inspect
+import json
 import logging
-from io import StringIO
-from shlex import split
-from subprocess import Popen, PIPE
-from typing import Union, Tuple, Collection, List
-
-import asyncssh
-import pandas as pd
+import os
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from shlex import quote
+from typing import Union, Collection, Dict, Optional, TYPE_CHECKING
+
+from . import collector
+from .intervals import IntervalSet, IntervalSpec
+from .jobs import ActiveJobSource
+from .kill import KillEngine, record_kill
+from .metrics import NodeMetrics
+from .policy import ProcessPolicy
+from .pool import ConnectionPool
+from .process_table import ProcessTable, StreamingPsParser
+from .process_tree import SUBREAPER_COMMANDS, ProcessTree
+from .session import RemoteShell
+from .state import FINGERPRINT_COMMAND, NodeStateStore, parse_fingerprint
+from .transport import FakeRunner, LocalRunner, SSHTransport, Transport
+
+if TYPE_CHECKING:  # pragma: nocover
+    import asyncssh
+    import pandas as pd
+
+# Filter functions accept either a `ProcessTable` or an (optional) pandas DataFrame
+ProcessData = Union[ProcessTable, 'pd.DataFrame']
+
+# Remote commands are run using a new SSH channel per command, a persistent shell, or a non-SSH transport
+CommandRunner = Union['asyncssh.SSHClientConnection', RemoteShell, LocalRunner, FakeRunner]
+
+# UID whitelists are interval sets or collections of individual UIDs and `[min, max)` UID ranges
+UIDWhitelist = Union[IntervalSet, Collection[IntervalSpec]]
 
 # Technically the init process ID may vary with the system
 # architecture, but 1 is an almost universal default
 INIT_PROCESS_ID = 1
 
+# Command used to fetch process data from compute nodes
+PS_COMMAND = 'ps -eo pid:10,ppid:10,pgid:10,uid:10,pcpu:6,rss:12,etimes:12,stat:6,cmd:500'
+
+# Size of the chunks read from the SSH channel when streaming process data
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Node states (as reported by `sinfo`) that are skipped by default
+# Flags appended to a state by Slurm are mapped to the names in `NODE_STATE_FLAGS`
+DEFAULT_SKIP_STATES = ('down', 'drained', 'fail', 'future', 'not_responding', 'powered_down')
+NODE_STATE_FLAGS = {'*': 'not_responding', '~': 'powered_down'}
+
+
+def parse_sinfo_output(output: str, clusters: Collection[str]) -> Dict[str, Dict[str, str]]:
+    """Parse the output of `sinfo -M <clusters> -N -h -o '%N %T'`
+
+    When multiple clusters are queried, Slurm prefixes the nodes of each
+    cluster with a `CLUSTER: <name>` line.
+
+    Args:
+        output: The sinfo output
+        clusters: The cluster names passed to sinfo
+
+    Returns:
+        A dictionary mapping cluster names to a dictionary of node names and states
+    """
+
+    clusters = list(clusters)
+    node_states = {cluster: dict() for cluster in clusters}
+    current_cluster = clusters[0] if len(clusters) == 1 else None
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('CLUSTER:'):
+            current_cluster = line.split(':', 1)[1].strip()
+            node_states.setdefault(current_cluster, dict())
+            continue
+
+        node, _, state = line.partition(' ')
+        node_states[current_cluster].setdefault(node, state.strip().lower())
+
+    return node_states
 
-def get_nodes(cluster: str, ignore_nodes: Collection[str] = tuple()) -> set:
-    """Return a set of nodes included in a given Slurm cluster
+
+def is_skipped_state(state: str, skip_states: Collection[str] = DEFAULT_SKIP_STATES) -> bool:
+    """Return whether a node in the given Slurm state should be skipped
 
     Args:
-        cluster: Name of the cluster to fetch nodes for
-        ignore_nodes: Do not return nodes included in the provided list
+        state: The node state reported by sinfo (e.g. `idle`, `drained`, `down*`)
+        skip_states: Base states and state flags to skip
 
     Returns:
-        A set of cluster names
+        A boolean indicating whether the node should be skipped
     """
 
-    logging.debug(f'Fetching node list for cluster {cluster}')
-    sub_proc = Popen(split(f"sinfo -M {cluster} -N -o %N -h"), stdout=PIPE, stderr=PIPE)
-    stdout, stderr = sub_proc.communicate()
+    base_state = state.rstrip('*~#!%$@^-')
+    flags = {NODE_STATE_FLAGS[char] for char in state[len(base_state):] if char in NODE_STATE_FLAGS}
+    return base_state in skip_states or not flags.isdisjoint(skip_states)
+
+
+def _read_node_cache(cache_path: Path, clusters: Collection[str], ttl: float) -> Optional[Dict[str, Dict[str, str]]]:
+    """Return cached node states if the cache is fresh and covers all clusters"""
+
+    try:
+        cache = json.loads(cache_path.read_text())
+
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - cache.get('timestamp', 0) > ttl or not set(clusters).issubset(cache.get('clusters', {})):
+        return None
+
+    return {cluster: cache['clusters'][cluster] for cluster in clusters}
+
+
+def _write_node_cache(cache_path: Path, node_states: Dict[str, Dict[str, str]]) -> None:
+    """Atomically write node states to the cache file"""
+
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps({'timestamp': time.time(), 'clusters': node_states}))
+    os.replace(tmp_path, cache_path)
+
+
+async def get_node_states(
+    clusters: Collection[str],
+    cache_path: Optional[Path] = None,
+    cache_ttl: float = 300
+) -> Dict[str, Dict[str, str]]:
+    """Return the nodes and node states of one or more Slurm clusters
+
+    All clusters are queried using a single non-blocking `sinfo` call.
+    If a cache path is given, results younger than `cache_ttl` seconds are
+    read from disk instead of querying the Slurm controller.
+
+    Args:
+        clusters: Names of the clusters to fetch nodes for
+        cache_path: Optional path of an on-disk node cache
+        cache_ttl: Maximum age of cached results in seconds
+
+    Returns:
+        A dictionary mapping cluster names to a dictionary of node names and states
+    """
+
+    if cache_path is not None:
+        cached = _read_node_cache(cache_path, clusters, cache_ttl)
+        if cached is not None:
+            logging.debug(f'Using cached node list from {cache_path}')
+            return cached
+
+    logging.debug(f'Fetching node list for clusters {", ".join(clusters)}')
+    sub_proc = await asyncio.create_subprocess_exec(
+        'sinfo', '-M', ','.join(clusters), '-N', '-h', '-o', '%N %T',
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+    stdout, stderr = await sub_proc.communicate()
     if stderr:
         raise RuntimeError(stderr)
 
-    all_nodes = stdout.decode().strip().split('\n')
-    return set(all_nodes) - set(ignore_nodes)
+    node_states = parse_sinfo_output(stdout.decode(), clusters)
+    if cache_path is not None:
+        _write_node_cache(cache_path, node_states)
 
+    return node_states
 
-async def get_remote_processes(conn: asyncssh.SSHClientConnection) -> pd.DataFrame:
+
+async def get_remote_processes(conn: CommandRunner, metrics: Optional[NodeMetrics] = None) -> ProcessTable:
     """Fetch running process data from a remote machine
 
-    The returned DataFrame is guaranteed to have columns `PID`, `PPID`, `PGID`,
-    `UID`, and `CND`.
+    The returned table is guaranteed to have columns `PID`, `PPID`, `PGID`,
+    `UID`, and `CMD`.
+
+    Args:
+        conn: Open SSH connection or remote shell on the machine
+        metrics: Optionally record fetch and parse timings
+
+    Returns:
+        A table of process data
+    """
+
+    metrics = metrics if metrics is not None else NodeMetrics('')
+    with metrics.phase('fetch'):
+        ps_return = await conn.run(PS_COMMAND, check=True)
+
+    with metrics.phase('parse'):
+        metrics.bytes_received += len(ps_return.stdout)
+        return ProcessTable.from_ps_output(ps_return.stdout)
+
+
+def _keeps_command(pid: int, ppid: int, pgid: int, uid: int, cmd: str) -> bool:
+    """Return whether a process command is needed by the filters in `terminate_errant_processes`
+
+    Commands are only needed for slurm processes (used to identify active users),
+    subreapers (used to identify orphaned processes), and processes parented by
+    init (candidates for termination).
+    """
+
+    return ppid == INIT_PROCESS_ID or 'slurmd' in cmd or any(subreaper in cmd for subreaper in SUBREAPER_COMMANDS)
+
+
+async def stream_remote_processes(
+    conn: 'asyncssh.SSHClientConnection',
+    metrics: Optional[NodeMetrics] = None,
+    keep_all_commands: bool = False
+) -> ProcessTable:
+    """Fetch running process data from a remote machine using a streaming parser
+
+    Output is parsed incrementally as it is received. Numeric columns are
+    kept for every process, but unless `keep_all_commands` is set, the `CMD`
+    column is only populated for processes that can affect the default
+    filters applied by `terminate_errant_processes` (orphaned processes and
+    slurm processes). Other rows have an empty command.
 
     Args:
         conn: Open SSH connection to the machine
+        metrics: Optionally record fetch timings and the number of bytes received
+        keep_all_commands: Keep the command of every process (required by policies matching commands)
 
     Returns:
-        A pandas DataFrame with process data
+        A table of process data
     """
 
-    # Add 1 to column widths when parsing ps output to account for space between columns
-    ps_return = await conn.run('ps -eo pid:10,ppid:10,pgid:10,uid:10,cmd:500', check=True)
-    return pd.read_fwf(StringIO(ps_return.stdout), widths=[11, 11, 11, 11, 500])
+    metrics = metrics if metrics is not None else NodeMetrics('')
+    parser = StreamingPsParser(keep_cmd=None if keep_all_commands else _keeps_command)
+    with metrics.phase('fetch'):
+        async with conn.create_process(PS_COMMAND) as process:
+            while True:
+                chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
 
+                metrics.bytes_received += len(chunk)
+                parser.feed(chunk)
 
-def include_orphaned_processes(df: pd.DataFrame) -> pd.DataFrame:
-    """Filter a DataFrame to only include orphaned processes
+            completed = await process.wait()
 
-    Given a DataFrame with system process data, return a subset of the data
-    containing processes parented by `INIT_PROCESS_ID`.
+        if completed.exit_status != 0:
+            raise RuntimeError(f'Command {PS_COMMAND!r} exited with status {completed.exit_status}: {completed.stderr}')
 
-    See the `get_remote_processes` function for the assumed DataFrame data model.
+        return parser.close()
+
+
+async def collect_remote_processes(
+    conn: CommandRunner,
+    uid_whitelist: UIDWhitelist,
+    metrics: Optional[NodeMetrics] = None,
+    active_uids: Optional[Collection[int]] = None
+) -> ProcessTable:
+    """Fetch candidate processes by filtering process data on a remote machine
+
+    The `collector` module is piped to `python3` on the remote machine, where
+    it reads `/proc` directly and applies the same filters as
+    `terminate_errant_processes`. Only candidate processes are returned over
+    the connection.
 
     Args:
-        df: A DataFrame with process data
+        conn: Open SSH connection or remote shell on the machine
+        uid_whitelist: UID values to terminate orphaned processes for
+        metrics: Optionally record fetch and parse timings
+        active_uids: Optional user IDs known to be running jobs (defaults to scanning for `slurmd` on the node)
 
     Returns:
-        A copy of the given DataFrame
+        A table of candidate processes
     """
 
-    return df[df['PPID'] == INIT_PROCESS_ID]
+    metrics = metrics if metrics is not None else NodeMetrics('')
+    options = {'init_pid': INIT_PROCESS_ID, 'uid_whitelist': IntervalSet.coerce(uid_whitelist).to_list()}
+    if active_uids is not None:
+        options['active_uids'] = sorted(active_uids)
+
+    options = json.dumps(options)
+    with metrics.phase('fetch'):
+        collector_return = await conn.run(f'python3 - {quote(options)}', input=inspect.getsource(collector), check=True)
 
+    with metrics.phase('parse'):
+        metrics.bytes_received += len(collector_return.stdout)
+        return ProcessTable.from_ps_output(collector_return.stdout)
 
-def include_user_whitelist(df: pd.DataFrame, uid_whitelist: Collection[Union[int, Tuple[int, int]]]) -> pd.DataFrame:
-    """Filter a DataFrame to only include a subset of user IDs
 
-    Given a DataFrame with system process data, return a subset of the data
-    containing processes owned by the given user IDs.
+def include_orphaned_processes(df: ProcessData, tree: Optional[ProcessTree] = None) -> ProcessData:
+    """Filter process data to only include orphaned processes
 
-    See the `get_remote_processes` function for the assumed DataFrame data model.
+    Given a table or DataFrame with system process data, return a subset of
+    the data containing processes parented by `INIT_PROCESS_ID` or a subreaper,
+    along with all of their descendants.
+
+    See the `get_remote_processes` function for the assumed data model.
 
     Args:
-        df: A DataFrame with process data
-        uid_whitelist: List of user IDs to whitelist
+        df: A table or DataFrame with process data
+        tree: Optional process tree built from the unfiltered process data of the node
 
     Returns:
-        A copy of the given DataFrame
+        A copy of the given data
     """
 
-    whitelisted_uid_values = []
-    for elt in uid_whitelist:
-        if isinstance(elt, int):
-            whitelisted_uid_values.append(elt)
+    if isinstance(df, ProcessTable):
+        tree = tree or ProcessTree.from_table(df, init_pid=INIT_PROCESS_ID)
+        orphaned = tree.orphaned()
+        return df.filter(pid in orphaned for pid in df.pid)
 
-        else:
-            umin, umax = elt
-            whitelisted_uid_values.extend(range(umin, umax))
+    if tree is None:
+        cmd = df['CMD'] if 'CMD' in df.columns else None
+        tree = ProcessTree(df['PID'], df['PPID'], cmd, init_pid=INIT_PROCESS_ID)
 
-    return df[df['UID'].isin(whitelisted_uid_values)]
+    return df[df['PID'].isin(tree.orphaned())]
 
 
-def exclude_active_slurm_users(df: pd.DataFrame) -> pd.DataFrame:
-    """Filter a DataFrame to exclude user IDs tied to a running slurm job
+def include_user_whitelist(df: ProcessData, uid_whitelist: UIDWhitelist) -> ProcessData:
+    """Filter process data to only include a subset of user IDs
 
-    Given a DataFrame with system process data, return a subset of the data
-    that excludes processes owned by users running a `slurmd` command.
+    Given a table or DataFrame with system process data, return a subset of
+    the data containing processes owned by the given user IDs.
 
-    See the `get_remote_processes` function for the assumed DataFrame data model.
+    See the `get_remote_processes` function for the assumed data model.
 
     Args:
-        df: A DataFrame with process data
+        df: A table or DataFrame with process data
+        uid_whitelist: User IDs and `[min, max)` user ID ranges to whitelist
 
     Returns:
-        A copy of the given DataFrame
+        A copy of the given data
     """
 
-    is_slurm = df['CMD'].str.contains('slurmd')
-    slurm_uids = df['UID'][is_slurm].unique()
-    return df[~df['UID'].isin(slurm_uids)]
+    uid_whitelist = IntervalSet.coerce(uid_whitelist)
+    if isinstance(df, ProcessTable):
+        return df.filter(uid in uid_whitelist for uid in df.uid)
+
+    return df[uid_whitelist.isin(df['UID'])]
+
+
+def exclude_active_slurm_users(df: ProcessData, active_uids: Optional[Collection[int]] = None) -> ProcessData:
+    """Filter process data to exclude user IDs tied to a running slurm job
+
+    Given a table or DataFrame with system process data, return a subset of
+    the data that excludes processes owned by users running a Slurm job.
+    Unless the active users are given explicitly (see the `jobs` module),
+    users running a `slurmd` command are assumed to be running a job.
+
+    See the `get_remote_processes` function for the assumed data model.
+
+    Args:
+        df: A table or DataFrame with process data
+        active_uids: Optional user IDs known to be running jobs on the node
+
+    Returns:
+        A copy of the given data
+    """
+
+    if isinstance(df, ProcessTable):
+        if active_uids is None:
+            active_uids = {uid for uid, cmd in zip(df.uid, df.cmd) if 'slurmd' in cmd}
+
+        active_uids = set(active_uids)
+        return df.filter(uid not in active_uids for uid in df.uid)
+
+    if active_uids is None:
+        is_slurm = df['CMD'].str.contains('slurmd')
+        active_uids = df['UID'][is_slurm].unique()
+
+    return df[~df['UID'].isin(list(active_uids))]
+
+
+def filter_processes(
+    table: ProcessTable,
+    uid_whitelist: UIDWhitelist,
+    active_uids: Optional[Collection[int]] = None,
+    metrics: Optional[NodeMetrics] = None,
+    policy: Optional[ProcessPolicy] = None
+) -> ProcessTable:
+    """Filter the full process table of a node down to the processes to terminate
+
+    All filter rules are evaluated in a single pass over the table (see
+    `policy.ProcessPolicy` for the rules and their order). Orphan subtrees
+    are only started from and walked through processes owned by
+    whitelisted users not running a job, and never descend below root owned
+    processes, so the sessions and jobs running under system daemons (e.g.,
+    `sshd` or `slurmstepd`) are never selected.
+
+    Owners of `slurmd` commands (i.e., root) are always treated as active
+    users, even if the active users are given explicitly. Job sources only
+    report the owners of jobs, and system daemons parented by init would
+    otherwise be selected when root is whitelisted.
+
+    Args:
+        table: The full process table of a node
+        uid_whitelist: Only keep processes owned by the given UIDs (ignored if a policy is given)
+        active_uids: Optional user IDs known to be running jobs on the node (defaults to users running `slurmd`)
+        metrics: Optionally record the number of processes remaining after each filter
+        policy: Optional compiled filter rules (defaults to a policy built from `uid_whitelist`)
+
+    Returns:
+        The processes to terminate
+    """
+
+    policy = policy if policy is not None else ProcessPolicy(uid_whitelist)
+    active_uids = {uid for uid, cmd in zip(table.uid, table.cmd) if 'slurmd' in cmd}.union(active_uids or ())
+    candidates = {
+        pid for pid, uid in zip(table.pid, table.uid)
+        if uid in policy.uid_whitelist and uid not in active_uids
+    }
+
+    root_owned = {pid for pid, uid in zip(table.pid, table.uid) if uid == 0}
+    orphaned = ProcessTree.from_table(table, init_pid=INIT_PROCESS_ID).orphaned(candidates, root_owned)
+    return policy.select(table, orphaned, active_uids, metrics)
+
+
+def exclude_known_survivors(df: ProcessData, survivors: Optional[Collection[int]] = None) -> ProcessData:
+    """Filter process data to exclude processes that survived termination in an earlier sweep
+
+    Processes stuck in uninterruptible sleep cannot be killed. Excluding them
+    avoids repeatedly signalling the same processes on every sweep.
+
+    See the `get_remote_processes` function for the assumed data model.
+
+    Args:
+        df: A table or DataFrame with process data
+        survivors: Optional IDs of processes known to survive termination
+
+    Returns:
+        A copy of the given data
+    """
+
+    survivors = set(survivors or ())
+    if isinstance(df, ProcessTable):
+        return df.filter(pid not in survivors for pid in df.pid)
+
+    return df[~df['PID'].isin(list(survivors))]
 
 
 async def terminate_errant_processes(
     node: str,
-    uid_whitelist: Collection[Union[int, List[int]]],
-    ssh_limit: asyncio.Semaphore = asyncio.Semaphore(1),
-    ssh_options: asyncssh.SSHClientConnectionOptions = None,
-    debug: bool = False
-) -> None:
+    uid_whitelist: UIDWhitelist,
+    ssh_options: Optional['asyncssh.SSHClientConnectionOptions'] = None,
+    debug: bool = False,
+    remote_filter: bool = False,
+    pool: Optional[ConnectionPool] = None,
+    session: bool = False,
+    metrics: Optional[NodeMetrics] = None,
+    job_source: Optional[ActiveJobSource] = None,
+    state_store: Optional[NodeStateStore] = None,
+    probe_timeout: Optional[float] = None,
+    kill_engine: Optional[KillEngine] = None,
+    transport: Optional[Transport] = None,
+    policy: Optional[ProcessPolicy] = None
+) -> Optional[ProcessTable]:
     """Terminate orphaned processes on a given node
 
     Args:
         node: The DNS resolvable name of the node to terminate processes on
         uid_whitelist: Do not terminate processes owned by the given UIDs
-        ssh_limit: Semaphore object used to limit concurrent SSH connections
         ssh_options: Options for configuring the outbound SSH connection
         debug: Log which process to terminate but do not terminate them
+        remote_filter: Filter process data on the node instead of fetching the full process table
+        pool: Optionally reuse a pooled connection instead of opening a new one (`ssh_options` is ignored)
+        session: Run all commands through a single remote shell and verify terminated processes
+        metrics: Optionally record per-phase timings and process counts
+        job_source: Source of the users running Slurm jobs on the node (defaults to scanning process commands)
+        state_store: Optionally skip the scan if the node is unchanged since its last clean scan
+        probe_timeout: Optionally check the node is reachable within the given seconds before connecting
+        kill_engine: Terminates marked process groups (defaults to a `KillEngine` with default settings)
+        transport: Runs commands on the node (defaults to an `SSHTransport` built from `ssh_options`, `pool`, and `session`)
+        policy: Optional compiled filter rules (`uid_whitelist` is ignored if given)
+
+    Returns:
+        The processes marked for termination, or `None` if the scan was skipped because the node is unchanged
     """
 
-    logging.debug(f'[{node}] Waiting for SSH pool')
-    async with ssh_limit, asyncssh.connect(node, options=ssh_options) as conn:
-        logging.info(f'[{node}] Scanning for processes')
-        process_df = await get_remote_processes(conn)
+    metrics = metrics if metrics is not None else NodeMetrics(node)
+    job_source = job_source if job_source is not None else ActiveJobSource()
+    kill_engine = kill_engine if kill_engine is not None else KillEngine()
+    transport = transport if transport is not None else SSHTransport(ssh_options, pool, session)
+    if probe_timeout is not None:
+        with metrics.phase('reachability'):
+            await transport.probe(node, probe_timeout)
 
-        # Filter process data by various whitelist/blacklist criteria
-        # Outputs from each filter function call are passed to the next filter
-        # so the order of the function calls matter significantly
-        process_df = exclude_active_slurm_users(process_df)
-        process_df = include_orphaned_processes(process_df)
-        process_df = include_user_whitelist(process_df, uid_whitelist)
+    async with AsyncExitStack() as stack:
+        with metrics.phase('connect'):
+            runner = await stack.enter_async_context(transport.connect(node))
 
-        for _, row in process_df.iterrows():  # pragma: nocover
-            logging.info(f'[{node}] Marking for termination {dict(row)}')
+        return await _terminate_with_runner(
+            runner, node, uid_whitelist, debug, remote_filter, metrics, job_source, state_store, kill_engine, policy)
+
+
+async def _terminate_with_runner(
+    runner: CommandRunner,
+    node: str,
+    uid_whitelist: UIDWhitelist,
+    debug: bool,
+    remote_filter: bool,
+    metrics: NodeMetrics,
+    job_source: ActiveJobSource,
+    state_store: Optional[NodeStateStore] = None,
+    kill_engine: Optional[KillEngine] = None,
+    policy: Optional[ProcessPolicy] = None
+) -> Optional[ProcessTable]:
+    """Terminate orphaned processes using an open connection or remote shell
+
+    Processes that survived termination in an earlier sweep (as recorded in
+    the state store) are not signalled again.
+
+    Args:
+        runner: Open SSH connection or remote shell used to run commands
+        node: The name of the node (used for logging)
+        uid_whitelist: Do not terminate processes owned by the given UIDs
+        debug: Log which process to terminate but do not terminate them
+        remote_filter: Filter process data on the node instead of fetching the full process table
+        metrics: Records per-phase timings and process counts
+        job_source: Source of the users running Slurm jobs on the node
+        state_store: Optionally skip the scan if the node is unchanged since its last clean scan
+        kill_engine: Terminates marked process groups
+        policy: Optional compiled filter rules (`uid_whitelist` is ignored if given)
 
-        if process_df.empty:  # pragma: nocover
+    Returns:
+        The processes marked for termination, or `None` if the scan was skipped because the node is unchanged
+    """
+
+    kill_engine = kill_engine if kill_engine is not None else KillEngine()
+    policy = policy if policy is not None else ProcessPolicy(uid_whitelist)
+    fingerprint = None
+    if state_store is not None:
+        with metrics.phase('probe'):
+            fingerprint = parse_fingerprint((await runner.run(FINGERPRINT_COMMAND, check=True)).stdout)
+
+        # Processes can age into (or drop out of) resource thresholds without changing the fingerprint
+        if state_store.is_unchanged(node, fingerprint) and not policy.changes_over_time:
+            logging.info(f'[{node}] No process changes since the last clean scan')
+            metrics.count('unchanged', 1)
+            state_store.record(node, fingerprint, clean=True)
+            return None
+
+    with metrics.phase('jobs'):
+        active_uids = await job_source.active_uids(node, runner)
+
+    logging.info(f'[{node}] Scanning for processes')
+    if remote_filter:
+        process_table = await collect_remote_processes(runner, policy.uid_whitelist, metrics, active_uids)
+        metrics.count('processes', len(process_table))
+
+        # The collector only returns orphaned processes, but command rules are applied locally
+        with metrics.phase('filter'):
+            process_table = policy.select(process_table, process_table.pid, active_uids, metrics)
+
+    else:
+        # Output is only streamed over SSH connections since other runners return complete results
+        if hasattr(runner, 'create_process'):
+            # Command patterns are also matched against descendants of orphans, whose commands are otherwise dropped
+            process_table = await stream_remote_processes(runner, metrics, keep_all_commands=policy.matches_commands)
+
+        else:
+            process_table = await get_remote_processes(runner, metrics)
+
+        metrics.count('processes', len(process_table))
+
+        with metrics.phase('filter'):
+            process_table = filter_processes(process_table, uid_whitelist, active_uids, metrics, policy)
+
+    known_survivors = set()
+    if state_store is not None:
+        known_survivors = state_store.survivors(node, fingerprint).intersection(process_table.pid)
+        if known_survivors:
+            logging.info(f'[{node}] Ignoring {len(known_survivors)} process(es) that survived termination in an earlier sweep')
+            process_table = exclude_known_survivors(process_table, known_survivors)
+
+    for row in process_table.rows():  # pragma: nocover
+        logging.info(f'[{node}] Marking for termination {row}')
+
+    if process_table.empty or debug:
+        if process_table.empty:  # pragma: nocover
             logging.info(f'[{node}] no processes found')
 
-        elif not debug:
-            proc_id_str = ','.join(process_df.PGID.unique().astype(str))
-            logging.info(f"[{node}] Sending termination signal for process groups {proc_id_str}")
-            await conn.run(f"pkill --signal 9 --pgroup {proc_id_str}", check=True)
+        if state_store is not None:
+            cpu, rss = process_table.total_usage()
+            state_store.record(node, fingerprint, clean=process_table.empty, survivors=known_survivors, cpu=cpu, rss=rss)
+
+        return process_table
+
+    pgids = process_table.unique_pgids()
+    logging.info(f"[{node}] Sending termination signal for process groups {','.join(map(str, pgids))}")
+    with metrics.phase('kill'):
+        kill_result = await kill_engine.kill(runner, pgids)
+
+    record_kill(node, kill_result, metrics)
+    if state_store is not None:
+        cpu, rss = process_table.total_usage()
+        survivors = known_survivors.union(kill_result.survivors)
+        state_store.record(node, fingerprint, clean=False, survivors=survivors, cpu=cpu, rss=rss)
+
+    return process_table
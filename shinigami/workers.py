@@ -0,0 +1,151 @@
+"""Sharding of sweeps across worker processes with independent event loops."""
+
+import asyncio
+from collections import defaultdict
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+from .metrics import NodeMetrics
+from .report import NodeResult
+from .scheduler import Scheduler, SchedulerStats
+
+# Mapping of cluster names to the nodes assigned to a worker
+Shard = Dict[str, List[str]]
+
+
+class ShardResult:
+    """Results, metrics, and scheduler statistics returned by a worker process
+
+    Node results are collected using the `write` method so a shard result can
+    stand in for a `ResultWriter` within the worker.
+    """
+
+    __slots__ = ('results', 'metrics', 'clusters', 'node_state', 'stats')
+
+    def __init__(self) -> None:
+        """Instantiate an empty result"""
+
+        self.results: List[NodeResult] = []
+        self.metrics: List[NodeMetrics] = []
+        self.clusters: Dict[str, float] = dict()
+        self.node_state: Dict[str, Dict[str, Any]] = dict()
+        self.stats = SchedulerStats()
+
+    def write(self, result: NodeResult) -> None:
+        """Collect a single node result
+
+        Args:
+            result: The result to collect
+        """
+
+        self.results.append(result)
+
+
+def shard_nodes(nodes: Dict[str, Collection[str]], workers: int, scheduler: Scheduler) -> List[Shard]:
+    """Split nodes into balanced shards
+
+    Nodes in the same group (see `Scheduler.group_of`) are always assigned to
+    the same shard so per-group connection limits remain exact. Groups are
+    assigned largest first to the shard with the fewest nodes. Nodes keep
+    their given order within each shard (e.g., the order of a node ranking).
+
+    Args:
+        nodes: Mapping of cluster names to node names
+        workers: Number of shards to create
+        scheduler: Scheduler used to identify the group of each node
+
+    Returns:
+        A list of non-empty shards
+    """
+
+    groups: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    position: Dict[str, int] = dict()
+    for cluster, cluster_nodes in nodes.items():
+        for node in cluster_nodes:
+            position[node] = len(position)
+            group = scheduler.group_of(node)
+            groups[(cluster, node if group is None else group)].append(node)
+
+    shards: List[Shard] = [defaultdict(list) for _ in range(workers)]
+    sizes = [0] * workers
+    for (cluster, _), group_nodes in sorted(groups.items(), key=lambda item: -len(item[1])):
+        index = sizes.index(min(sizes))
+        shards[index][cluster].extend(group_nodes)
+        sizes[index] += len(group_nodes)
+
+    for shard in shards:
+        for members in shard.values():
+            members.sort(key=position.__getitem__)
+
+    return [dict(shard) for shard in shards if shard]
+
+
+def split_budget(total: int, parts: int) -> List[int]:
+    """Split a budget into near equal integer parts that sum to the total
+
+    The remainder of the division is spread across the leading parts, so part
+    sizes differ by at most one.
+
+    Args:
+        total: The budget to split
+        parts: Number of parts to split the budget into
+
+    Returns:
+        A list with the size of each part
+    """
+
+    quotient, remainder = divmod(total, parts)
+    return [quotient + (index < remainder) for index in range(parts)]
+
+
+def _run_coroutine(func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """Run a coroutine function in a new event loop (executed in the worker process)"""
+
+    return asyncio.run(func(*args))
+
+
+async def run_sharded(
+    shards: Collection[Shard],
+    func: Callable[..., Awaitable[ShardResult]],
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple = (),
+    shard_kwargs: Optional[Sequence[Dict[str, Any]]] = None,
+    **kwargs: Any
+) -> AsyncIterator[Tuple[Shard, Union[ShardResult, Exception]]]:
+    """Run a coroutine function for each shard in its own worker process
+
+    Workers are started using the `spawn` method so they do not inherit the
+    event loop or open connections of the parent process.
+
+    Args:
+        shards: The shards to process
+        func: Picklable coroutine function called with each shard and the given keyword arguments
+        initializer: Optional callable run once in each worker process (e.g., to configure logging)
+        initargs: Arguments passed to the initializer
+        shard_kwargs: Optional picklable keyword arguments passed to `func` for each shard (in the order of `shards`)
+        **kwargs: Picklable keyword arguments passed to `func` for every shard
+
+    Yields:
+        Tuples with each shard and its result or exception in order of completion
+    """
+
+    # Imported on demand since most sweeps are not sharded
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context('spawn')
+    shard_kwargs = shard_kwargs if shard_kwargs is not None else [dict() for _ in shards]
+    with ProcessPoolExecutor(len(shards), mp_context=context, initializer=initializer, initargs=initargs) as executor:
+
+        async def run(shard: Shard, extra_kwargs: Dict[str, Any]) -> Tuple[Shard, Union[ShardResult, Exception]]:
+            job = partial(func, **kwargs, **extra_kwargs)
+            try:
+                return shard, await loop.run_in_executor(executor, _run_coroutine, job, shard)
+
+            except Exception as caught:
+                return shard, caught
+
+        for next_done in asyncio.as_completed([run(*args) for args in zip(shards, shard_kwargs)]):
+            yield await next_done
+
@@ -1,9 +1,21 @@
 """Tests for the `cli.Application` class"""
 
-from unittest import TestCase
+import asyncio
+import json
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+from unittest import IsolatedAsyncioTestCase, TestCase
 from unittest.mock import patch
 
 from shinigami.cli import Application
+from shinigami.metrics import MetricsRecorder, NodeMetrics
+from shinigami.priority import NodePrioritizer
+from shinigami.process_table import ProcessTable
+from shinigami.scheduler import AdaptiveLimiter, RetryPolicy, Scheduler
+from shinigami.state import NodeStateStore
 
 
 class MethodRouting(TestCase):
@@ -22,3 +34,167 @@ class MethodRouting(TestCase):
         with patch.object(Application, 'terminate', autospec=True) as scan:
             Application().execute(['terminate', '-n', 'node1'])
             scan.assert_called_once()
+
+    def test_daemon_method(self) -> None:
+        """Test the `daemon` command routes to the `daemon` method"""
+
+        with patch.object(Application, 'daemon', autospec=True) as daemon:
+            Application().execute(['daemon', '-c', 'cluster1'])
+            daemon.assert_called_once()
+
+
+class ReportOnStdout(TestCase):
+    """Test console logging does not mix with reports written to stdout"""
+
+    def test_stdout_holds_only_report_rows(self) -> None:
+        """Test log messages are written to stderr when the report is written to stdout"""
+
+        stdout, stderr = StringIO(), StringIO()
+        with patch('shinigami.cli.terminate_local_processes', side_effect=RuntimeError('failed')), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            Application().execute(['local', '--report-file', '-'])
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(1, len(rows))
+        self.assertEqual('error', rows[0]['status'])
+        self.assertIn('Error with node', stderr.getvalue())
+
+
+class ParallelClusters(IsolatedAsyncioTestCase):
+    """Test the concurrent scanning of multiple clusters"""
+
+    async def run_scan(self, parallel_clusters: bool) -> list:
+        """Run a scan over two mocked clusters and return the order nodes were visited in"""
+
+        visited = []
+
+        async def terminate(node: str, **kwargs) -> None:
+            await asyncio.sleep(0)
+            visited.append(node)
+
+        node_states = {'c1': {f'c1-n{i}': 'idle' for i in range(4)}, 'c2': {'c2-n0': 'mixed', 'c2-n1': 'down*'}}
+        with patch('shinigami.utils.get_node_states', return_value=node_states), \
+                patch('shinigami.utils.terminate_errant_processes', side_effect=terminate):
+            await Application.scan(['c1', 'c2'], [], [0], 1, 1, True, parallel_clusters=parallel_clusters)
+
+        return visited
+
+    async def test_sequential_clusters(self) -> None:
+        """Test clusters are scanned one after another by default"""
+
+        visited = await self.run_scan(parallel_clusters=False)
+        self.assertEqual('c2-n0', visited[-1])
+
+    async def test_parallel_clusters(self) -> None:
+        """Test nodes from a small cluster are not starved by a large one"""
+
+        visited = await self.run_scan(parallel_clusters=True)
+        self.assertEqual(5, len(visited))
+        self.assertNotIn('c2-n1', visited)
+        self.assertLess(visited.index('c2-n0'), 2)
+
+
+class ShardedBudget(IsolatedAsyncioTestCase):
+    """Test the connection budget is divided between worker processes"""
+
+    async def run_sharded_scan(self, workers: int, max_concurrent: int) -> list:
+        """Run a sharded scan over ten nodes and return the connection budget of each worker"""
+
+        budgets = []
+
+        async def run_sharded(shards: list, func, shard_kwargs: list, **kwargs):
+            budgets.extend(extra['max_concurrent'] for extra in shard_kwargs)
+            for _ in ():  # pragma: nocover
+                yield
+
+        with patch('shinigami.cli.run_sharded', side_effect=run_sharded):
+            await Application._scan_sharded(
+                {'c1': [f'n{i}' for i in range(10)]}, workers, Scheduler(max_concurrent),
+                MetricsRecorder(), max_concurrent=max_concurrent)
+
+        return budgets
+
+    async def test_budget_split(self) -> None:
+        """Test worker budgets sum to the total connection limit"""
+
+        self.assertEqual([3, 3, 2, 2], await self.run_sharded_scan(workers=4, max_concurrent=10))
+
+    async def test_workers_capped(self) -> None:
+        """Test no more workers are started than there are connections"""
+
+        self.assertEqual([1, 1, 1], await self.run_sharded_scan(workers=8, max_concurrent=3))
+
+
+class PrioritizedState(IsolatedAsyncioTestCase):
+    """Test prioritization combined with persisted node state"""
+
+    async def test_ended_nodes_not_backed_off(self) -> None:
+        """Test nodes with recently ended jobs are visited while other clean nodes back off"""
+
+        visited = []
+
+        async def terminate(node: str, **kwargs) -> None:
+            visited.append(node)
+
+        with TemporaryDirectory() as tmp_dir:
+            state_file = Path(tmp_dir) / 'state.json'
+            state_store = NodeStateStore(state_file)
+            for node in ('n0', 'n1', 'n2'):
+                state_store.record(node, 'fingerprint', clean=True)
+
+            state_store.save()
+
+            prioritizer = NodePrioritizer(recently_ended=['n1'])
+            with patch('shinigami.utils.get_node_states', return_value={'c1': {'n0': 'idle', 'n1': 'idle', 'n2': 'idle', 'n3': 'idle'}}), \
+                    patch.object(NodePrioritizer, 'fetch', return_value=prioritizer), \
+                    patch('shinigami.utils.terminate_errant_processes', side_effect=terminate):
+                await Application.scan(['c1'], [], [0], 1, 1, True, state_file=state_file, prioritize=True)
+
+        self.assertEqual(['n1', 'n3'], visited)
+
+
+class NodeResults(IsolatedAsyncioTestCase):
+    """Test per-node results are yielded as nodes finish"""
+
+    async def test_result_statuses(self) -> None:
+        """Test each node outcome maps to a result status"""
+
+        async def terminate(node: str, **kwargs) -> Optional[ProcessTable]:
+            if node == 'broken':
+                raise RuntimeError('failed')
+
+            if node == 'unchanged':
+                return None
+
+            pids = [10] if node == 'dirty' else []
+            return ProcessTable(pid=pids, ppid=[1] * len(pids), pgid=pids, uid=[0] * len(pids), cmd=[''] * len(pids))
+
+        with patch('shinigami.utils.terminate_errant_processes', side_effect=terminate), self.assertLogs(level='ERROR'):
+            results = Application.iter_results(
+                Scheduler(4), ['broken', 'unchanged', 'clean', 'dirty'], [0], None, debug=False, queue='c1')
+            statuses = {result.node: result async for result in results}
+
+        self.assertEqual('error', statuses['broken'].status)
+        self.assertEqual('unchanged', statuses['unchanged'].status)
+        self.assertEqual('clean', statuses['clean'].status)
+        self.assertEqual('terminated', statuses['dirty'].status)
+        self.assertEqual([10], statuses['dirty'].pgids)
+        self.assertEqual('c1', statuses['dirty'].cluster)
+
+    async def test_limiter_latency_per_attempt(self) -> None:
+        """Test the adaptive limiter receives the connect latency of the successful attempt only"""
+
+        async def terminate(node: str, metrics: NodeMetrics, **kwargs) -> None:
+            first_attempt = 'connect' not in metrics.timings
+            metrics.timings['connect'] += 5 if first_attempt else 0.5
+            if first_attempt:
+                raise ConnectionError('unreachable')
+
+        limiter = AdaptiveLimiter(1, 4)
+        scheduler = Scheduler(4, limiter=limiter, retry=RetryPolicy(attempts=2, backoff_base=0))
+        with patch('shinigami.utils.terminate_errant_processes', side_effect=terminate), \
+                patch.object(limiter, 'record_success', wraps=limiter.record_success) as record_success:
+            results = [result async for result in Application.iter_results(scheduler, ['n1'], [0], None, debug=True)]
+
+        self.assertEqual('unchanged', results[0].status)
+        record_success.assert_called_once_with(0.5)
@@ -1,8 +1,10 @@
 """Tests for the `cli.Parser` class"""
 
+from pathlib import Path
 from unittest import TestCase
 
 from shinigami.cli import Parser
+from shinigami.intervals import IntervalSet
 
 
 class ErrorHandling(TestCase):
@@ -66,6 +68,18 @@ class ScanSubParser(TestCase):
         multi_node_cmd = base_command + ['-i', 'node1', 'node2']
         self.assertSequenceEqual(multi_node_out, parser.parse_args(multi_node_cmd).ignore_nodes)
 
+    def test_group_args(self) -> None:
+        """Test parsing of the node group arguments"""
+
+        parser = Parser()
+        base_command = ['scan', '-c', 'development']
+        self.assertIsNone(parser.parse_args(base_command).group_limit)
+        self.assertIsNone(parser.parse_args(base_command).group_pattern)
+
+        group_args = parser.parse_args(base_command + ['--group-limit', '4', '--group-pattern', '^(rack\\d+)'])
+        self.assertEqual(4, group_args.group_limit)
+        self.assertEqual('^(rack\\d+)', group_args.group_pattern)
+
     def test_uid_whitelist_arg(self) -> None:
         """Test parsing of the `uid-whitelist` argument"""
 
@@ -73,23 +87,85 @@ class ScanSubParser(TestCase):
 
         # Test for a single integer
         single_int_command = 'scan -c development -u 100'.split()
-        single_int_out = [100]
-        self.assertSequenceEqual(single_int_out, parser.parse_args(single_int_command).uid_whitelist)
+        single_int_out = IntervalSet([100])
+        self.assertEqual(single_int_out, parser.parse_args(single_int_command).uid_whitelist)
 
         # Test for a multiple integers
         multi_int_command = 'scan -c development -u 100 200'.split()
-        multi_int_out = [100, 200]
-        self.assertSequenceEqual(multi_int_out, parser.parse_args(multi_int_command).uid_whitelist)
+        multi_int_out = IntervalSet([100, 200])
+        self.assertEqual(multi_int_out, parser.parse_args(multi_int_command).uid_whitelist)
 
         # Test for a list type
         single_list_command = 'scan -c development -u [100,200]'.split()
-        single_list_out = [[100, 200]]
-        self.assertSequenceEqual(single_list_out, parser.parse_args(single_list_command).uid_whitelist)
+        single_list_out = IntervalSet([[100, 200]])
+        self.assertEqual(single_list_out, parser.parse_args(single_list_command).uid_whitelist)
 
         # Test for a mix of types
         mixed_command = 'scan -c development -u 100 [200,300] 400 [500,600]'.split()
-        mixed_out = [100, [200, 300], 400, [500, 600]]
-        self.assertSequenceEqual(mixed_out, parser.parse_args(mixed_command).uid_whitelist)
+        mixed_out = IntervalSet([100, [200, 300], 400, [500, 600]])
+        self.assertEqual(mixed_out, parser.parse_args(mixed_command).uid_whitelist)
+
+    def test_uid_exclude_arg(self) -> None:
+        """Test excluded user IDs are removed from the whitelist"""
+
+        command = 'scan -c development -u [1000,2000] -x 1500 [1800,1900]'.split()
+        expected = IntervalSet([[1000, 1500], [1501, 1800], [1900, 2000]])
+        args = Parser().parse_args(command)
+
+        self.assertEqual(expected, args.uid_whitelist)
+        self.assertEqual([1500, [1800, 1900]], args.uid_exclude)
+
+    def test_job_source_arg(self) -> None:
+        """Test the active job source defaults to process scanning"""
+
+        parser = Parser()
+        self.assertEqual('process', parser.parse_args('scan -c development'.split()).job_source)
+        self.assertEqual('squeue', parser.parse_args('scan -c development --job-source squeue'.split()).job_source)
+
+    def test_report_args(self) -> None:
+        """Test the node results report is disabled by default"""
+
+        parser = Parser()
+        args = parser.parse_args('scan -c development'.split())
+        self.assertIsNone(args.report_file)
+        self.assertEqual('ndjson', args.report_format)
+
+        args = parser.parse_args('scan -c development --report-file - --report-format csv'.split())
+        self.assertEqual('-', args.report_file)
+        self.assertEqual('csv', args.report_format)
+
+    def test_workers_arg(self) -> None:
+        """Test scans run in a single process by default"""
+
+        parser = Parser()
+        self.assertEqual(1, parser.parse_args('scan -c development'.split()).workers)
+        self.assertEqual(4, parser.parse_args('scan -c development --workers 4'.split()).workers)
+
+    def test_prioritize_args(self) -> None:
+        """Test nodes are not prioritized by default"""
+
+        parser = Parser()
+        args = parser.parse_args('scan -c development'.split())
+        self.assertFalse(args.prioritize)
+        self.assertEqual(3600, args.ended_window)
+
+        args = parser.parse_args('scan -c development --prioritize --ended-window 600'.split())
+        self.assertTrue(args.prioritize)
+        self.assertEqual(600, args.ended_window)
+
+    def test_threshold_args(self) -> None:
+        """Test resource thresholds are disabled by default"""
+
+        parser = Parser()
+        args = parser.parse_args('scan -c development'.split())
+        self.assertEqual(0, args.min_age)
+        self.assertIsNone(args.min_cpu)
+        self.assertIsNone(args.min_rss)
+
+        args = parser.parse_args('scan -c development --min-age 600 --min-cpu 50 --min-rss 1024'.split())
+        self.assertEqual(600, args.min_age)
+        self.assertEqual(50, args.min_cpu)
+        self.assertEqual(1024, args.min_rss)
 
 
 class TerminateSubParser(TestCase):
@@ -136,20 +212,66 @@ class TerminateSubParser(TestCase):
 
         # Test for a single integer
         single_int_command = 'terminate -n node -u 100'.split()
-        single_int_out = [100]
-        self.assertSequenceEqual(single_int_out, parser.parse_args(single_int_command).uid_whitelist)
+        single_int_out = IntervalSet([100])
+        self.assertEqual(single_int_out, parser.parse_args(single_int_command).uid_whitelist)
 
         # Test for a multiple integers
         multi_int_command = 'terminate -n node -u 100 200'.split()
-        multi_int_out = [100, 200]
-        self.assertSequenceEqual(multi_int_out, parser.parse_args(multi_int_command).uid_whitelist)
+        multi_int_out = IntervalSet([100, 200])
+        self.assertEqual(multi_int_out, parser.parse_args(multi_int_command).uid_whitelist)
 
         # Test for a list type
         single_list_command = 'terminate -n node -u [100,200]'.split()
-        single_list_out = [[100, 200]]
-        self.assertSequenceEqual(single_list_out, parser.parse_args(single_list_command).uid_whitelist)
+        single_list_out = IntervalSet([[100, 200]])
+        self.assertEqual(single_list_out, parser.parse_args(single_list_command).uid_whitelist)
 
         # Test for a mix of types
         mixed_command = 'terminate -n node -u 100 [200,300] 400 [500,600]'.split()
-        mixed_out = [100, [200, 300], 400, [500, 600]]
-        self.assertSequenceEqual(mixed_out, parser.parse_args(mixed_command).uid_whitelist)
+        mixed_out = IntervalSet([100, [200, 300], 400, [500, 600]])
+        self.assertEqual(mixed_out, parser.parse_args(mixed_command).uid_whitelist)
+
+
+class DaemonSubParser(TestCase):
+    """Test the behavior of the `daemon` subparser"""
+
+    def test_scan_args(self) -> None:
+        """Test the daemon accepts the same scanning arguments as the `scan` command"""
+
+        args = Parser().parse_args(['daemon', '-c', 'dev1', 'dev2', '-i', 'node1', '-u', '100'])
+        self.assertSequenceEqual(['dev1', 'dev2'], args.clusters)
+        self.assertSequenceEqual(['node1'], args.ignore_nodes)
+        self.assertEqual(IntervalSet([100]), args.uid_whitelist)
+
+    def test_daemon_args(self) -> None:
+        """Test parsing of daemon specific arguments"""
+
+        command = ['daemon', '-c', 'dev', '--interval', '60', '--idle-timeout', '120', '--keepalive', '15', '--pool-size', '100']
+        args = Parser().parse_args(command)
+        self.assertEqual(60, args.interval)
+        self.assertEqual(120, args.idle_timeout)
+        self.assertEqual(15, args.keepalive_interval)
+        self.assertEqual(100, args.pool_size)
+
+
+class LocalSubParser(TestCase):
+    """Test the behavior of the `local` subparser"""
+
+    def test_local_args(self) -> None:
+        """Test parsing of arguments shared with the remote commands"""
+
+        args = Parser().parse_args(['local', '-u', '[100,200]', '-x', '150', '--grace-period', '0', '--debug'])
+        self.assertEqual(IntervalSet([[100, 200]], exclude=[150]), args.uid_whitelist)
+        self.assertEqual(0, args.grace_period)
+        self.assertTrue(args.debug)
+
+    def test_ssh_args_rejected(self) -> None:
+        """Test SSH specific arguments are not accepted"""
+
+        with self.assertRaises(SystemExit):
+            Parser().parse_args(['local', '-m', '10'])
+
+    def test_config_arg(self) -> None:
+        """Test the settings file is parsed as a path"""
+
+        args = Parser().parse_args(['local', '--config', 'settings.json'])
+        self.assertEqual(Path('settings.json'), args.config_file)
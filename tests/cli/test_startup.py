@@ -0,0 +1,45 @@
+"""Tests for the import time budget of the `cli` module"""
+
+import subprocess
+import sys
+from unittest import TestCase
+
+# Maximum cumulative import time of `shinigami.cli` in microseconds (best of several runs)
+IMPORT_TIME_BUDGET = 400_000
+
+# Modules only needed by commands that connect to compute nodes, shard sweeps, or use optional dependencies
+# (`concurrent.futures` itself is imported by `asyncio`, but its process pool is loaded on demand)
+DEFERRED_MODULES = ('asyncssh', 'pandas', 'numpy', 'importlib.metadata', 'multiprocessing', 'concurrent.futures.process')
+
+
+class StartupCost(TestCase):
+    """Test heavy dependencies are not loaded when importing the CLI"""
+
+    def test_deferred_modules(self) -> None:
+        """Test importing the CLI does not import SSH, process pool, dataframe, or package metadata support"""
+
+        script = f'import sys, shinigami.cli; print(*[m for m in {DEFERRED_MODULES!r} if m in sys.modules])'
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        self.assertEqual('', result.stdout.strip())
+
+    def test_import_time_budget(self) -> None:
+        """Test the cumulative import time of the CLI is within budget"""
+
+        best = float('inf')
+        for _ in range(3):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', 'import shinigami.cli'],
+                capture_output=True, text=True, check=True)
+
+            # The module imported by the `-c` statement is reported last
+            cumulative = int(result.stderr.strip().splitlines()[-1].split('|')[1])
+            best = min(best, cumulative)
+
+        self.assertLess(best, IMPORT_TIME_BUDGET)
+
+    def test_version_resolved_lazily(self) -> None:
+        """Test the package version is still available as a module attribute"""
+
+        import shinigami
+
+        self.assertIsInstance(shinigami.__version__, str)
@@ -0,0 +1,152 @@
+"""Tests for the `collector` module"""
+
+import inspect
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shinigami import collector
+from shinigami.process_table import ProcessTable
+
+
+def write_fake_process(
+    proc_root: Path, pid: int, ppid: int, pgid: int, uid: int, cmd: str, comm: str = 'comm',
+    cpu_ticks: int = 0, start_ticks: int = 0, rss_pages: int = 0
+) -> None:
+    """Write the proc files for a fake process"""
+
+    process_dir = proc_root / str(pid)
+    process_dir.mkdir()
+
+    # Fields 3 through 24 of `proc(5)`, from the process state to the resident set size
+    fields = ['S', ppid, pgid, pgid, 0, -1, 0, 0, 0, 0, 0, cpu_ticks, 0, 0, 0, 20, 0, 1, 0, start_ticks, 0, rss_pages]
+    (process_dir / 'stat').write_text(f'{pid} ({comm}) ' + ' '.join(map(str, fields)))
+    (process_dir / 'status').write_text(f'Name:\t{comm}\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n')
+    (process_dir / 'cmdline').write_bytes(cmd.replace(' ', '\0').encode())
+
+
+class ReadProcess(TestCase):
+    """Test the parsing of process data from the proc filesystem"""
+
+    def setUp(self) -> None:
+        """Create a temporary proc directory"""
+
+        self.tmp_dir = TemporaryDirectory()
+        self.proc_root = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        """Delete temporary files"""
+
+        self.tmp_dir.cleanup()
+
+    def test_process_values(self) -> None:
+        """Test process values are parsed from the stat, status, and cmdline files"""
+
+        write_fake_process(self.proc_root, 100, 1, 100, 1001, 'python script.py', comm='odd) name (')
+        self.assertEqual((100, 1, 100, 1001, 'python script.py'), collector.read_process(100, self.proc_root)[:5])
+
+    def test_resource_usage(self) -> None:
+        """Test resource usage is converted to the units used by `ps`"""
+
+        ticks = collector.CLOCK_TICKS
+        (self.proc_root / 'uptime').write_text('1000.00 500.00\n')
+        write_fake_process(
+            self.proc_root, 100, 1, 100, 1001, 'stress', cpu_ticks=250 * ticks, start_ticks=500 * ticks, rss_pages=10)
+
+        pcpu, rss, etime, state = collector.read_process(100, self.proc_root)[5:]
+        self.assertEqual(50.0, pcpu)
+        self.assertEqual(10 * collector.PAGE_SIZE_KB, rss)
+        self.assertEqual(500, etime)
+        self.assertEqual('S', state)
+
+    def test_kernel_thread(self) -> None:
+        """Test processes without a command line are named after their command"""
+
+        write_fake_process(self.proc_root, 2, 0, 0, 0, '', comm='kthreadd')
+        self.assertEqual('[kthreadd]', collector.read_process(2, self.proc_root)[4])
+
+    def test_missing_process(self) -> None:
+        """Test `None` is returned for processes that do not exist"""
+
+        self.assertIsNone(collector.read_process(12345, self.proc_root))
+
+    def test_current_process(self) -> None:
+        """Test the current process is read from the real proc filesystem"""
+
+        pid, ppid, pgid, uid, *_ = collector.read_process(os.getpid())
+        self.assertEqual((os.getpid(), os.getppid(), os.getpgid(0), os.geteuid()), (pid, ppid, pgid, uid))
+
+
+class Collect(TestCase):
+    """Test the filtering of candidate processes on the node"""
+
+    def setUp(self) -> None:
+        """Create a temporary proc directory with example processes"""
+
+        self.tmp_dir = TemporaryDirectory()
+        self.proc_root = Path(self.tmp_dir.name)
+        write_fake_process(self.proc_root, 1, 0, 1, 0, '/sbin/init')
+        write_fake_process(self.proc_root, 10, 1, 10, 1001, 'orphan')
+        write_fake_process(self.proc_root, 11, 10, 10, 1001, 'child')
+        write_fake_process(self.proc_root, 20, 1, 20, 1002, 'orphan of slurm user')
+        write_fake_process(self.proc_root, 21, 1, 21, 1002, 'slurmd')
+        write_fake_process(self.proc_root, 30, 1, 30, 500, 'system orphan')
+        write_fake_process(self.proc_root, 40, 1, 40, 1003, 'systemd --user')
+        write_fake_process(self.proc_root, 41, 40, 41, 1003, 'reparented')
+
+    def tearDown(self) -> None:
+        """Delete temporary files"""
+
+        self.tmp_dir.cleanup()
+
+    def test_candidates(self) -> None:
+        """Test only orphaned, whitelisted, non-slurm processes and their descendants are returned"""
+
+        candidates = sorted(process[:5] for process in collector.collect(1, [[1000, 2000]], self.proc_root))
+        self.assertEqual([
+            (10, 1, 10, 1001, 'orphan'),
+            (11, 10, 10, 1001, 'child'),
+            (40, 1, 40, 1003, 'systemd --user'),
+            (41, 40, 41, 1003, 'reparented'),
+        ], candidates)
+
+    def test_daemon_subtrees(self) -> None:
+        """Test processes started by system daemons are not returned"""
+
+        write_fake_process(self.proc_root, 50, 1, 50, 0, '/usr/sbin/sshd -D')
+        write_fake_process(self.proc_root, 52, 50, 52, 1004, '-bash')
+        write_fake_process(self.proc_root, 70, 1, 70, 0, 'slurmstepd: [123.batch]')
+        write_fake_process(self.proc_root, 71, 70, 71, 1005, 'python train.py')
+
+        candidates = collector.collect(1, [[1000, 2000]], self.proc_root, active_uids=[])
+        self.assertEqual([10, 11, 40, 41], sorted(process[0] for process in candidates))
+
+    def test_root_daemons(self) -> None:
+        """Test root owned daemons are not returned when root is whitelisted and job owners are given"""
+
+        write_fake_process(self.proc_root, 50, 1, 50, 0, '/usr/sbin/sshd -D')
+        write_fake_process(self.proc_root, 60, 1, 60, 0, '/usr/sbin/slurmd')
+
+        candidates = collector.collect(1, [0], self.proc_root, active_uids=[1001])
+        self.assertEqual([], [process[0] for process in candidates])
+
+    def test_individual_uids(self) -> None:
+        """Test individual user IDs are whitelisted"""
+
+        candidates = collector.collect(1, [500], self.proc_root)
+        self.assertEqual([30], [process[0] for process in candidates])
+
+    def test_remote_execution(self) -> None:
+        """Test the module output is parsable when piped to a python interpreter"""
+
+        options = json.dumps({'init_pid': 1, 'uid_whitelist': [[1000, 2000]], 'proc_root': str(self.proc_root)})
+        output = subprocess.run(
+            [sys.executable, '-', options], input=inspect.getsource(collector),
+            capture_output=True, text=True, check=True).stdout
+
+        table = ProcessTable.from_ps_output(output)
+        self.assertEqual([10, 11, 40, 41], sorted(table.pid))
@@ -0,0 +1,78 @@
+"""Tests for the `intervals.IntervalSet` class"""
+
+from unittest import TestCase
+
+import numpy as np
+
+from shinigami.intervals import IntervalSet
+
+
+class Construction(TestCase):
+    """Test intervals are normalized on construction"""
+
+    def test_values_and_ranges(self) -> None:
+        """Test individual values and ranges are stored as sorted intervals"""
+
+        interval_set = IntervalSet([[10, 20], 5])
+        self.assertEqual([(5, 6), (10, 20)], list(interval_set))
+
+    def test_overlapping_intervals_are_merged(self) -> None:
+        """Test overlapping and adjacent intervals are merged"""
+
+        interval_set = IntervalSet([[10, 20], [15, 30], [30, 40], 41])
+        self.assertEqual([(10, 40), (41, 42)], list(interval_set))
+
+    def test_empty_intervals_are_dropped(self) -> None:
+        """Test ranges with an upper bound at or below the lower bound are ignored"""
+
+        self.assertEqual(0, len(IntervalSet([[10, 10], [20, 15]])))
+
+    def test_exclusions(self) -> None:
+        """Test excluded values and ranges are subtracted from the set"""
+
+        interval_set = IntervalSet([[0, 100], [200, 300]], exclude=[[50, 250], 10])
+        self.assertEqual([(0, 10), (11, 50), (250, 300)], list(interval_set))
+
+    def test_coerce(self) -> None:
+        """Test existing sets are returned unchanged and collections are converted"""
+
+        interval_set = IntervalSet([1])
+        self.assertIs(interval_set, IntervalSet.coerce(interval_set))
+        self.assertEqual(interval_set, IntervalSet.coerce([1]))
+
+    def test_to_list(self) -> None:
+        """Test sets are serialized as individual values and ranges"""
+
+        self.assertEqual([1, [10, 20]], IntervalSet([[10, 20], 1]).to_list())
+
+
+class Membership(TestCase):
+    """Test membership checks against the set"""
+
+    def setUp(self) -> None:
+        """Create a set spanning a large range of user IDs"""
+
+        self.interval_set = IntervalSet([0, [1000, 4294967294]], exclude=[65534])
+
+    def test_contains(self) -> None:
+        """Test lower bounds are inclusive and upper bounds are exclusive"""
+
+        self.assertIn(0, self.interval_set)
+        self.assertIn(1000, self.interval_set)
+        self.assertIn(4294967293, self.interval_set)
+        self.assertNotIn(4294967294, self.interval_set)
+        self.assertNotIn(999, self.interval_set)
+        self.assertNotIn(-1, self.interval_set)
+        self.assertNotIn(65534, self.interval_set)
+
+    def test_isin(self) -> None:
+        """Test vectorized membership matches scalar membership"""
+
+        values = np.array([-1, 0, 1, 999, 1000, 65534, 65535, 4294967293, 4294967294])
+        expected = [value in self.interval_set for value in values]
+        np.testing.assert_array_equal(expected, self.interval_set.isin(values))
+
+    def test_isin_empty_set(self) -> None:
+        """Test no values are members of an empty set"""
+
+        self.assertFalse(IntervalSet().isin(np.array([0, 1])).any())
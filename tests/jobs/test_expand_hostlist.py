@@ -0,0 +1,34 @@
+"""Tests for the `jobs.expand_hostlist` function"""
+
+from unittest import TestCase
+
+from shinigami.jobs import expand_hostlist
+
+
+class ExpandHostlist(TestCase):
+    """Test the expansion of Slurm hostlist expressions"""
+
+    def test_single_host(self) -> None:
+        """Test a plain host name is returned unchanged"""
+
+        self.assertEqual(['gpu1'], expand_hostlist('gpu1'))
+
+    def test_zero_padded_range(self) -> None:
+        """Test ranges preserve zero padding"""
+
+        self.assertEqual(['c08', 'c09', 'c10'], expand_hostlist('c[08-10]'))
+
+    def test_mixed_values_and_hosts(self) -> None:
+        """Test comma separated ranges, values, and host names are expanded"""
+
+        self.assertEqual(['c01', 'c02', 'c07', 'gpu1'], expand_hostlist('c[01-02,07],gpu1'))
+
+    def test_multiple_brackets(self) -> None:
+        """Test expressions with multiple bracketed ranges produce every combination"""
+
+        self.assertEqual(['r1n1', 'r1n2', 'r2n1', 'r2n2'], expand_hostlist('r[1-2]n[1-2]'))
+
+    def test_suffix(self) -> None:
+        """Test text after a bracketed range is appended to each host"""
+
+        self.assertEqual(['c1-ib', 'c2-ib'], expand_hostlist('c[1-2]-ib'))
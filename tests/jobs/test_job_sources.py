@@ -0,0 +1,86 @@
+"""Tests for the active job sources in the `jobs` module"""
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from shinigami.jobs import CGROUP_PATTERNS, ActiveJobSource, CgroupJobSource, SqueueJobSource, create_job_source
+
+
+class CreateJobSource(IsolatedAsyncioTestCase):
+    """Test the creation of job sources by name"""
+
+    async def test_process_source(self) -> None:
+        """Test the default source defers to process scanning"""
+
+        source = await create_job_source('process')
+        self.assertIsNone(await source.active_uids('c1', MagicMock()))
+
+    async def test_cgroup_source(self) -> None:
+        """Test the cgroup source is created without querying Slurm"""
+
+        self.assertIsInstance(await create_job_source('cgroup'), CgroupJobSource)
+
+    async def test_unknown_source(self) -> None:
+        """Test a `ValueError` is raised for unknown source names"""
+
+        with self.assertRaises(ValueError):
+            await create_job_source('unknown')
+
+
+class Cgroup(IsolatedAsyncioTestCase):
+    """Test reading active users from the node cgroup hierarchy"""
+
+    async def test_active_uids(self) -> None:
+        """Test user IDs are parsed from the remote command output"""
+
+        runner = MagicMock()
+        runner.run = AsyncMock(return_value=MagicMock(stdout='/sys/fs/cgroup/cpuset/slurm/uid_1001/job_5\n'))
+        self.assertEqual({1001}, await CgroupJobSource().active_uids('c1', runner))
+
+    async def test_no_job_cgroups(self) -> None:
+        """Test job ownership is unknown when the glob patterns are returned unexpanded"""
+
+        runner = MagicMock()
+        runner.run = AsyncMock(return_value=MagicMock(stdout='\n'.join(CGROUP_PATTERNS) + '\n'))
+        self.assertIsNone(await CgroupJobSource().active_uids('c1', runner))
+
+        with patch('shinigami.jobs.glob.iglob', return_value=[]):
+            self.assertIsNone(await CgroupJobSource().active_uids('c1', None))
+
+    async def test_local_machine(self) -> None:
+        """Test cgroup paths are globbed directly when no runner is given"""
+
+        with patch('shinigami.jobs.glob.iglob', side_effect=[['/sys/fs/cgroup/cpuset/slurm/uid_1002/job_7'], []]):
+            self.assertEqual({1002}, await CgroupJobSource().active_uids('c1', None))
+
+
+class Squeue(IsolatedAsyncioTestCase):
+    """Test looking up active users in a squeue index"""
+
+    async def test_fetch_queries_all_clusters(self) -> None:
+        """Test a single squeue call is made for all clusters"""
+
+        sub_proc = MagicMock()
+        sub_proc.communicate = AsyncMock(return_value=(b'CLUSTER: dev\nc[1-2] 1001\n', b''))
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=sub_proc)) as squeue:
+            source = await SqueueJobSource.fetch(['dev', 'prod'])
+
+        squeue.assert_awaited_once()
+        self.assertIn('dev,prod', squeue.call_args.args)
+        self.assertEqual({1001}, await source.active_uids('c2', None))
+
+    async def test_fetch_error(self) -> None:
+        """Test a `RuntimeError` is raised when squeue writes to stderr"""
+
+        sub_proc = MagicMock()
+        sub_proc.communicate = AsyncMock(return_value=(b'', b'squeue: error'))
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=sub_proc)):
+            with self.assertRaises(RuntimeError):
+                await SqueueJobSource.fetch(['dev'])
+
+    async def test_idle_node(self) -> None:
+        """Test nodes without jobs have no active users"""
+
+        source = SqueueJobSource({'c1': {1001}})
+        self.assertEqual(set(), await source.active_uids('c2', None))
+        self.assertIsInstance(source, ActiveJobSource)
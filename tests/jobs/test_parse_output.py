@@ -0,0 +1,46 @@
+"""Tests for the `jobs.parse_squeue_output` and `jobs.parse_cgroup_paths` functions"""
+
+from unittest import TestCase
+
+from shinigami.jobs import parse_cgroup_paths, parse_squeue_output
+
+
+class ParseSqueueOutput(TestCase):
+    """Test building the node to user ID index from squeue output"""
+
+    def test_node_index(self) -> None:
+        """Test node lists are expanded and users are grouped by node"""
+
+        output = 'c[1-2] 1001\nc2 1002\n'
+        self.assertEqual({'c1': {1001}, 'c2': {1001, 1002}}, parse_squeue_output(output))
+
+    def test_cluster_headers_are_ignored(self) -> None:
+        """Test headers printed for multi-cluster queries are skipped"""
+
+        output = 'CLUSTER: dev\nc1 1001\nCLUSTER: prod\np1 1002\n'
+        self.assertEqual({'c1': {1001}, 'p1': {1002}}, parse_squeue_output(output))
+
+    def test_jobs_without_nodes(self) -> None:
+        """Test lines without an allocated node list are skipped"""
+
+        self.assertEqual({}, parse_squeue_output(' 1001\n'))
+
+
+class ParseCgroupPaths(TestCase):
+    """Test extracting user IDs from Slurm job cgroup paths"""
+
+    def test_user_ids(self) -> None:
+        """Test user IDs are parsed from job cgroup paths"""
+
+        output = '\n'.join([
+            '/sys/fs/cgroup/cpuset/slurm/uid_1001/job_10',
+            '/sys/fs/cgroup/memory/slurm/uid_1001/job_11',
+            '/sys/fs/cgroup/cpuset/slurm_node1/uid_1002/job_12',
+        ])
+
+        self.assertEqual({1001, 1002}, parse_cgroup_paths(output))
+
+    def test_unmatched_patterns_are_ignored(self) -> None:
+        """Test unexpanded glob patterns do not produce user IDs"""
+
+        self.assertEqual(set(), parse_cgroup_paths('/sys/fs/cgroup/*/slurm*/uid_*/job_*\n'))
@@ -0,0 +1,120 @@
+"""Tests for the `kill.KillEngine` class"""
+
+import asyncio
+import subprocess
+from typing import List
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from shinigami.kill import PS_STATUS_COMMAND, KillEngine
+
+
+class CommandResult:
+    """Minimal stand in for the result of a remote command"""
+
+    def __init__(self, command: str, stdout: str = '', exit_status: int = 0) -> None:
+        self.command = command
+        self.stdout = stdout
+        self.exit_status = exit_status
+
+
+class LocalRunner:
+    """Runs commands on the local machine using the same interface as an SSH connection"""
+
+    def __init__(self) -> None:
+        self.commands = []
+
+    async def run(self, command: str) -> CommandResult:
+        self.commands.append(command)
+        process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE)
+        stdout, _ = await process.communicate()
+        return CommandResult(command, stdout.decode(), process.returncode)
+
+
+class StuckRunner:
+    """Fake connection to a node where every signalled process is stuck in uninterruptible sleep"""
+
+    def __init__(self, pgids: List[int]) -> None:
+        self.commands = []
+        self.pgids = pgids
+
+    async def run(self, command: str) -> CommandResult:
+        self.commands.append(command)
+        if command == PS_STATUS_COMMAND:
+            return CommandResult(command, ''.join(f'{pgid} {pgid} D\n' for pgid in self.pgids))
+
+        return CommandResult(command)
+
+
+class SignalCommands(TestCase):
+    """Test process groups are split into batches"""
+
+    def test_batches(self) -> None:
+        """Test no command signals more than `batch_size` process groups"""
+
+        commands = KillEngine(batch_size=2).signal_commands('TERM', [5, 1, 3, 2, 4])
+        self.assertEqual([
+            'pkill --signal TERM --pgroup 1,2',
+            'pkill --signal TERM --pgroup 3,4',
+            'pkill --signal TERM --pgroup 5',
+        ], commands)
+
+    def test_invalid_batch_size(self) -> None:
+        """Test a `ValueError` is raised for batch sizes below one"""
+
+        with self.assertRaises(ValueError):
+            KillEngine(batch_size=0)
+
+
+class SignalEscalation(IsolatedAsyncioTestCase):
+    """Test signals escalate from SIGTERM to SIGKILL"""
+
+    def start_group(self, script: str) -> subprocess.Popen:
+        """Start a shell script as the leader of a new process group"""
+
+        process = subprocess.Popen(['sh', '-c', script], start_new_session=True)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        return process
+
+    async def test_escalation(self) -> None:
+        """Test groups ignoring SIGTERM are killed after the grace period"""
+
+        polite = self.start_group('exec sleep 30')
+        stubborn = self.start_group("trap '' TERM; sleep 30 & wait")
+        await asyncio.sleep(0.2)
+
+        engine = KillEngine(grace_period=0.5, kill_timeout=1, poll_interval=0.05)
+        result = await engine.kill(LocalRunner(), [polite.pid, stubborn.pid])
+
+        self.assertEqual([polite.pid], result.terminated)
+        self.assertEqual([stubborn.pid], result.killed)
+        self.assertEqual({}, result.survivors)
+        self.assertEqual([], result.surviving_pgids)
+
+    async def test_immediate_kill(self) -> None:
+        """Test a zero grace period sends SIGKILL without SIGTERM"""
+
+        group = self.start_group('exec sleep 30')
+        runner = LocalRunner()
+        result = await KillEngine(grace_period=0, poll_interval=0.05).kill(runner, [group.pid])
+
+        self.assertEqual([group.pid], result.killed)
+        self.assertFalse(any('TERM' in command for command in runner.commands))
+
+    async def test_survivors_reported(self) -> None:
+        """Test processes surviving SIGKILL are reported with their state"""
+
+        runner = StuckRunner([100, 200])
+        result = await KillEngine(grace_period=0.1, kill_timeout=0.1, poll_interval=0.05).kill(runner, [100, 200, 300])
+
+        self.assertEqual([300], result.terminated)
+        self.assertEqual([], result.killed)
+        self.assertEqual({100: 'D', 200: 'D'}, result.survivors)
+        self.assertEqual([100, 200], result.surviving_pgids)
+        self.assertIn('pkill --signal KILL --pgroup 100,200', runner.commands)
+
+    async def test_missing_groups(self) -> None:
+        """Test process groups that no longer exist are not treated as errors"""
+
+        result = await KillEngine(grace_period=0.1).kill(LocalRunner(), [2 ** 22 + 1])
+        self.assertEqual([2 ** 22 + 1], result.terminated)
@@ -0,0 +1,61 @@
+"""Tests for the `local.LocalKillEngine` class"""
+
+import asyncio
+import subprocess
+from unittest import IsolatedAsyncioTestCase
+
+from shinigami.local import LocalKillEngine, read_process_states
+
+
+class ReadProcessStates(IsolatedAsyncioTestCase):
+    """Test running processes are read from `/proc`"""
+
+    async def test_group_members(self) -> None:
+        """Test all running members of a process group are returned"""
+
+        process = subprocess.Popen(['sh', '-c', 'sleep 30 & wait'], start_new_session=True)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        await asyncio.sleep(0.2)
+
+        alive = read_process_states({process.pid})
+        self.assertIn(process.pid, alive)
+        self.assertEqual(2, len(alive))
+        self.assertTrue(all(pgid == process.pid for pgid, _ in alive.values()))
+
+    def test_missing_group(self) -> None:
+        """Test an empty mapping is returned for process groups that do not exist"""
+
+        self.assertEqual({}, read_process_states({2 ** 22 + 1}))
+
+
+class SignalEscalation(IsolatedAsyncioTestCase):
+    """Test signals escalate from SIGTERM to SIGKILL without running subprocesses"""
+
+    def start_group(self, script: str) -> subprocess.Popen:
+        """Start a shell script as the leader of a new process group"""
+
+        process = subprocess.Popen(['sh', '-c', script], start_new_session=True)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        return process
+
+    async def test_escalation(self) -> None:
+        """Test groups ignoring SIGTERM are killed after the grace period"""
+
+        polite = self.start_group('exec sleep 30')
+        stubborn = self.start_group("trap '' TERM; sleep 30 & wait")
+        await asyncio.sleep(0.2)
+
+        engine = LocalKillEngine(grace_period=0.5, kill_timeout=1, poll_interval=0.05)
+        result = await engine.kill(None, [polite.pid, stubborn.pid])
+
+        self.assertEqual([polite.pid], result.terminated)
+        self.assertEqual([stubborn.pid], result.killed)
+        self.assertEqual({}, result.survivors)
+
+    async def test_missing_groups(self) -> None:
+        """Test process groups that no longer exist are not treated as errors"""
+
+        result = await LocalKillEngine(grace_period=0.1).kill(None, [2 ** 22 + 1])
+        self.assertEqual([2 ** 22 + 1], result.terminated)
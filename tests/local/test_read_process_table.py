@@ -0,0 +1,48 @@
+"""Tests for reading the local process table"""
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shinigami.local import ancestor_pgids, read_process_table
+from shinigami.process_table import ProcessTable
+
+
+class ReadProcessTable(TestCase):
+    """Test the process table is read from `/proc`"""
+
+    def test_current_process(self) -> None:
+        """Test the table includes the current process"""
+
+        table = read_process_table()
+        row = next(row for row in table.rows() if row['PID'] == os.getpid())
+        self.assertEqual(os.getppid(), row['PPID'])
+        self.assertEqual(os.getpgrp(), row['PGID'])
+        self.assertEqual(os.getuid(), row['UID'])
+
+    def test_empty_proc_root(self) -> None:
+        """Test an empty table is returned when no processes are listed"""
+
+        with TemporaryDirectory() as proc_root:
+            self.assertTrue(read_process_table(proc_root).empty)
+
+
+class AncestorPgids(TestCase):
+    """Test identification of the process groups protected from termination"""
+
+    def test_ancestors(self) -> None:
+        """Test the process groups of a process and its ancestors are returned"""
+
+        table = ProcessTable(
+            pid=[1, 10, 11, 12, 20],
+            ppid=[0, 1, 10, 11, 1],
+            pgid=[1, 10, 10, 12, 20],
+            uid=[0, 0, 0, 0, 0],
+            cmd=['init', 'sh', 'sh', 'shinigami', 'other'])
+
+        self.assertEqual({10, 12}, ancestor_pgids(table, 12))
+
+    def test_unknown_process(self) -> None:
+        """Test an empty set is returned for processes missing from the table"""
+
+        self.assertEqual(set(), ancestor_pgids(ProcessTable(), 12))
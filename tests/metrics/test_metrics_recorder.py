@@ -0,0 +1,89 @@
+"""Tests for the `metrics.MetricsRecorder` class"""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shinigami.metrics import MetricsRecorder, NodeMetrics
+
+
+class RecorderTestCase(TestCase):
+    """Base class that records an example sweep to temporary files"""
+
+    def setUp(self) -> None:
+        """Record metrics for two nodes and one cluster"""
+
+        self.tmp_dir = TemporaryDirectory()
+        self.jsonl_path = Path(self.tmp_dir.name) / 'metrics.jsonl'
+        self.prometheus_path = Path(self.tmp_dir.name) / 'shinigami.prom'
+        self.recorder = MetricsRecorder(self.jsonl_path, self.prometheus_path)
+
+        ok_node = NodeMetrics('node1', 'cluster1')
+        ok_node.timings['fetch'] = 1.5
+        ok_node.count('killed_pgids', 3)
+        ok_node.bytes_received = 1000
+
+        failed_node = NodeMetrics('node2', 'cluster1')
+        failed_node.timings['connect'] = 2
+        failed_node.error = 'Connection refused'
+
+        self.recorder.record_node(ok_node)
+        self.recorder.record_node(failed_node)
+        self.recorder.record_cluster('cluster1', 2, 5.0)
+        self.recorder.record_sweep(6.0, {'max_queue_depth': 2})
+
+    def tearDown(self) -> None:
+        """Delete temporary files"""
+
+        self.tmp_dir.cleanup()
+
+
+class JsonLinesOutput(RecorderTestCase):
+    """Test metrics are written as JSON lines"""
+
+    def test_record_types(self) -> None:
+        """Test a record is written for each node, cluster, and sweep"""
+
+        records = [json.loads(line) for line in self.jsonl_path.read_text().splitlines()]
+        self.assertEqual(['node', 'node', 'cluster', 'sweep'], [record['type'] for record in records])
+
+    def test_sweep_summary(self) -> None:
+        """Test the sweep record summarizes node results"""
+
+        sweep = json.loads(self.jsonl_path.read_text().splitlines()[-1])
+        self.assertEqual(2, sweep['nodes'])
+        self.assertEqual(1, sweep['failed_nodes'])
+        self.assertEqual({'max_queue_depth': 2}, sweep['scheduler'])
+
+
+class PrometheusOutput(RecorderTestCase):
+    """Test metrics are written in the Prometheus text format"""
+
+    def setUp(self) -> None:
+        """Parse the written Prometheus samples"""
+
+        super().setUp()
+        lines = self.prometheus_path.read_text().splitlines()
+        self.samples = dict(line.rsplit(' ', 1) for line in lines if not line.startswith('#'))
+
+    def test_sweep_samples(self) -> None:
+        """Test sweep level samples are written"""
+
+        self.assertEqual(6.0, float(self.samples['shinigami_sweep_duration_seconds']))
+        self.assertEqual(1, float(self.samples['shinigami_sweep_nodes{status="ok"}']))
+        self.assertEqual(1, float(self.samples['shinigami_sweep_nodes{status="error"}']))
+        self.assertEqual(3, float(self.samples['shinigami_sweep_terminated_process_groups']))
+        self.assertEqual(1000, float(self.samples['shinigami_sweep_bytes_received']))
+
+    def test_phase_samples(self) -> None:
+        """Test phase timings are summed over nodes"""
+
+        self.assertEqual(1.5, float(self.samples['shinigami_sweep_phase_seconds{phase="fetch"}']))
+        self.assertEqual(2, float(self.samples['shinigami_sweep_phase_seconds{phase="connect"}']))
+
+    def test_cluster_and_node_samples(self) -> None:
+        """Test per-cluster and per-node samples are written"""
+
+        self.assertEqual(5.0, float(self.samples['shinigami_cluster_duration_seconds{cluster="cluster1"}']))
+        self.assertIn('shinigami_node_duration_seconds{node="node2"}', self.samples)
@@ -0,0 +1,70 @@
+"""Tests for the `metrics.NodeMetrics` class"""
+
+import time
+from unittest import TestCase
+
+from shinigami.metrics import NodeMetrics
+
+
+class PhaseTimings(TestCase):
+    """Test the recording of per-phase timings"""
+
+    def test_phase_is_timed(self) -> None:
+        """Test the elapsed time is added to the phase"""
+
+        metrics = NodeMetrics('node1')
+        with metrics.phase('fetch'):
+            time.sleep(0.01)
+
+        self.assertGreaterEqual(metrics.timings['fetch'], 0.01)
+
+    def test_phase_is_cumulative(self) -> None:
+        """Test repeated phases are summed"""
+
+        metrics = NodeMetrics('node1')
+        with metrics.phase('fetch'):
+            time.sleep(0.01)
+
+        first = metrics.timings['fetch']
+        with metrics.phase('fetch'):
+            time.sleep(0.01)
+
+        self.assertGreater(metrics.timings['fetch'], first)
+
+    def test_phase_is_timed_on_error(self) -> None:
+        """Test the elapsed time is recorded when the phase raises an error"""
+
+        metrics = NodeMetrics('node1')
+        with self.assertRaises(RuntimeError), metrics.phase('connect'):
+            raise RuntimeError
+
+        self.assertIn('connect', metrics.timings)
+
+
+class Serialization(TestCase):
+    """Test the conversion of metrics to a dictionary"""
+
+    def test_as_dict(self) -> None:
+        """Test all collected values are included in the returned dictionary"""
+
+        metrics = NodeMetrics('node1', 'cluster1')
+        metrics.count('processes', 10)
+        metrics.bytes_received = 100
+        metrics.finish()
+
+        record = metrics.as_dict()
+        self.assertEqual('node', record['type'])
+        self.assertEqual('node1', record['node'])
+        self.assertEqual('cluster1', record['cluster'])
+        self.assertEqual({'processes': 10}, record['counts'])
+        self.assertEqual(100, record['bytes_received'])
+        self.assertIsNone(record['error'])
+
+    def test_duration_is_frozen(self) -> None:
+        """Test the duration stops increasing once metric collection is finished"""
+
+        metrics = NodeMetrics('node1')
+        metrics.finish()
+        duration = metrics.duration
+        time.sleep(0.01)
+        self.assertEqual(duration, metrics.duration)
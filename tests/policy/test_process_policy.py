@@ -0,0 +1,209 @@
+"""Tests for the `policy.ProcessPolicy` class"""
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from shinigami.jobs import ActiveJobSource, CgroupJobSource, SqueueJobSource
+from shinigami.metrics import NodeMetrics
+from shinigami.policy import PolicySet, ProcessPolicy, compile_patterns
+from shinigami.process_table import ProcessTable
+from shinigami.utils import exclude_active_slurm_users, filter_processes, include_orphaned_processes, include_user_whitelist
+
+TABLE = ProcessTable(
+    pid=[1, 2, 10, 11, 12, 13, 14],
+    ppid=[0, 1, 1, 1, 1, 1, 2],
+    pgid=[1, 2, 10, 11, 12, 13, 14],
+    uid=[0, 0, 1001, 1001, 1002, 1003, 1004],
+    cmd=['init', 'slurmd', 'python train.py', 'tmux', 'sleep 100', 'sshd', 'slurmstepd'],
+)
+
+
+class CompilePatterns(TestCase):
+    """Test regular expressions are combined into a single alternation"""
+
+    def test_alternation(self) -> None:
+        """Test strings matching any pattern are matched"""
+
+        pattern = compile_patterns(['^tmux', 'screen$'])
+        self.assertTrue(pattern.search('tmux new'))
+        self.assertTrue(pattern.search('/usr/bin/screen'))
+        self.assertFalse(pattern.search('python tmux'))
+
+    def test_no_patterns(self) -> None:
+        """Test `None` is returned when no patterns are given"""
+
+        self.assertIsNone(compile_patterns([]))
+
+
+class Select(TestCase):
+    """Test the selection of processes to terminate"""
+
+    def test_uid_whitelist(self) -> None:
+        """Test only orphaned processes owned by whitelisted users are selected"""
+
+        selected = ProcessPolicy([[1000, 1003]]).select(TABLE, {10, 11, 12, 13}, active_uids=[])
+        self.assertEqual([10, 11, 12], list(selected.pid))
+
+    def test_active_users(self) -> None:
+        """Test processes of users running jobs are not selected"""
+
+        selected = ProcessPolicy([[1000, 1003]]).select(TABLE, {10, 11, 12, 13}, active_uids=[1001])
+        self.assertEqual([12], list(selected.pid))
+
+    def test_allow_commands(self) -> None:
+        """Test processes with allowed commands are not selected"""
+
+        policy = ProcessPolicy([[1000, 1003]], allow_commands=['^tmux', '^sleep'])
+        self.assertEqual([10], list(policy.select(TABLE, {10, 11, 12}, active_uids=[]).pid))
+
+    def test_allowed_process_group(self) -> None:
+        """Test processes sharing a process group with an allowed command are not selected"""
+
+        table = ProcessTable(
+            pid=[1, 10, 11, 20], ppid=[0, 1, 10, 1], pgid=[1, 10, 10, 20], uid=[0, 1001, 1001, 1001],
+            cmd=['init', 'bash run.sh', 'tmux new-session', 'leaked'])
+
+        selected = ProcessPolicy([[1000, 1003]], allow_commands=['^tmux']).select(table, {10, 11, 20}, active_uids=[])
+        self.assertEqual([20], selected.unique_pgids())
+
+    def test_deny_commands(self) -> None:
+        """Test only processes with denied commands are selected when deny patterns are given"""
+
+        policy = ProcessPolicy([[1000, 1003]], allow_commands=['train'], deny_commands=['python', 'sleep'])
+        self.assertEqual([12], list(policy.select(TABLE, {10, 11, 12}, active_uids=[]).pid))
+
+    def test_metrics(self) -> None:
+        """Test the number of processes remaining after each rule is recorded"""
+
+        metrics = NodeMetrics('node')
+        policy = ProcessPolicy([[1000, 1003]], allow_commands=['^tmux'], deny_commands=['python'])
+        policy.select(TABLE, {10, 11, 12, 13}, active_uids=[1002], metrics=metrics)
+
+        self.assertEqual(6, metrics.counts['after_exclude_active_slurm_users'])
+        self.assertEqual(3, metrics.counts['after_include_orphaned_processes'])
+        self.assertEqual(2, metrics.counts['after_include_user_whitelist'])
+        self.assertEqual(1, metrics.counts['after_exclude_allowed_commands'])
+        self.assertEqual(1, metrics.counts['after_include_denied_commands'])
+
+    def test_matches_chained_filters(self) -> None:
+        """Test the default policy matches applying each filter function in turn"""
+
+        chained = include_user_whitelist(include_orphaned_processes(exclude_active_slurm_users(TABLE)), [[1000, 1004]])
+        selected = filter_processes(TABLE, [[1000, 1004]])
+        self.assertEqual(list(chained.pid), list(selected.pid))
+        self.assertEqual([10, 11, 12, 13], list(selected.pid))
+
+
+class ResourceThresholds(TestCase):
+    """Test the selection of processes by age and resource usage"""
+
+    def setUp(self) -> None:
+        """Define orphaned processes with varying resource usage"""
+
+        self.table = ProcessTable(
+            pid=[10, 11, 12, 13],
+            ppid=[1, 1, 1, 1],
+            pgid=[10, 11, 12, 13],
+            uid=[1001, 1001, 1001, 1001],
+            cmd=['idle', 'busy', 'large', 'young'],
+            pcpu=[0.0, 95.0, 0.5, 99.0],
+            rss=[1024, 2048, 8 * 1024 ** 2, 4096],
+            etime=[3600, 3600, 3600, 10],
+        )
+
+    def test_disabled_by_default(self) -> None:
+        """Test all orphaned processes are selected without thresholds"""
+
+        selected = ProcessPolicy([1001]).select(self.table, self.table.pid, active_uids=[])
+        self.assertEqual([10, 11, 12, 13], list(selected.pid))
+
+    def test_min_age(self) -> None:
+        """Test processes younger than the minimum age are not selected"""
+
+        selected = ProcessPolicy([1001], min_age=60).select(self.table, self.table.pid, active_uids=[])
+        self.assertEqual([10, 11, 12], list(selected.pid))
+
+    def test_cpu_or_memory(self) -> None:
+        """Test processes exceeding either resource threshold are selected"""
+
+        policy = ProcessPolicy([1001], min_cpu=50, min_rss=1024)
+        self.assertEqual([11, 12, 13], list(policy.select(self.table, self.table.pid, active_uids=[]).pid))
+
+        policy = ProcessPolicy([1001], min_cpu=50)
+        self.assertEqual([11, 13], list(policy.select(self.table, self.table.pid, active_uids=[]).pid))
+
+    def test_metrics(self) -> None:
+        """Test the processes remaining after the threshold rules are recorded"""
+
+        metrics = NodeMetrics('node')
+        ProcessPolicy([1001], min_age=60, min_rss=1024).select(self.table, self.table.pid, [], metrics)
+        self.assertEqual(3, metrics.counts['after_include_min_age'])
+        self.assertEqual(1, metrics.counts['after_include_resource_usage'])
+
+
+class DaemonSubtrees(TestCase):
+    """Test processes started by system daemons are not treated as orphans"""
+
+    def setUp(self) -> None:
+        """Define an SSH login session, a running batch job, and a leaked process"""
+
+        self.table = ProcessTable(
+            pid=[1, 50, 51, 52, 53, 60, 70, 71, 72, 80],
+            ppid=[0, 1, 50, 51, 52, 1, 1, 70, 71, 1],
+            pgid=[1, 50, 51, 52, 52, 60, 70, 71, 71, 80],
+            uid=[0, 0, 0, 1001, 1001, 0, 0, 1002, 1002, 1003],
+            cmd=[
+                'init', '/usr/sbin/sshd -D', 'sshd: alice [priv]', '-bash', 'vim notes.txt', '/usr/sbin/slurmd',
+                'slurmstepd: [123.batch]', '/bin/bash job.sh', 'python train.py', 'leaked'],
+        )
+
+    def test_login_session_not_selected(self) -> None:
+        """Test a live SSH login shell of a user without a job is not selected"""
+
+        self.assertEqual([80], list(filter_processes(self.table, [[1000, 60000]]).pid))
+
+    def test_stale_active_users(self) -> None:
+        """Test a running batch job is not selected when its owner is missing from the active users"""
+
+        self.assertEqual([80], list(filter_processes(self.table, [[1000, 60000]], active_uids=[]).pid))
+
+    def test_whitelisted_root(self) -> None:
+        """Test daemons owned by root are not selected when root is whitelisted"""
+
+        selected = filter_processes(self.table, [0, [1000, 60000]], active_uids=[])
+        self.assertEqual([80], list(selected.pid))
+
+
+class RootDaemons(IsolatedAsyncioTestCase):
+    """Test root owned daemons are never selected with the default whitelist of any job source"""
+
+    async def test_job_sources(self) -> None:
+        """Test the owner of `slurmd` is treated as an active user regardless of the job source"""
+
+        runner = MagicMock()
+        runner.run = AsyncMock(return_value=MagicMock(stdout='/sys/fs/cgroup/cpuset/slurm/uid_1001/job_5\n'))
+        table = ProcessTable(
+            pid=[1, 100, 200, 300],
+            ppid=[0, 1, 1, 1],
+            pgid=[1, 100, 200, 300],
+            uid=[0, 0, 0, 0],
+            cmd=['init', '/usr/sbin/sshd -D', '/usr/sbin/slurmd', 'leaked'],
+        )
+
+        for source in (ActiveJobSource(), SqueueJobSource({'c1': {1001}}), SqueueJobSource({}), CgroupJobSource()):
+            with self.subTest(source=type(source).__name__):
+                active_uids = await source.active_uids('c1', runner)
+                self.assertEqual([], list(filter_processes(table, [0], active_uids).pid))
+
+
+class ForCluster(TestCase):
+    """Test policies are selected by cluster name"""
+
+    def test_cluster_policy(self) -> None:
+        """Test configured clusters use their own policy and other clusters use the default"""
+
+        default, gpu = ProcessPolicy([0]), ProcessPolicy([1000])
+        policies = PolicySet(default, {'gpu': gpu})
+        self.assertIs(gpu, policies.for_cluster('gpu'))
+        self.assertIs(default, policies.for_cluster('smp'))
+        self.assertIs(default, policies.for_cluster(None))
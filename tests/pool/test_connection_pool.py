@@ -0,0 +1,153 @@
+"""Tests for the `pool.ConnectionPool` class"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from shinigami.pool import ConnectionPool
+
+
+class FakeConnection:
+    """Stand in for an `asyncssh.SSHClientConnection` instance"""
+
+    def __init__(self) -> None:
+        self.closed = asyncio.Event()
+
+    def close(self) -> None:
+        self.closed.set()
+
+    async def wait_closed(self) -> None:
+        await self.closed.wait()
+
+
+class PoolTestCase(IsolatedAsyncioTestCase):
+    """Base class that patches `asyncssh.connect` to return fake connections"""
+
+    async def asyncSetUp(self) -> None:
+        """Patch the SSH connect function"""
+
+        self.connect_patch = patch('asyncssh.connect', side_effect=lambda node, options: self.fake_connect(node))
+        self.connect = self.connect_patch.start()
+
+    async def asyncTearDown(self) -> None:
+        """Remove patches"""
+
+        self.connect_patch.stop()
+
+    async def fake_connect(self, node: str) -> FakeConnection:
+        """Return a new fake connection"""
+
+        return FakeConnection()
+
+
+class ConnectionReuse(PoolTestCase):
+    """Test connections are reused between requests"""
+
+    async def test_connection_is_reused(self) -> None:
+        """Test repeated requests for a node share one connection"""
+
+        pool = ConnectionPool()
+        async with pool.connection('node1') as first:
+            pass
+
+        async with pool.connection('node1') as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(1, self.connect.call_count)
+
+    async def test_closed_connection_is_replaced(self) -> None:
+        """Test connections closed by the remote host are removed from the pool"""
+
+        pool = ConnectionPool()
+        async with pool.connection('node1') as first:
+            pass
+
+        first.close()
+        await asyncio.sleep(0)
+        self.assertNotIn('node1', pool)
+
+        async with pool.connection('node1') as second:
+            self.assertIsNot(first, second)
+
+    async def test_disconnect_discards_connection(self) -> None:
+        """Test connections are discarded after a connection error"""
+
+        pool = ConnectionPool()
+        with self.assertRaises(ConnectionResetError):
+            async with pool.connection('node1'):
+                raise ConnectionResetError
+
+        self.assertNotIn('node1', pool)
+
+
+class Eviction(PoolTestCase):
+    """Test connections are evicted from the pool"""
+
+    async def test_idle_eviction(self) -> None:
+        """Test connections idle for longer than the timeout are closed"""
+
+        pool = ConnectionPool(idle_timeout=0)
+        async with pool.connection('node1') as conn:
+            self.assertEqual(0, pool.evict_idle())
+
+        self.assertEqual(1, pool.evict_idle())
+        self.assertTrue(conn.closed.is_set())
+        self.assertEqual(0, len(pool))
+
+    async def test_max_size(self) -> None:
+        """Test the least recently used connection is closed when the pool is full"""
+
+        pool = ConnectionPool(max_size=2)
+        for node in ('node1', 'node2', 'node1', 'node3'):
+            async with pool.connection(node):
+                pass
+
+        self.assertEqual(2, len(pool))
+        self.assertIn('node1', pool)
+        self.assertNotIn('node2', pool)
+
+    async def test_close(self) -> None:
+        """Test all connections are closed when the pool is closed"""
+
+        pool = ConnectionPool()
+        async with pool.connection('node1') as conn:
+            pass
+
+        await pool.close()
+        self.assertTrue(conn.closed.is_set())
+        self.assertEqual(0, len(pool))
+
+
+class ReconnectBackoff(PoolTestCase):
+    """Test failed connections are retried with exponential backoff"""
+
+    async def fake_connect(self, node: str) -> FakeConnection:
+        """Fail to connect to any node"""
+
+        raise OSError('Connection refused')
+
+    async def test_failure_delays_reconnect(self) -> None:
+        """Test requests fail fast while a node is backing off"""
+
+        pool = ConnectionPool(backoff_base=60)
+        with self.assertRaises(OSError):
+            async with pool.connection('node1'):
+                pass
+
+        with self.assertRaisesRegex(ConnectionError, 'Reconnect delayed'):
+            async with pool.connection('node1'):
+                pass
+
+        self.assertEqual(1, self.connect.call_count)
+
+    async def test_backoff_expires(self) -> None:
+        """Test a new connection attempt is made once the backoff expires"""
+
+        pool = ConnectionPool(backoff_base=0)
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                async with pool.connection('node1'):
+                    pass
+
+        self.assertEqual(2, self.connect.call_count)
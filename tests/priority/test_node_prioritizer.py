@@ -0,0 +1,74 @@
+"""Tests for the `priority.NodePrioritizer` class"""
+
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from shinigami.priority import NodePrioritizer, parse_sacct_output
+from shinigami.state import NodeStateStore
+
+
+class ParseSacctOutput(TestCase):
+    """Test the parsing of recently ended jobs"""
+
+    def test_hostlists_expanded(self) -> None:
+        """Test node lists are expanded and jobs without nodes are ignored"""
+
+        output = 'c[01-02]\nNone assigned\ngpu1\n'
+        self.assertEqual({'c01', 'c02', 'gpu1'}, parse_sacct_output(output))
+
+
+class Signals(TestCase):
+    """Test the signals observed for each node"""
+
+    def setUp(self) -> None:
+        """Create a prioritizer with one node per signal"""
+
+        store = NodeStateStore()
+        store.record('c3', 'fp', clean=False)
+        store.record('c4', 'fp', clean=True)
+        node_states = {'c1': 'mixed', 'c2': 'completing', 'c3': 'allocated', 'c4': 'idle', 'c5': 'idle*'}
+        self.prioritizer = NodePrioritizer({'c1'}, node_states, store)
+
+    def test_signals(self) -> None:
+        """Test ended jobs, completing nodes, orphans on the last visit, and idle nodes are identified"""
+
+        self.assertEqual(['ended'], self.prioritizer.signals('c1'))
+        self.assertEqual(['ended'], self.prioritizer.signals('c2'))
+        self.assertEqual(['orphans'], self.prioritizer.signals('c3'))
+        self.assertEqual(['idle'], self.prioritizer.signals('c4'))
+        self.assertEqual(['idle'], self.prioritizer.signals('c5'))
+        self.assertEqual([], self.prioritizer.signals('c6'))
+
+    def test_order(self) -> None:
+        """Test nodes are ordered by score with ties kept in their given order"""
+
+        ordered = self.prioritizer.order(['c6', 'c5', 'c4', 'c3', 'c2', 'c1'])
+        self.assertEqual(['c2', 'c1', 'c3', 'c5', 'c4', 'c6'], ordered)
+
+
+class Fetch(IsolatedAsyncioTestCase):
+    """Test prioritizers are built from Slurm accounting data"""
+
+    async def test_fetch(self) -> None:
+        """Test a single sacct call is made for all clusters"""
+
+        sub_proc = MagicMock()
+        sub_proc.communicate = AsyncMock(return_value=(b'c[1-2]\n', b''))
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=sub_proc)) as sacct:
+            prioritizer = await NodePrioritizer.fetch(['dev', 'prod'], window=600)
+
+        sacct.assert_awaited_once()
+        self.assertIn('dev,prod', sacct.call_args.args)
+        self.assertIn('now-600', sacct.call_args.args)
+        self.assertEqual({'c1', 'c2'}, prioritizer.recently_ended)
+
+    async def test_fetch_error(self) -> None:
+        """Test errors querying Slurm do not prevent prioritization"""
+
+        sub_proc = MagicMock()
+        sub_proc.communicate = AsyncMock(return_value=(b'', b'sacct: error: accounting storage is disabled'))
+        with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=sub_proc)):
+            prioritizer = await NodePrioritizer.fetch(nodes=['c1'])
+
+        self.assertEqual(set(), prioritizer.recently_ended)
+        self.assertEqual(['c2', 'c1'], prioritizer.order(['c2', 'c1']))
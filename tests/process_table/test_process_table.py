@@ -0,0 +1,113 @@
+"""Tests for the `process_table.ProcessTable` class"""
+
+from unittest import TestCase
+
+from shinigami.process_table import ProcessTable
+
+PS_OUTPUT = """\
+       PID       PPID       PGID        UID CMD
+         1          0          1          0 /sbin/init
+       200          1        200       1001 python script.py --flag
+       300          1        300       1002 bash
+"""
+
+PS_RESOURCE_OUTPUT = """\
+       PID       PPID       PGID        UID   %CPU          RSS      ELAPSED STAT   CMD
+         1          0          1          0    0.1        10012         2901 Ss     /sbin/init
+       200          1        200       1001   98.5      2048000          600 R      python train.py
+"""
+
+
+class Construction(TestCase):
+    """Test the construction of new tables"""
+
+    def test_mismatched_lengths(self) -> None:
+        """Test a `ValueError` is raised for columns with different lengths"""
+
+        with self.assertRaises(ValueError):
+            ProcessTable(pid=[1, 2], ppid=[0], pgid=[1], uid=[0], cmd=['init'])
+
+    def test_empty_table(self) -> None:
+        """Test a table without rows is empty"""
+
+        self.assertTrue(ProcessTable().empty)
+        self.assertEqual(0, len(ProcessTable()))
+
+
+class FromPsOutput(TestCase):
+    """Test the parsing of `ps` output"""
+
+    def setUp(self) -> None:
+        """Parse example ps output"""
+
+        self.table = ProcessTable.from_ps_output(PS_OUTPUT)
+
+    def test_numeric_columns(self) -> None:
+        """Test numeric columns are parsed as integers"""
+
+        self.assertEqual([1, 200, 300], list(self.table.pid))
+        self.assertEqual([0, 1, 1], list(self.table.ppid))
+        self.assertEqual([1, 200, 300], list(self.table.pgid))
+        self.assertEqual([0, 1001, 1002], list(self.table.uid))
+
+    def test_command_column(self) -> None:
+        """Test commands are parsed including their arguments"""
+
+        self.assertEqual(['/sbin/init', 'python script.py --flag', 'bash'], self.table.cmd)
+
+    def test_resource_columns(self) -> None:
+        """Test resource usage columns are parsed when included in the output"""
+
+        table = ProcessTable.from_ps_output(PS_RESOURCE_OUTPUT)
+        self.assertEqual([1, 200], list(table.pid))
+        self.assertEqual([0.1, 98.5], list(table.pcpu))
+        self.assertEqual([10012, 2048000], list(table.rss))
+        self.assertEqual([2901, 600], list(table.etime))
+        self.assertEqual(['Ss', 'R'], table.state)
+        self.assertEqual(['/sbin/init', 'python train.py'], table.cmd)
+
+    def test_missing_resource_columns(self) -> None:
+        """Test resource usage columns are zero filled when not included in the output"""
+
+        self.assertEqual([0, 0, 0], list(self.table.rss))
+        self.assertEqual(['', '', ''], self.table.state)
+
+    def test_header_only(self) -> None:
+        """Test output with only a header produces an empty table"""
+
+        self.assertTrue(ProcessTable.from_ps_output(PS_OUTPUT.splitlines()[0]).empty)
+
+
+class RowSelection(TestCase):
+    """Test the selection and iteration of table rows"""
+
+    def setUp(self) -> None:
+        """Create an example table"""
+
+        self.table = ProcessTable(pid=[1, 2, 3], ppid=[0, 1, 1], pgid=[1, 2, 2], uid=[0, 5, 5], cmd=['a', 'b', 'c'])
+
+    def test_filter(self) -> None:
+        """Test rows are selected by a boolean mask"""
+
+        expected = ProcessTable(pid=[2], ppid=[1], pgid=[2], uid=[5], cmd=['b'])
+        self.assertEqual(expected, self.table.filter([False, True, False]))
+
+    def test_column_access(self) -> None:
+        """Test columns are accessible by name"""
+
+        self.assertEqual([1, 2, 3], list(self.table['PID']))
+        with self.assertRaises(KeyError):
+            self.table['FAKE']
+
+    def test_rows(self) -> None:
+        """Test rows are returned as dictionaries"""
+
+        first_row = next(self.table.rows())
+        self.assertEqual(
+            {'PID': 1, 'PPID': 0, 'PGID': 1, 'UID': 0, 'CMD': 'a', 'PCPU': 0, 'RSS': 0, 'ETIME': 0, 'STATE': ''},
+            first_row)
+
+    def test_unique_pgids(self) -> None:
+        """Test unique process group IDs are returned in order"""
+
+        self.assertEqual([1, 2], self.table.unique_pgids())
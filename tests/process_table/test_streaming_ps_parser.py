@@ -0,0 +1,70 @@
+"""Tests for the `process_table.StreamingPsParser` class"""
+
+from unittest import TestCase
+
+from shinigami.process_table import ProcessTable, StreamingPsParser
+
+PS_OUTPUT = """\
+       PID       PPID       PGID        UID CMD
+         1          0          1          0 /sbin/init
+       200          1        200       1001 python script.py --flag
+       300        200        200       1001 bash
+"""
+
+
+class ChunkedInput(TestCase):
+    """Test output is parsed identically regardless of how it is chunked"""
+
+    def test_single_character_chunks(self) -> None:
+        """Test output fed one character at a time matches the fully buffered result"""
+
+        parser = StreamingPsParser()
+        for char in PS_OUTPUT:
+            parser.feed(char)
+
+        self.assertEqual(ProcessTable.from_ps_output(PS_OUTPUT), parser.close())
+
+    def test_missing_trailing_newline(self) -> None:
+        """Test the final line is parsed when output does not end with a newline"""
+
+        parser = StreamingPsParser()
+        parser.feed(PS_OUTPUT.rstrip('\n'))
+        table = parser.close()
+
+        self.assertEqual(3, len(table))
+        self.assertEqual('bash', table.cmd[-1])
+
+    def test_partial_line_is_buffered(self) -> None:
+        """Test an incomplete line is not parsed until it is terminated"""
+
+        parser = StreamingPsParser()
+        parser.feed(PS_OUTPUT.splitlines(keepends=True)[0])
+        parser.feed('         1          0')
+        self.assertEqual(0, len(parser.table))
+
+        parser.feed('          1          0 /sbin/init\n')
+        self.assertEqual([1], list(parser.table.pid))
+
+
+class KeepCommand(TestCase):
+    """Test the `keep_cmd` predicate controls which commands are stored"""
+
+    def test_rejected_commands_are_empty(self) -> None:
+        """Test commands are only kept for rows accepted by the predicate"""
+
+        parser = StreamingPsParser(keep_cmd=lambda pid, ppid, pgid, uid, cmd: ppid == 1)
+        parser.feed(PS_OUTPUT)
+        table = parser.close()
+
+        self.assertEqual(['', 'python script.py --flag', ''], table.cmd)
+
+    def test_numeric_columns_are_kept(self) -> None:
+        """Test numeric columns are kept for rows rejected by the predicate"""
+
+        parser = StreamingPsParser(keep_cmd=lambda *row: False)
+        parser.feed(PS_OUTPUT)
+        table = parser.close()
+
+        self.assertEqual([1, 200, 300], list(table.pid))
+        self.assertEqual([0, 1, 200], list(table.ppid))
+        self.assertEqual([0, 1001, 1001], list(table.uid))
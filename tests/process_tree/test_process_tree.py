@@ -0,0 +1,86 @@
+"""Tests for the `process_tree.ProcessTree` class"""
+
+from unittest import TestCase
+
+from shinigami.process_table import ProcessTable
+from shinigami.process_tree import ProcessTree
+
+# Columns are (pid, ppid, cmd)
+PROCESSES = [
+    (1, 0, '/sbin/init'),
+    (10, 1, '/usr/sbin/slurmd'),
+    (11, 10, 'slurmstepd'),
+    (20, 1, 'orphan'),
+    (21, 20, 'child in another group'),
+    (22, 21, 'grandchild'),
+    (30, 1, '/usr/lib/systemd/systemd --user'),
+    (31, 30, 'reparented to subreaper'),
+    (32, 31, 'child of reparented'),
+]
+
+
+class Relationships(TestCase):
+    """Test parent/child lookups"""
+
+    def setUp(self) -> None:
+        """Build a tree from example process data"""
+
+        pid, ppid, cmd = zip(*PROCESSES)
+        self.tree = ProcessTree(pid, ppid, cmd)
+
+    def test_children(self) -> None:
+        """Test child processes are indexed by parent"""
+
+        self.assertCountEqual([10, 20, 30], self.tree.children[1])
+        self.assertEqual([22], self.tree.children[21])
+
+    def test_ancestors(self) -> None:
+        """Test ancestors are returned from the parent up to the root"""
+
+        self.assertEqual([21, 20, 1, 0], self.tree.ancestors(22))
+        self.assertEqual([], self.tree.ancestors(999))
+
+    def test_ancestors_cycle(self) -> None:
+        """Test a cycle in the parent data does not loop forever"""
+
+        tree = ProcessTree([5, 6], [6, 5])
+        self.assertEqual([6], tree.ancestors(5))
+
+    def test_subtree(self) -> None:
+        """Test subtrees include the root and all descendants"""
+
+        self.assertEqual({20, 21, 22}, self.tree.subtree([20]))
+
+
+class Orphans(TestCase):
+    """Test the identification of orphaned processes"""
+
+    def test_orphans_include_descendants(self) -> None:
+        """Test descendants of orphans and subreaper children are orphaned"""
+
+        pid, ppid, cmd = zip(*PROCESSES)
+        tree = ProcessTree(pid, ppid, cmd)
+        self.assertEqual({10, 11, 20, 21, 22, 30, 31, 32}, tree.orphaned())
+
+    def test_candidates(self) -> None:
+        """Test subtrees only start from and descend through candidate processes"""
+
+        pid, ppid, cmd = zip(*PROCESSES)
+        tree = ProcessTree(pid, ppid, cmd)
+        self.assertEqual({20, 21, 31}, tree.orphaned({11, 20, 21, 31}))
+        self.assertEqual([20, 31], sorted(tree.orphan_roots({11, 20, 31})))
+        self.assertEqual({20, 30, 31}, tree.orphaned({20, 21, 30, 31}, leaves={20, 30}))
+
+    def test_subreapers_require_commands(self) -> None:
+        """Test subreapers are not identified without command data"""
+
+        pid, ppid, _ = zip(*PROCESSES)
+        tree = ProcessTree(pid, ppid)
+        self.assertEqual([10, 20, 30], sorted(tree.orphan_roots()))
+
+    def test_from_table(self) -> None:
+        """Test trees built from a table identify subreapers"""
+
+        pid, ppid, cmd = zip(*PROCESSES)
+        table = ProcessTable(pid=pid, ppid=ppid, pgid=pid, uid=[0] * len(pid), cmd=cmd)
+        self.assertIn(31, ProcessTree.from_table(table).orphan_roots())
@@ -0,0 +1,80 @@
+"""Tests for the `report.ResultWriter` class and the `open_report` function"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from shinigami.report import NodeResult, ResultWriter, open_report
+
+
+class NDJSONFormat(TestCase):
+    """Test results written as newline delimited JSON"""
+
+    def test_one_object_per_line(self) -> None:
+        """Test each result is written as a single JSON object"""
+
+        stream = io.StringIO()
+        writer = ResultWriter(stream, 'ndjson')
+        writer.write(NodeResult('node1', 'c1', 'terminated', pids=[10, 11], pgids=[10]))
+        writer.write(NodeResult('node2', 'c1', 'error', error='timeout'))
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual([10, 11], json.loads(lines[0])['pids'])
+        self.assertEqual('timeout', json.loads(lines[1])['error'])
+
+
+class CSVFormat(TestCase):
+    """Test results written as CSV"""
+
+    def test_header_and_rows(self) -> None:
+        """Test a header row is written followed by one row per result"""
+
+        stream = io.StringIO()
+        ResultWriter(stream, 'csv').write(NodeResult('node1', 'c1', 'marked', pids=[10, 11], pgids=[10]))
+
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(1, len(rows))
+        self.assertEqual('10 11', rows[0]['pids'])
+        self.assertEqual('marked', rows[0]['status'])
+
+    def test_resource_columns(self) -> None:
+        """Test the resources held by marked processes are included"""
+
+        stream = io.StringIO()
+        ResultWriter(stream, 'csv').write(NodeResult('node1', 'c1', 'marked', pids=[10], pgids=[10], cpu=12.5, rss=2048))
+
+        row = next(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(('12.5', '2048'), (row['cpu'], row['rss']))
+
+    def test_invalid_format(self) -> None:
+        """Test a `ValueError` is raised for unknown formats"""
+
+        with self.assertRaises(ValueError):
+            ResultWriter(io.StringIO(), 'xml')
+
+
+class OpenReport(TestCase):
+    """Test opening report files"""
+
+    def test_disabled(self) -> None:
+        """Test no writer is returned without a path"""
+
+        with open_report(None) as writer:
+            self.assertIsNone(writer)
+
+    def test_header_written_once(self) -> None:
+        """Test appending to an existing CSV report does not repeat the header"""
+
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'report.csv'
+            for node in ('node1', 'node2'):
+                with open_report(path, 'csv') as writer:
+                    writer.write(NodeResult(node, None, 'clean'))
+
+            lines = path.read_text().splitlines()
+            self.assertEqual(3, len(lines))
+            self.assertTrue(lines[0].startswith('node,'))
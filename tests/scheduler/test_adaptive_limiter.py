@@ -0,0 +1,114 @@
+"""Tests for the `scheduler.AdaptiveLimiter` class"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from shinigami.scheduler import AdaptiveLimiter, Scheduler
+from tests.scheduler.test_scheduler import ConcurrencyTracker
+
+
+class Bounds(TestCase):
+    """Test the limit stays within the configured bounds"""
+
+    def test_invalid_bounds(self) -> None:
+        """Test a `ValueError` is raised for invalid bounds"""
+
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(0, 10)
+
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(5, 4)
+
+    def test_starts_at_minimum(self) -> None:
+        """Test the limit starts at the lower bound"""
+
+        self.assertEqual(2, AdaptiveLimiter(2, 10).limit)
+
+    def test_increase_capped_at_maximum(self) -> None:
+        """Test the limit never exceeds the upper bound"""
+
+        limiter = AdaptiveLimiter(1, 4)
+        for _ in range(10):
+            limiter.record_success(0.1)
+
+        self.assertEqual(4, limiter.limit)
+
+    def test_decrease_capped_at_minimum(self) -> None:
+        """Test the limit never drops below the lower bound"""
+
+        limiter = AdaptiveLimiter(2, 10, cooldown=0)
+        for _ in range(10):
+            limiter.record_failure(ConnectionRefusedError())
+
+        self.assertEqual(2, limiter.limit)
+
+
+class Signals(TestCase):
+    """Test the limit responds to congestion signals"""
+
+    def setUp(self) -> None:
+        """Grow a limiter to its upper bound"""
+
+        self.limiter = AdaptiveLimiter(1, 16, cooldown=0)
+        for _ in range(20):
+            self.limiter.record_success(0.1)
+
+    def test_congestion_error_halves_limit(self) -> None:
+        """Test timeouts halve the limit"""
+
+        self.limiter.record_failure(asyncio.TimeoutError())
+        self.assertEqual(8, self.limiter.limit)
+
+    def test_other_errors_are_ignored(self) -> None:
+        """Test errors unrelated to congestion leave the limit unchanged"""
+
+        self.limiter.record_failure(RuntimeError('ps exited with status 1'))
+        self.assertEqual(16, self.limiter.limit)
+
+    def test_high_latency_reduces_limit(self) -> None:
+        """Test latency above the tolerance and floor reduces the limit"""
+
+        self.limiter.record_success(2.0)
+        self.assertEqual(8, self.limiter.limit)
+
+    def test_latency_below_floor_is_healthy(self) -> None:
+        """Test small absolute latencies are never treated as congestion"""
+
+        self.limiter.record_success(0.001)
+        self.limiter.record_success(0.5)
+        self.assertEqual(16, self.limiter.limit)
+
+    def test_additive_increase_after_congestion(self) -> None:
+        """Test the limit grows by one per round of jobs after a decrease"""
+
+        self.limiter.record_failure(ConnectionResetError())
+        for _ in range(9):
+            self.limiter.record_success(0.1)
+
+        self.assertEqual(9, self.limiter.limit)
+
+    def test_cooldown(self) -> None:
+        """Test a burst of failures only decreases the limit once"""
+
+        limiter = AdaptiveLimiter(1, 16, cooldown=60)
+        for _ in range(20):
+            limiter.record_success(0.1)
+
+        for _ in range(5):
+            limiter.record_failure(ConnectionRefusedError())
+
+        self.assertEqual(8, limiter.limit)
+
+
+class SchedulerIntegration(IsolatedAsyncioTestCase):
+    """Test the scheduler respects the adaptive limit"""
+
+    async def test_limit_caps_running_jobs(self) -> None:
+        """Test no more jobs run than the current adaptive limit"""
+
+        scheduler = Scheduler(10, limiter=AdaptiveLimiter(3, 3))
+        tracker = ConcurrencyTracker()
+        await scheduler.map([f'node{i}' for i in range(12)], tracker)
+
+        self.assertEqual(3, tracker.peak)
+        self.assertEqual(3, scheduler.stats.max_running)
@@ -0,0 +1,126 @@
+"""Tests for the `scheduler.RetryPolicy` class and scheduler deadlines"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from shinigami.scheduler import RetryPolicy, Scheduler
+
+
+class FlakyJob:
+    """Coroutine factory that fails a fixed number of times before succeeding"""
+
+    def __init__(self, failures: int, error: Exception) -> None:
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, node: str) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+
+        return node
+
+
+class Policy(TestCase):
+    """Test retry decisions and delays"""
+
+    def test_invalid_attempts(self) -> None:
+        """Test a `ValueError` is raised for fewer than one attempt"""
+
+        with self.assertRaises(ValueError):
+            RetryPolicy(0)
+
+    def test_should_retry(self) -> None:
+        """Test only network errors are retried within the attempt limit"""
+
+        policy = RetryPolicy(attempts=2)
+        self.assertTrue(policy.should_retry(ConnectionRefusedError(), 1))
+        self.assertFalse(policy.should_retry(ConnectionRefusedError(), 2))
+        self.assertFalse(policy.should_retry(RuntimeError(), 1))
+
+    def test_delay_bounds(self) -> None:
+        """Test delays are jittered between zero and the capped exponential bound"""
+
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+        for attempt, bound in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            for _ in range(20):
+                self.assertTrue(0 <= policy.delay(attempt) <= bound)
+
+
+class Retries(IsolatedAsyncioTestCase):
+    """Test the scheduler retries failed jobs"""
+
+    async def test_transient_failure_is_retried(self) -> None:
+        """Test a job succeeds after transient failures"""
+
+        scheduler = Scheduler(1, retry=RetryPolicy(3, backoff_base=0.001))
+        job = FlakyJob(2, ConnectionResetError())
+
+        self.assertEqual('node', await scheduler.submit('node', job))
+        self.assertEqual(3, job.calls)
+        self.assertEqual(2, scheduler.stats.retries)
+
+    async def test_attempts_exhausted(self) -> None:
+        """Test the last error is raised once all attempts fail"""
+
+        scheduler = Scheduler(1, retry=RetryPolicy(2, backoff_base=0.001))
+        job = FlakyJob(5, ConnectionResetError())
+
+        with self.assertRaises(ConnectionResetError):
+            await scheduler.submit('node', job)
+
+        self.assertEqual(2, job.calls)
+
+    async def test_permanent_failure_not_retried(self) -> None:
+        """Test errors that are not network errors fail immediately"""
+
+        scheduler = Scheduler(1, retry=RetryPolicy(3, backoff_base=0.001))
+        job = FlakyJob(1, RuntimeError('ps failed'))
+
+        with self.assertRaises(RuntimeError):
+            await scheduler.submit('node', job)
+
+        self.assertEqual(1, job.calls)
+
+
+class Deadline(IsolatedAsyncioTestCase):
+    """Test jobs fail once the scheduler deadline passes"""
+
+    async def test_running_job_is_cancelled(self) -> None:
+        """Test a job still running at the deadline fails"""
+
+        async def slow_job(node: str) -> None:
+            await asyncio.sleep(10)
+
+        scheduler = Scheduler(1, deadline=0.05)
+        with self.assertRaisesRegex(RuntimeError, 'deadline'):
+            await scheduler.submit('node', slow_job)
+
+    async def test_queued_jobs_fail(self) -> None:
+        """Test queued jobs fail without running after the deadline"""
+
+        started = []
+
+        async def slow_job(node: str) -> None:
+            started.append(node)
+            await asyncio.sleep(10)
+
+        scheduler = Scheduler(1, deadline=0.05)
+        results = await scheduler.map(['a', 'b'], slow_job)
+
+        self.assertEqual(1, len(started))
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results.values()))
+        self.assertEqual(2, scheduler.stats.deadline_exceeded)
+
+    async def test_no_retry_past_deadline(self) -> None:
+        """Test retries are not scheduled when they would start after the deadline"""
+
+        scheduler = Scheduler(1, retry=RetryPolicy(5, backoff_base=10, backoff_max=10), deadline=0.5)
+        scheduler.retry.delay = lambda attempt: 10
+        job = FlakyJob(5, ConnectionResetError())
+
+        with self.assertRaises(ConnectionResetError):
+            await scheduler.submit('node', job)
+
+        self.assertEqual(1, job.calls)
@@ -0,0 +1,197 @@
+"""Tests for the `scheduler.Scheduler` class"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from shinigami.scheduler import Scheduler, SchedulerStats
+
+
+class ConcurrencyTracker:
+    """Coroutine factory that records the peak number of concurrent calls"""
+
+    def __init__(self, scheduler: Scheduler = None) -> None:
+        self.scheduler = scheduler
+        self.running = dict()
+        self.peak = 0
+        self.group_peak = dict()
+
+    async def __call__(self, node: str) -> str:
+        group = self.scheduler.group_of(node) if self.scheduler else None
+        self.running[group] = self.running.get(group, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.group_peak[group] = max(self.group_peak.get(group, 0), self.running[group])
+        await asyncio.sleep(0.01)
+        self.running[group] -= 1
+        return node
+
+
+class GroupNames(TestCase):
+    """Test the derivation of node groups from node names"""
+
+    def test_no_pattern(self) -> None:
+        """Test nodes have no group when no pattern is defined"""
+
+        self.assertIsNone(Scheduler(1).group_of('rack1-node1'))
+
+    def test_capture_group(self) -> None:
+        """Test the first capture group is used as the group name"""
+
+        scheduler = Scheduler(1, group_pattern=r'^(rack\d+)-')
+        self.assertEqual('rack1', scheduler.group_of('rack1-node1'))
+
+    def test_full_match(self) -> None:
+        """Test the full match is used when the pattern has no capture groups"""
+
+        scheduler = Scheduler(1, group_pattern=r'rack\d+')
+        self.assertEqual('rack12', scheduler.group_of('rack12-node1'))
+
+    def test_unmatched_node(self) -> None:
+        """Test nodes not matching the pattern have no group"""
+
+        scheduler = Scheduler(1, group_pattern=r'rack\d+')
+        self.assertIsNone(scheduler.group_of('gpu-node1'))
+
+    def test_invalid_limits(self) -> None:
+        """Test a `ValueError` is raised for non-positive limits"""
+
+        with self.assertRaises(ValueError):
+            Scheduler(0)
+
+        with self.assertRaises(ValueError):
+            Scheduler(1, group_limit=0)
+
+
+class ConcurrencyLimits(IsolatedAsyncioTestCase):
+    """Test jobs are executed within the configured connection budget"""
+
+    async def test_global_limit(self) -> None:
+        """Test the number of concurrent jobs never exceeds `max_concurrent`"""
+
+        tracker = ConcurrencyTracker()
+        scheduler = Scheduler(3)
+        nodes = [f'node{i}' for i in range(20)]
+
+        results = await scheduler.map(nodes, tracker)
+        self.assertEqual(dict(zip(nodes, nodes)), results)
+        self.assertEqual(3, tracker.peak)
+
+    async def test_limit_shared_across_calls(self) -> None:
+        """Test concurrent calls to `map` share a single connection budget"""
+
+        tracker = ConcurrencyTracker()
+        scheduler = Scheduler(2)
+        await asyncio.gather(
+            scheduler.map([f'a{i}' for i in range(10)], tracker),
+            scheduler.map([f'b{i}' for i in range(10)], tracker))
+
+        self.assertEqual(2, tracker.peak)
+
+    async def test_group_limit(self) -> None:
+        """Test the number of concurrent jobs per group never exceeds `group_limit`"""
+
+        scheduler = Scheduler(10, group_limit=2, group_pattern=r'^(rack\d)')
+        tracker = ConcurrencyTracker(scheduler)
+        nodes = [f'rack{r}-node{n}' for r in range(3) for n in range(10)]
+
+        await scheduler.map(nodes, tracker)
+        self.assertEqual({'rack0': 2, 'rack1': 2, 'rack2': 2}, tracker.group_peak)
+        self.assertEqual(6, tracker.peak)
+
+    async def test_exceptions_returned(self) -> None:
+        """Test exceptions raised by a job are returned as results"""
+
+        async def fail(node: str) -> None:
+            raise RuntimeError(node)
+
+        results = await Scheduler(2).map(['node1', 'node2'], fail)
+        self.assertIsInstance(results['node1'], RuntimeError)
+        self.assertIsInstance(results['node2'], RuntimeError)
+
+
+class Statistics(IsolatedAsyncioTestCase):
+    """Test the collection of queueing statistics"""
+
+    async def test_job_counts(self) -> None:
+        """Test submitted and completed jobs are counted"""
+
+        scheduler = Scheduler(2)
+        await scheduler.map([f'node{i}' for i in range(5)], ConcurrencyTracker())
+
+        stats = scheduler.stats.as_dict()
+        self.assertEqual(5, stats['submitted'])
+        self.assertEqual(5, stats['completed'])
+        self.assertEqual(5, stats['max_queue_depth'])
+        self.assertEqual(0, scheduler.queue_depth)
+
+    async def test_wait_times(self) -> None:
+        """Test queued jobs record the time spent waiting for a worker"""
+
+        scheduler = Scheduler(1)
+        await scheduler.map(['node1', 'node2'], ConcurrencyTracker())
+
+        stats = scheduler.stats.as_dict()
+        self.assertEqual(2, len(scheduler.stats.wait_times))
+        self.assertGreater(stats['wait_max'], 0)
+
+
+class MergedStatistics(TestCase):
+    """Test the aggregation of statistics from multiple schedulers"""
+
+    def test_merge(self) -> None:
+        """Test counts are summed and wait times are combined"""
+
+        first, second = SchedulerStats(), SchedulerStats()
+        first.submitted, first.max_queue_depth, first.wait_times = 2, 5, [0.1, 0.2]
+        second.submitted, second.max_queue_depth, second.wait_times = 3, 4, [0.3]
+
+        first.merge(second)
+        self.assertEqual(5, first.submitted)
+        self.assertEqual(5, first.max_queue_depth)
+        self.assertEqual(0.3, first.as_dict()['wait_max'])
+
+
+class QueueFairness(IsolatedAsyncioTestCase):
+    """Test workers are shared fairly between named queues"""
+
+    async def test_round_robin(self) -> None:
+        """Test jobs are taken from each queue in turn"""
+
+        order = []
+
+        async def record(node: str) -> None:
+            order.append(node)
+
+        scheduler = Scheduler(1)
+        await asyncio.gather(
+            scheduler.map([f'big{i}' for i in range(6)], record, queue='big'),
+            scheduler.map(['small0', 'small1'], record, queue='small'))
+
+        # The small queue is fully served before the large queue is halfway done
+        self.assertLess(order.index('small1'), order.index('big3'))
+        self.assertEqual(8, len(order))
+
+
+class AsCompleted(IsolatedAsyncioTestCase):
+    """Test results are yielded in order of completion"""
+
+    async def test_completion_order(self) -> None:
+        """Test fast jobs are yielded before slow ones"""
+
+        async def job(node: str) -> str:
+            await asyncio.sleep(0.03 if node == 'slow' else 0)
+            return node.upper()
+
+        scheduler = Scheduler(max_concurrent=2)
+        results = [result async for result in scheduler.as_completed(['slow', 'fast'], job)]
+        self.assertEqual([('fast', 'FAST'), ('slow', 'SLOW')], results)
+
+    async def test_exceptions_yielded(self) -> None:
+        """Test exceptions are yielded in place of results"""
+
+        async def job(node: str) -> str:
+            raise ValueError(node)
+
+        scheduler = Scheduler(max_concurrent=1)
+        results = [result async for result in scheduler.as_completed(['node1'], job)]
+        self.assertEqual('node1', results[0][0])
+        self.assertIsInstance(results[0][1], ValueError)
@@ -0,0 +1,108 @@
+"""Tests for the `session.RemoteShell` class"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from shinigami.session import RemoteShell
+
+
+class LocalReader:
+    """Text based wrapper around an `asyncio.StreamReader` mimicking `asyncssh.SSHReader`"""
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        self._reader = reader
+
+    async def readline(self) -> str:
+        return (await self._reader.readline()).decode()
+
+    async def readuntil(self, separator: str) -> str:
+        return (await self._reader.readuntil(separator.encode())).decode()
+
+
+class LocalWriter:
+    """Text based wrapper around an `asyncio.StreamWriter` mimicking `asyncssh.SSHWriter`"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+
+    def write(self, data: str) -> None:
+        self._writer.write(data.encode())
+
+    def write_eof(self) -> None:
+        self._writer.write_eof()
+
+
+class LocalProcess:
+    """Local shell process mimicking an `asyncssh.SSHClientProcess`"""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self._process = process
+        self.stdin = LocalWriter(process.stdin)
+        self.stdout = LocalReader(process.stdout)
+        self.stderr = LocalReader(process.stderr)
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
+        await self._process.wait()
+
+
+class RunCommands(IsolatedAsyncioTestCase):
+    """Test commands are executed in a single shell process"""
+
+    async def asyncSetUp(self) -> None:
+        """Start a local shell"""
+
+        process = await asyncio.create_subprocess_exec(
+            'sh', stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+        self.shell = RemoteShell(LocalProcess(process))
+
+    async def asyncTearDown(self) -> None:
+        """Exit the local shell"""
+
+        await self.shell.close()
+
+    async def test_stdout_and_exit_status(self) -> None:
+        """Test command output and exit status are returned"""
+
+        result = await self.shell.run('echo hello')
+        self.assertEqual('hello\n', result.stdout)
+        self.assertEqual(0, result.exit_status)
+
+        failed = await self.shell.run('echo oops >&2; exit_status_test() { return 3; }; exit_status_test')
+        self.assertEqual('oops\n', failed.stderr)
+        self.assertEqual(3, failed.exit_status)
+
+    async def test_output_without_trailing_newline(self) -> None:
+        """Test output is returned unmodified when it does not end with a newline"""
+
+        result = await self.shell.run("printf 'no newline'")
+        self.assertEqual('no newline', result.stdout)
+
+    async def test_check(self) -> None:
+        """Test an error is raised for nonzero exit codes when `check` is enabled"""
+
+        with self.assertRaisesRegex(RuntimeError, 'exited with status 1'):
+            await self.shell.run('false', check=True)
+
+    async def test_input(self) -> None:
+        """Test input is passed to the command stdin without shell expansion"""
+
+        result = await self.shell.run('cat', input='$HOME `date`\nline two\n')
+        self.assertEqual('$HOME `date`\nline two\n', result.stdout)
+
+    async def test_shell_state_persists(self) -> None:
+        """Test consecutive commands run in the same shell"""
+
+        await self.shell.run('cd /tmp')
+        result = await self.shell.run('pwd')
+        self.assertEqual('/tmp\n', result.stdout)
+
+    async def test_pipelined_commands(self) -> None:
+        """Test multiple commands return results in order"""
+
+        results = await self.shell.run_pipelined(['echo one', 'false', 'echo three'])
+        self.assertEqual(['one\n', '', 'three\n'], [result.stdout for result in results])
+        self.assertEqual([0, 1, 0], [result.exit_status for result in results])
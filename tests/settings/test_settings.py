@@ -0,0 +1,100 @@
+"""Tests for the `settings.Settings` class"""
+
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from shinigami.intervals import IntervalSet
+from shinigami.settings import FilterRules, Settings
+
+
+class FromFile(TestCase):
+    """Test settings are loaded from JSON files"""
+
+    def test_load(self) -> None:
+        """Test default and cluster rules are parsed"""
+
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'settings.json'
+            path.write_text(json.dumps({
+                'defaults': {'uid_whitelist': [[1000, 2000]], 'allow_commands': ['^tmux']},
+                'clusters': {'gpu': {'deny_commands': ['python']}},
+            }))
+
+            settings = Settings.from_file(path)
+
+        self.assertEqual([[1000, 2000]], settings.defaults.uid_whitelist)
+        self.assertEqual(['python'], settings.clusters['gpu'].deny_commands)
+
+    def test_invalid_pattern(self) -> None:
+        """Test invalid regular expressions are rejected"""
+
+        with self.assertRaises(ValidationError):
+            FilterRules(allow_commands=['(unclosed'])
+
+    def test_unknown_fields(self) -> None:
+        """Test misspelled top level fields are rejected"""
+
+        with self.assertRaises(ValidationError):
+            Settings(default={})
+
+    def test_environment(self) -> None:
+        """Test values can be provided by environment variables"""
+
+        with patch.dict(os.environ, {'SHINIGAMI_DEFAULTS__ALLOW_COMMANDS': '["^screen"]'}):
+            self.assertEqual(['^screen'], Settings().defaults.allow_commands)
+
+
+class Compile(TestCase):
+    """Test settings are compiled into process policies"""
+
+    def test_cluster_overrides(self) -> None:
+        """Test cluster rules only override the values they set"""
+
+        settings = Settings(
+            defaults=FilterRules(uid_whitelist=[[1000, 2000]], allow_commands=['^tmux']),
+            clusters={'gpu': FilterRules(uid_exclude=[1500])})
+
+        policies = settings.compile([0])
+        gpu = policies.for_cluster('gpu')
+        self.assertEqual(IntervalSet([[1000, 2000]], exclude=[1500]), gpu.uid_whitelist)
+        self.assertTrue(gpu.allow_commands.search('tmux'))
+        self.assertEqual(IntervalSet([[1000, 2000]]), policies.default.uid_whitelist)
+
+    def test_thresholds(self) -> None:
+        """Test resource thresholds fall back to the command line values when not defined"""
+
+        settings = Settings(defaults=FilterRules(min_age=60), clusters={'gpu': FilterRules(min_rss=4096)})
+        policies = settings.compile([0], min_age=0, min_cpu=50, min_rss=None)
+
+        self.assertEqual((60, 50, None), (policies.default.min_age, policies.default.min_cpu, policies.default.min_rss))
+        gpu = policies.for_cluster('gpu')
+        self.assertEqual((60, 50, 4096), (gpu.min_age, gpu.min_cpu, gpu.min_rss))
+
+    def test_negative_threshold(self) -> None:
+        """Test negative thresholds are rejected"""
+
+        with self.assertRaises(ValidationError):
+            FilterRules(min_cpu=-1)
+
+    def test_command_line_whitelist(self) -> None:
+        """Test the command line whitelist is used when the rules do not define one"""
+
+        policies = Settings(defaults=FilterRules(uid_exclude=[1001])).compile(IntervalSet([[1000, 1003]]))
+        self.assertEqual(IntervalSet([1000, 1002]), policies.default.uid_whitelist)
+
+    def test_command_line_exclusions(self) -> None:
+        """Test command line exclusions also apply to whitelists defined by the rules"""
+
+        settings = Settings(
+            defaults=FilterRules(uid_whitelist=[[1000, 1004]]),
+            clusters={'gpu': FilterRules(uid_whitelist=[[2000, 2003]], uid_exclude=[2001])})
+
+        policies = settings.compile(IntervalSet([0]), uid_exclude=[1002, 2002])
+        self.assertEqual(IntervalSet([1000, 1001, 1003]), policies.default.uid_whitelist)
+        self.assertEqual(IntervalSet([2000]), policies.for_cluster('gpu').uid_whitelist)
@@ -0,0 +1,170 @@
+"""Tests for the `state.NodeStateStore` class"""
+
+import shutil
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, TestCase, skipUnless
+
+from shinigami.state import FINGERPRINT_COMMAND, NodeStateStore, parse_fingerprint
+from shinigami.transport import LocalRunner
+
+BOOT_ID = 'f1d3c0de-0000-4000-8000-000000000000'
+FINGERPRINT_OUTPUT = f"""\
+{BOOT_ID}
+probe 900
+probe 850
+  812 Sat Oct 17 08:00:00 2026
+  850 Sat Oct 17 09:30:00 2026
+ 1200 Sat Oct 17 09:00:00 2026
+"""
+
+
+class ParseFingerprint(TestCase):
+    """Test the parsing of node fingerprints"""
+
+    def test_boot_id(self) -> None:
+        """Test the fingerprint starts with the boot ID"""
+
+        self.assertTrue(parse_fingerprint(FINGERPRINT_OUTPUT).startswith(f'{BOOT_ID}:'))
+
+    def test_probe_processes_ignored(self) -> None:
+        """Test processes started by the probe do not change the fingerprint"""
+
+        without_probe = FINGERPRINT_OUTPUT.replace('  850 Sat Oct 17 09:30:00 2026\n', '')
+        self.assertEqual(parse_fingerprint(FINGERPRINT_OUTPUT), parse_fingerprint(without_probe))
+
+    def test_new_orphan(self) -> None:
+        """Test a newly orphaned process changes the fingerprint"""
+
+        orphaned = FINGERPRINT_OUTPUT + ' 1300 Sat Oct 17 09:45:00 2026\n'
+        self.assertNotEqual(parse_fingerprint(FINGERPRINT_OUTPUT), parse_fingerprint(orphaned))
+
+
+@skipUnless(sys.platform.startswith('linux') and shutil.which('ps'), 'Requires the Linux proc filesystem and procps')
+class ProbeLocalMachine(IsolatedAsyncioTestCase):
+    """Test the fingerprint command against the local machine"""
+
+    async def test_repeated_probes(self) -> None:
+        """Test probing the same machine twice returns the same fingerprint
+
+        Unrelated processes may start or exit between two probes on a busy
+        machine, so a few attempts are allowed. A fingerprint that includes
+        the processes of the probe itself never matches.
+        """
+
+        runner = LocalRunner()
+        fingerprints = []
+        for _ in range(5):
+            fingerprints.append(parse_fingerprint((await runner.run(FINGERPRINT_COMMAND, check=True)).stdout))
+            if fingerprints[-2:-1] == fingerprints[-1:]:
+                break
+
+        self.assertEqual(fingerprints[-2], fingerprints[-1])
+
+
+class Backoff(TestCase):
+    """Test the revisit schedule of clean nodes"""
+
+    def setUp(self) -> None:
+        """Create an in-memory store"""
+
+        self.store = NodeStateStore(backoff_base=10, backoff_max=35)
+
+    def test_unknown_nodes_are_due(self) -> None:
+        """Test nodes without history are always visited"""
+
+        self.assertTrue(self.store.is_due('c1'))
+        self.assertFalse(self.store.is_unchanged('c1', 'fp'))
+
+    def test_clean_scans_back_off(self) -> None:
+        """Test consecutive clean scans double the revisit delay up to the maximum"""
+
+        delays = []
+        for _ in range(4):
+            self.store.record('c1', 'fp', clean=True, now=0)
+            delays.append(self.store.nodes['c1']['next_visit'])
+
+        self.assertEqual([10, 20, 35, 35], delays)
+        self.assertFalse(self.store.is_due('c1', now=34))
+        self.assertTrue(self.store.is_due('c1', now=35))
+
+    def test_dirty_scan_resets_backoff(self) -> None:
+        """Test nodes with processes to terminate are revisited every sweep"""
+
+        self.store.record('c1', 'fp', clean=True, now=0)
+        self.store.record('c1', 'fp', clean=False, now=0)
+        self.assertTrue(self.store.is_due('c1', now=0))
+        self.assertFalse(self.store.is_unchanged('c1', 'fp'))
+
+    def test_unchanged_fingerprint(self) -> None:
+        """Test full scans are only skipped for clean nodes with a matching fingerprint"""
+
+        self.store.record('c1', 'fp', clean=True)
+        self.assertTrue(self.store.is_unchanged('c1', 'fp'))
+        self.assertFalse(self.store.is_unchanged('c1', 'other'))
+
+
+class Survivors(TestCase):
+    """Test the tracking of processes that survive termination"""
+
+    def test_survivors_remembered(self) -> None:
+        """Test survivors are returned while the node has not rebooted"""
+
+        store = NodeStateStore()
+        store.record('c1', 'boot1:300:100', clean=False, survivors=[42, 7])
+        self.assertEqual({7, 42}, store.survivors('c1', 'boot1:310:120'))
+
+    def test_reboot_clears_survivors(self) -> None:
+        """Test survivors are forgotten once the boot ID changes"""
+
+        store = NodeStateStore()
+        store.record('c1', 'boot1:300:100', clean=False, survivors=[42])
+        self.assertEqual(set(), store.survivors('c1', 'boot2:300:100'))
+        self.assertEqual(set(), store.survivors('c2', 'boot1:300:100'))
+
+
+class Rank(TestCase):
+    """Test nodes are ordered by the resources held on their last visit"""
+
+    def test_rank(self) -> None:
+        """Test nodes are ordered by CPU then memory usage with unknown nodes last"""
+
+        store = NodeStateStore()
+        store.record('c1', 'fp', clean=False, cpu=10.0, rss=100)
+        store.record('c2', 'fp', clean=False, cpu=90.0, rss=100)
+        store.record('c3', 'fp', clean=False, cpu=10.0, rss=5000)
+        store.record('c4', 'fp', clean=True)
+
+        self.assertEqual(['c2', 'c3', 'c1', 'a5', 'c4'], store.rank(['c1', 'c2', 'c3', 'c4', 'a5']))
+
+
+class Persistence(TestCase):
+    """Test node state is saved to and loaded from disk"""
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the state file"""
+
+        self.tmp_dir = TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'state.json'
+
+    def tearDown(self) -> None:
+        """Delete temporary files"""
+
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self) -> None:
+        """Test saved state is restored by a new store"""
+
+        store = NodeStateStore(self.path)
+        store.record('c1', 'fp', clean=True)
+        store.save()
+
+        self.assertEqual(store.nodes, NodeStateStore(self.path).nodes)
+
+    def test_corrupt_file_is_ignored(self) -> None:
+        """Test an unreadable state file results in an empty store"""
+
+        self.path.write_text('{not json')
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual({}, NodeStateStore(self.path).nodes)
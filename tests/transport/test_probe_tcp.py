@@ -0,0 +1,33 @@
+"""Tests for the `transport.probe_tcp` function"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from shinigami.transport import probe_tcp
+
+
+class ProbeTcp(IsolatedAsyncioTestCase):
+    """Test the TCP reachability check"""
+
+    async def test_open_port(self) -> None:
+        """Test no error is raised for a listening port"""
+
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await probe_tcp('127.0.0.1', port, timeout=1)
+
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def test_closed_port(self) -> None:
+        """Test a `ConnectionError` is raised for a closed port"""
+
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+        with self.assertRaises(ConnectionError):
+            await probe_tcp('127.0.0.1', port, timeout=1)
@@ -0,0 +1,150 @@
+"""Tests for the command transports in the `transport` module"""
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, call, patch
+
+import asyncssh
+
+from shinigami.cli import Application
+from shinigami.kill import KillEngine
+from shinigami.pool import ConnectionPool
+from shinigami.session import CommandResult
+from shinigami.transport import FakeTransport, LocalTransport, SSHTransport
+from shinigami.utils import PS_COMMAND, terminate_errant_processes
+
+PS_OUTPUT = '\n'.join([
+    '       PID       PPID       PGID        UID CMD',
+    '         1          0          1          0 /usr/lib/systemd/systemd',
+    '       100          1        100       1001 orphaned_job',
+    '       200          1        200          0 sshd',
+])
+
+
+class Local(IsolatedAsyncioTestCase):
+    """Test commands are run in local subprocesses"""
+
+    async def test_run(self) -> None:
+        """Test command output and input are passed through"""
+
+        async with LocalTransport().connect('ignored') as runner:
+            result = await runner.run('cat', input='hello')
+
+        self.assertEqual('hello', result.stdout)
+        self.assertEqual(0, result.exit_status)
+
+    async def test_check(self) -> None:
+        """Test a `RuntimeError` is raised for failed commands when `check` is set"""
+
+        async with LocalTransport().connect('ignored') as runner:
+            self.assertEqual(3, (await runner.run('exit 3')).exit_status)
+            with self.assertRaises(RuntimeError):
+                await runner.run('exit 3', check=True)
+
+
+class Fake(IsolatedAsyncioTestCase):
+    """Test the in-memory transport"""
+
+    async def test_canned_responses(self) -> None:
+        """Test canned output is returned and commands are recorded"""
+
+        transport = FakeTransport({'n1': {'hostname': 'n1\n', 'false': CommandResult('false', '', '', 1)}})
+        async with transport.connect('n1') as runner:
+            self.assertEqual('n1\n', (await runner.run('hostname')).stdout)
+            self.assertEqual('', (await runner.run('true')).stdout)
+            with self.assertRaises(RuntimeError):
+                await runner.run('false', check=True)
+
+        self.assertEqual(['hostname', 'true', 'false'], transport.commands['n1'])
+
+    async def test_unknown_node(self) -> None:
+        """Test connecting to an unknown node raises a `ConnectionRefusedError`"""
+
+        with self.assertRaises(ConnectionRefusedError):
+            async with FakeTransport({}).connect('n1'):
+                pass  # pragma: nocover
+
+    async def test_terminate_errant_processes(self) -> None:
+        """Test orphaned processes are terminated without an SSH connection"""
+
+        transport = FakeTransport({'n1': {PS_COMMAND: PS_OUTPUT}})
+        marked = await terminate_errant_processes(
+            'n1', [[1000, 2000]], transport=transport, kill_engine=KillEngine(poll_interval=0))
+
+        self.assertEqual([100], list(marked.pid))
+        self.assertIn('pkill --signal TERM --pgroup 100', transport.commands['n1'])
+
+
+class SSH(IsolatedAsyncioTestCase):
+    """Test the reachability probe of the SSH transport"""
+
+    async def test_pooled_nodes_not_probed(self) -> None:
+        """Test nodes with an open pooled connection are not probed"""
+
+        pool = MagicMock()
+        pool.__contains__.return_value = True
+        with patch('shinigami.transport.probe_tcp') as probe:
+            await SSHTransport(pool=pool).probe('n1', 1)
+
+        probe.assert_not_called()
+
+    async def test_new_nodes_probed(self) -> None:
+        """Test nodes without a pooled connection are probed"""
+
+        with patch('shinigami.transport.probe_tcp') as probe:
+            await SSHTransport().probe('n1', 1)
+
+        probe.assert_called_once_with('n1', 22, timeout=1)
+
+    async def test_probe_uses_ssh_config(self) -> None:
+        """Test the probed address honors the `HostName` and `Port` settings of the SSH config"""
+
+        with TemporaryDirectory() as tmp_dir:
+            config_path = Path(tmp_dir) / 'config'
+            config_path.write_text('Host n1\n    HostName 127.0.0.1\n    Port 2222\n')
+            ssh_options = asyncssh.SSHClientConnectionOptions(config=[str(config_path)], known_hosts=None)
+
+            transport = SSHTransport(ssh_options)
+            with patch('shinigami.transport.probe_tcp') as probe:
+                await transport.probe('n1', 1)
+                await transport.probe('n2', 1)
+
+        self.assertEqual(
+            [call('127.0.0.1', 2222, timeout=1), call('n2', 22, timeout=1)], probe.call_args_list)
+
+    async def test_sweeps_reuse_pool(self) -> None:
+        """Test repeated sweeps open one pooled connection per node and reuse it"""
+
+        class FakeConnection:
+            """Stand in for an `asyncssh.SSHClientConnection` instance"""
+
+            def __init__(self) -> None:
+                self.closed = asyncio.Event()
+
+            async def run(self, command: str, input: str = None, check: bool = False) -> CommandResult:
+                return CommandResult(command, PS_OUTPUT if command == PS_COMMAND else '', '', 0)
+
+            def close(self) -> None:
+                self.closed.set()
+
+            async def wait_closed(self) -> None:
+                await self.closed.wait()
+
+        async def connect(node: str, options: None) -> FakeConnection:
+            return FakeConnection()
+
+        pool = ConnectionPool()
+        node_states = {'c1': {'n1': 'idle', 'n2': 'idle'}}
+        with patch('asyncssh.connect', side_effect=connect) as connect_mock, \
+                patch('shinigami.utils.get_node_states', return_value=node_states), \
+                patch('shinigami.utils.terminate_errant_processes', wraps=terminate_errant_processes) as terminate:
+            for _ in range(2):
+                await Application.scan(['c1'], [], [0], 2, 1, True, pool=pool)
+
+            self.assertEqual(2, len(pool))
+            await pool.close()
+
+        self.assertEqual(4, terminate.call_count)
+        self.assertEqual(2, connect_mock.call_count)
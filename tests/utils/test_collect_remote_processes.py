@@ -0,0 +1,41 @@
+"""Tests for the `utils.collect_remote_processes` function."""
+
+import inspect
+import json
+import shlex
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from shinigami import collector
+from shinigami.utils import collect_remote_processes, INIT_PROCESS_ID
+
+
+class CollectRemoteProcesses(IsolatedAsyncioTestCase):
+    """Test the remote collector is invoked with the filtering options"""
+
+    async def asyncSetUp(self) -> None:
+        """Run the function against a mock SSH connection"""
+
+        self.conn = MagicMock()
+        self.conn.run = AsyncMock(return_value=MagicMock(stdout=f'{collector.HEADER}\n10 1 10 1001 0.5 2048 60 S sleep 100\n'))
+        self.table = await collect_remote_processes(self.conn, [0, [1000, 2000]])
+
+    def test_collector_source_is_piped(self) -> None:
+        """Test the collector source is passed to python3 via stdin"""
+
+        command = self.conn.run.call_args.args[0]
+        self.assertEqual(['python3', '-'], shlex.split(command)[:2])
+        self.assertEqual(inspect.getsource(collector), self.conn.run.call_args.kwargs['input'])
+
+    def test_options_are_passed(self) -> None:
+        """Test filtering options are passed as a JSON argument"""
+
+        options = json.loads(shlex.split(self.conn.run.call_args.args[0])[2])
+        self.assertEqual({'init_pid': INIT_PROCESS_ID, 'uid_whitelist': [0, [1000, 2000]]}, options)
+
+    def test_output_is_parsed(self) -> None:
+        """Test the collector output is returned as a process table"""
+
+        self.assertEqual([10], list(self.table.pid))
+        self.assertEqual(['sleep 100'], self.table.cmd)
+        self.assertEqual([2048], list(self.table.rss))
@@ -4,6 +4,7 @@ import unittest
 
 import pandas as pd
 
+from shinigami.process_table import ProcessTable
 from shinigami.utils import exclude_active_slurm_users
 
 
@@ -42,3 +43,41 @@ class ExcludeSlurmUsers(unittest.TestCase):
 
         returned_df = exclude_active_slurm_users(input_df)
         self.assertTrue(returned_df.empty)
+
+
+class ExcludeSlurmUsersProcessTable(unittest.TestCase):
+    """Test the identification of slurm users from a `ProcessTable`"""
+
+    def test_matches_dataframe_behavior(self) -> None:
+        """Test the returned table matches the rows returned for a DataFrame"""
+
+        uids = [1001, 1002, 1002, 1003, 1004]
+        cmds = ['process 1', '... slurmd ...', 'process 3', 'process 4', 'process5']
+        input_table = ProcessTable(pid=range(5), ppid=[1] * 5, pgid=range(5), uid=uids, cmd=cmds)
+
+        returned_table = exclude_active_slurm_users(input_table)
+        expected_df = exclude_active_slurm_users(pd.DataFrame({'UID': uids, 'CMD': cmds}))
+        self.assertEqual(list(expected_df['UID']), list(returned_table.uid))
+        self.assertEqual(list(expected_df['CMD']), returned_table.cmd)
+
+    def test_all_slurm_users(self) -> None:
+        """Test the returned table is empty when all processes contain `slurmd`"""
+
+        input_table = ProcessTable(pid=[1, 2], ppid=[1, 1], pgid=[1, 2], uid=[1001, 1002], cmd=['slurmd', 'x slurmd'])
+        self.assertTrue(exclude_active_slurm_users(input_table).empty)
+
+
+class ExplicitActiveUsers(unittest.TestCase):
+    """Test excluding users identified by an active job source"""
+
+    def test_given_uids_are_excluded(self) -> None:
+        """Test the given users are excluded without inspecting process commands"""
+
+        uids = [1001, 1002, 1003]
+        cmds = ['job step', 'slurmd', 'orphan']
+        input_table = ProcessTable(pid=range(3), ppid=[1] * 3, pgid=range(3), uid=uids, cmd=cmds)
+
+        returned_table = exclude_active_slurm_users(input_table, active_uids={1001})
+        returned_df = exclude_active_slurm_users(pd.DataFrame({'UID': uids, 'CMD': cmds}), active_uids={1001})
+        self.assertEqual([1002, 1003], list(returned_table.uid))
+        self.assertEqual([1002, 1003], list(returned_df['UID']))
@@ -0,0 +1,32 @@
+"""Tests for the `utils.exclude_known_survivors` function"""
+
+import unittest
+
+import pandas as pd
+
+from shinigami.process_table import ProcessTable
+from shinigami.utils import exclude_known_survivors
+
+
+class ExcludeKnownSurvivors(unittest.TestCase):
+    """Test processes that survived an earlier termination are excluded"""
+
+    def test_survivors_excluded(self) -> None:
+        """Test known survivors are removed from a DataFrame"""
+
+        input_df = pd.DataFrame({'PID': [10, 11, 12], 'PGID': [10, 10, 12]})
+        returned_df = exclude_known_survivors(input_df, [11])
+        pd.testing.assert_frame_equal(returned_df, input_df.loc[[0, 2]])
+
+    def test_no_survivors(self) -> None:
+        """Test the data is unchanged when there are no known survivors"""
+
+        input_df = pd.DataFrame({'PID': [10, 11, 12], 'PGID': [10, 10, 12]})
+        pd.testing.assert_frame_equal(exclude_known_survivors(input_df), input_df)
+
+    def test_process_table(self) -> None:
+        """Test known survivors are removed from a `ProcessTable`"""
+
+        table = ProcessTable(pid=[10, 11, 12], ppid=[1, 10, 1], pgid=[10, 10, 12], uid=[0, 0, 0], cmd=['a', 'b', 'c'])
+        expected = ProcessTable(pid=[10, 12], ppid=[1, 1], pgid=[10, 12], uid=[0, 0], cmd=['a', 'c'])
+        self.assertEqual(expected, exclude_known_survivors(table, {11}))
@@ -0,0 +1,100 @@
+"""Tests for the `utils.get_node_states` function."""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, skipIf
+from unittest.mock import patch
+
+from shinigami import utils
+
+# For information on resources defined in the testing environment
+# see https://github.com/pitt-crc/Slurm-Test-Environment/
+TEST_CLUSTER = 'development'
+TEST_NODES = set(f'c{i}' for i in range(1, 11))
+
+
+def slurm_is_installed() -> bool:
+    """Return whether `sbatch` is installed and accessible on the parent machine"""
+
+    try:
+        subprocess.run(['sbatch', '--version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        return True
+
+    # Catch all errors, but list the expected error(s) explicitly
+    except (FileNotFoundError, Exception):
+        return False
+
+
+class NodeCache(IsolatedAsyncioTestCase):
+    """Test the reading and writing of the on-disk node cache"""
+
+    def setUp(self) -> None:
+        """Create a temporary cache file path"""
+
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_path = Path(self.tmp_dir.name) / 'nodes.json'
+        self.node_states = {'dev': {'c1': 'idle', 'c2': 'down'}}
+
+    def tearDown(self) -> None:
+        """Delete temporary files"""
+
+        self.tmp_dir.cleanup()
+
+    def write_cache(self, age: float) -> None:
+        """Write node states to the cache file with the given age in seconds"""
+
+        cache = {'timestamp': time.time() - age, 'clusters': self.node_states}
+        self.cache_path.write_text(json.dumps(cache))
+
+    async def test_fresh_cache_is_used(self) -> None:
+        """Test sinfo is not called when the cache is fresh"""
+
+        self.write_cache(age=10)
+        with patch('asyncio.create_subprocess_exec') as sinfo:
+            returned = await utils.get_node_states(['dev'], self.cache_path, cache_ttl=60)
+
+        sinfo.assert_not_called()
+        self.assertEqual(self.node_states, returned)
+
+    async def test_stale_cache_is_ignored(self) -> None:
+        """Test sinfo is called when the cache is older than the TTL"""
+
+        self.write_cache(age=120)
+        with patch('shinigami.utils.parse_sinfo_output', return_value={'dev': {}}), \
+                patch('asyncio.create_subprocess_exec') as sinfo:
+            sinfo.return_value.communicate.return_value = (b'', b'')
+            returned = await utils.get_node_states(['dev'], self.cache_path, cache_ttl=60)
+
+        sinfo.assert_called_once()
+        self.assertEqual({'dev': {}}, returned)
+        self.assertEqual({'dev': {}}, json.loads(self.cache_path.read_text())['clusters'])
+
+    async def test_missing_cluster_ignores_cache(self) -> None:
+        """Test the cache is ignored when it does not include every requested cluster"""
+
+        self.write_cache(age=0)
+        with patch('asyncio.create_subprocess_exec') as sinfo:
+            sinfo.return_value.communicate.return_value = (b'CLUSTER: dev\nCLUSTER: other\n', b'')
+            await utils.get_node_states(['dev', 'other'], self.cache_path, cache_ttl=60)
+
+        sinfo.assert_called_once()
+
+
+@skipIf(not slurm_is_installed(), 'These tests require slurm to be installed.')
+class GetNodeStates(IsolatedAsyncioTestCase):
+    """Tests for node discovery against a live Slurm installation"""
+
+    async def test_nodes_match_test_env(self) -> None:
+        """Test the returned node list matches values defined in the testing environment"""
+
+        node_states = await utils.get_node_states([TEST_CLUSTER])
+        self.assertEqual(TEST_NODES, set(node_states[TEST_CLUSTER]))
+
+    async def test_missing_cluster(self) -> None:
+        """Test an error is raised for a cluster name that does not exist"""
+
+        with self.assertRaisesRegex(RuntimeError, 'No cluster \'fake_cluster\''):
+            await utils.get_node_states(['fake_cluster'])
@@ -4,6 +4,8 @@ import unittest
 
 import pandas as pd
 
+from shinigami.process_table import ProcessTable
+from shinigami.process_tree import ProcessTree
 from shinigami.utils import include_orphaned_processes, INIT_PROCESS_ID
 
 
@@ -43,3 +45,42 @@ class OrphanedProcesses(unittest.TestCase):
 
         returned_df = include_orphaned_processes(input_df)
         pd.testing.assert_frame_equal(returned_df, input_df)
+
+
+class OrphanedProcessesProcessTable(unittest.TestCase):
+    """Test the identification of orphaned processes from a `ProcessTable`"""
+
+    def test_matches_dataframe_behavior(self) -> None:
+        """Test the returned table matches the rows returned for a DataFrame"""
+
+        pids = [1, 2, 3, 4, 5]
+        ppids = [0, INIT_PROCESS_ID, INIT_PROCESS_ID, 2000, 2000]
+        input_table = ProcessTable(pid=pids, ppid=ppids, pgid=pids, uid=[0] * 5, cmd=[''] * 5)
+
+        returned_table = include_orphaned_processes(input_table)
+        expected_df = include_orphaned_processes(pd.DataFrame({'PID': pids, 'PPID': ppids}))
+        self.assertEqual(list(expected_df['PID']), list(returned_table.pid))
+
+    def test_no_orphaned_processes(self) -> None:
+        """Test the returned table is empty when no orphaned processes are present"""
+
+        input_table = ProcessTable(pid=[1, 2], ppid=[0, 2], pgid=[1, 2], uid=[0, 0], cmd=['', ''])
+        self.assertTrue(include_orphaned_processes(input_table).empty)
+
+    def test_descendants_are_included(self) -> None:
+        """Test descendants of orphaned processes are returned"""
+
+        input_table = ProcessTable(
+            pid=[1, 2, 3, 4], ppid=[0, INIT_PROCESS_ID, 2, 3], pgid=[1, 2, 3, 4], uid=[0] * 4, cmd=[''] * 4)
+
+        self.assertEqual([2, 3, 4], list(include_orphaned_processes(input_table).pid))
+
+    def test_tree_from_unfiltered_data(self) -> None:
+        """Test a tree built from the full process data links rows removed by earlier filters"""
+
+        full_table = ProcessTable(
+            pid=[1, 2, 3, 4], ppid=[0, INIT_PROCESS_ID, 2, 3], pgid=[1, 2, 3, 4], uid=[0] * 4, cmd=[''] * 4)
+
+        tree = ProcessTree.from_table(full_table, init_pid=INIT_PROCESS_ID)
+        filtered_table = full_table.filter([True, False, False, True])
+        self.assertEqual([4], list(include_orphaned_processes(filtered_table, tree).pid))
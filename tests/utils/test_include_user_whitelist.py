@@ -4,6 +4,7 @@ from unittest import TestCase
 
 import pandas as pd
 
+from shinigami.process_table import ProcessTable
 from shinigami.utils import include_user_whitelist
 
 
@@ -38,3 +39,27 @@ class UserIDs(TestCase):
         whitelist = (1, 2, (100, 500))
         returned_df = include_user_whitelist(self.testing_data, whitelist)
         self.assertCountEqual(returned_df['UID'].unique(), {123, 456})
+
+
+class UserIDsProcessTable(TestCase):
+    """Test the identification of whitelisted user IDs from a `ProcessTable`"""
+
+    def setUp(self) -> None:
+        """Define a table with example process data"""
+
+        uids = [0, 123, 123, 456, 789]
+        self.testing_data = ProcessTable(pid=range(5), ppid=[1] * 5, pgid=range(5), uid=uids, cmd=[''] * 5)
+        self.testing_df = pd.DataFrame({'UID': uids})
+
+    def test_empty_whitelist(self) -> None:
+        """Test the returned table is empty when the whitelist is empty"""
+
+        self.assertTrue(include_user_whitelist(self.testing_data, []).empty)
+
+    def test_matches_dataframe_behavior(self) -> None:
+        """Test the returned table matches the rows returned for a DataFrame"""
+
+        for whitelist in [(123, 456), (1, 2, (100, 500)), ((0, 123), 789)]:
+            returned_table = include_user_whitelist(self.testing_data, whitelist)
+            expected_df = include_user_whitelist(self.testing_df, whitelist)
+            self.assertEqual(list(expected_df['UID']), list(returned_table.uid))
@@ -0,0 +1,43 @@
+"""Tests for the `utils.is_skipped_state` function."""
+
+from unittest import TestCase
+
+from shinigami.utils import is_skipped_state
+
+
+class DefaultSkipStates(TestCase):
+    """Test the default selection of skipped node states"""
+
+    def test_healthy_states(self) -> None:
+        """Test nodes in a healthy state are not skipped"""
+
+        for state in ('idle', 'mixed', 'allocated', 'draining', 'completing'):
+            self.assertFalse(is_skipped_state(state), state)
+
+    def test_unavailable_states(self) -> None:
+        """Test nodes in an unavailable state are skipped"""
+
+        for state in ('down', 'drained', 'fail', 'future'):
+            self.assertTrue(is_skipped_state(state), state)
+
+    def test_state_flags(self) -> None:
+        """Test nodes that are not responding or are powered off are skipped"""
+
+        self.assertTrue(is_skipped_state('idle*'))
+        self.assertTrue(is_skipped_state('idle~'))
+        self.assertFalse(is_skipped_state('mixed@'))
+
+
+class CustomSkipStates(TestCase):
+    """Test the selection of skipped node states from a custom list"""
+
+    def test_custom_states(self) -> None:
+        """Test only the given states are skipped"""
+
+        self.assertTrue(is_skipped_state('idle', ['idle']))
+        self.assertFalse(is_skipped_state('down', ['idle']))
+
+    def test_empty_states(self) -> None:
+        """Test no nodes are skipped for an empty list of states"""
+
+        self.assertFalse(is_skipped_state('down*', []))
@@ -0,0 +1,34 @@
+"""Tests for the `utils.parse_sinfo_output` function."""
+
+from unittest import TestCase
+
+from shinigami.utils import parse_sinfo_output
+
+
+class ParseSinfoOutput(TestCase):
+    """Test the parsing of node names and states from sinfo output"""
+
+    def test_single_cluster(self) -> None:
+        """Test output without cluster headers is assigned to the only cluster"""
+
+        output = 'c1 idle\nc2 mixed\nc3 down*\n'
+        expected = {'dev': {'c1': 'idle', 'c2': 'mixed', 'c3': 'down*'}}
+        self.assertEqual(expected, parse_sinfo_output(output, ['dev']))
+
+    def test_multiple_clusters(self) -> None:
+        """Test nodes are grouped by the preceding cluster header"""
+
+        output = 'CLUSTER: smp\nc1 idle\nc2 allocated\nCLUSTER: gpu\ng1 drained\n'
+        expected = {'smp': {'c1': 'idle', 'c2': 'allocated'}, 'gpu': {'g1': 'drained'}}
+        self.assertEqual(expected, parse_sinfo_output(output, ['smp', 'gpu']))
+
+    def test_duplicate_nodes(self) -> None:
+        """Test nodes listed under multiple partitions are only included once"""
+
+        output = 'c1 idle\nc1 idle\nc2 mixed\n'
+        self.assertEqual({'dev': {'c1': 'idle', 'c2': 'mixed'}}, parse_sinfo_output(output, ['dev']))
+
+    def test_states_are_lowercase(self) -> None:
+        """Test returned node states are normalized to lowercase"""
+
+        self.assertEqual({'dev': {'c1': 'idle'}}, parse_sinfo_output('c1 IDLE', ['dev']))
@@ -0,0 +1,69 @@
+"""Tests for the `utils.stream_remote_processes` function"""
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from shinigami.policy import ProcessPolicy
+from shinigami.process_table import ProcessTable
+from shinigami.utils import PS_COMMAND, filter_processes, stream_remote_processes
+
+PS_OUTPUT = """\
+       PID       PPID       PGID        UID CMD
+         1          0          1          0 /sbin/init
+        10          1         10          0 /usr/sbin/slurmd -D
+       200          1        200       1001 python script.py
+       300        200        200       1001 bash
+"""
+
+
+def mock_connection(output: str, exit_status: int = 0, chunk_size: int = 16) -> MagicMock:
+    """Return a mock SSH connection whose process streams output in fixed size chunks"""
+
+    chunks = [output[i:i + chunk_size] for i in range(0, len(output), chunk_size)] + ['']
+    process = MagicMock()
+    process.stdout.read = AsyncMock(side_effect=chunks)
+    process.wait = AsyncMock(return_value=MagicMock(exit_status=exit_status, stderr='ps: error'))
+    process.__aenter__ = AsyncMock(return_value=process)
+    process.__aexit__ = AsyncMock(return_value=None)
+
+    conn = MagicMock()
+    conn.create_process = MagicMock(return_value=process)
+    return conn
+
+
+class StreamRemoteProcesses(IsolatedAsyncioTestCase):
+    """Test fetching process data with the streaming parser"""
+
+    async def test_parsed_table(self) -> None:
+        """Test all rows are parsed and commands are only kept for candidate rows"""
+
+        conn = mock_connection(PS_OUTPUT)
+        table = await stream_remote_processes(conn)
+
+        conn.create_process.assert_called_once_with(PS_COMMAND)
+        self.assertEqual([1, 10, 200, 300], list(table.pid))
+        self.assertEqual(['', '/usr/sbin/slurmd -D', 'python script.py', ''], table.cmd)
+
+    async def test_all_commands_kept(self) -> None:
+        """Test commands are kept for every row when requested"""
+
+        table = await stream_remote_processes(mock_connection(PS_OUTPUT), keep_all_commands=True)
+        self.assertEqual(['/sbin/init', '/usr/sbin/slurmd -D', 'python script.py', 'bash'], table.cmd)
+
+    async def test_command_policy(self) -> None:
+        """Test command patterns select the same processes from streamed and fully parsed tables"""
+
+        output = PS_OUTPUT + '       400        200        400       1001 tmux new -s work\n'
+        policy = ProcessPolicy([1001], allow_commands=['^tmux'])
+        streamed = await stream_remote_processes(mock_connection(output), keep_all_commands=policy.matches_commands)
+
+        expected = filter_processes(ProcessTable.from_ps_output(output), [1001], active_uids=[], policy=policy)
+        selected = filter_processes(streamed, [1001], active_uids=[], policy=policy)
+        self.assertEqual([200, 300], list(expected.pid))
+        self.assertEqual(list(expected.pid), list(selected.pid))
+
+    async def test_nonzero_exit_status(self) -> None:
+        """Test a `RuntimeError` is raised when ps fails"""
+
+        with self.assertRaisesRegex(RuntimeError, 'ps: error'):
+            await stream_remote_processes(mock_connection('', exit_status=1))
@@ -0,0 +1,54 @@
+"""Tests for the `workers.run_sharded` function"""
+
+import os
+from unittest import IsolatedAsyncioTestCase
+
+from shinigami.report import NodeResult
+from shinigami.workers import Shard, ShardResult, run_sharded
+
+
+async def scan_shard(shard: Shard, status: str) -> ShardResult:
+    """Return a result for each node in the shard along with the worker PID"""
+
+    if 'broken' in shard:
+        raise RuntimeError('worker failed')
+
+    result = ShardResult()
+    for cluster, nodes in shard.items():
+        for node in nodes:
+            result.write(NodeResult(node, cluster, status, pids=[os.getpid()]))
+
+    return result
+
+
+class WorkerProcesses(IsolatedAsyncioTestCase):
+    """Test shards are processed in separate worker processes"""
+
+    async def test_results_returned(self) -> None:
+        """Test results from each shard are returned to the parent process"""
+
+        shards = [{'c1': ['n0', 'n1']}, {'c1': ['n2']}]
+        outcomes = [outcome async for outcome in run_sharded(shards, scan_shard, status='clean')]
+
+        results = [result for _, shard_result in outcomes for result in shard_result.results]
+        self.assertCountEqual(['n0', 'n1', 'n2'], [result.node for result in results])
+        self.assertTrue(all(result.status == 'clean' for result in results))
+        self.assertNotIn(os.getpid(), {result.pids[0] for result in results})
+
+    async def test_worker_errors_returned(self) -> None:
+        """Test exceptions raised in a worker are returned with their shard"""
+
+        shards = [{'broken': ['n0']}, {'c1': ['n1']}]
+        outcomes = {tuple(shard): result async for shard, result in run_sharded(shards, scan_shard, status='clean')}
+
+        self.assertIsInstance(outcomes[('broken',)], RuntimeError)
+        self.assertIsInstance(outcomes[('c1',)], ShardResult)
+
+    async def test_shard_kwargs(self) -> None:
+        """Test per-shard keyword arguments are passed to the matching shard only"""
+
+        shards = [{'c1': ['n0']}, {'c1': ['n1']}]
+        outcomes = run_sharded(shards, scan_shard, shard_kwargs=[{'status': 'clean'}, {'status': 'error'}])
+        statuses = {result.node: result.status async for _, shard_result in outcomes for result in shard_result.results}
+
+        self.assertEqual({'n0': 'clean', 'n1': 'error'}, statuses)
@@ -0,0 +1,63 @@
+"""Tests for the `workers.shard_nodes` function"""
+
+from unittest import TestCase
+
+from shinigami.scheduler import Scheduler
+from shinigami.workers import shard_nodes
+
+
+class ShardBalance(TestCase):
+    """Test nodes are split into balanced shards"""
+
+    def test_ungrouped_nodes_balanced(self) -> None:
+        """Test ungrouped nodes are spread evenly between shards"""
+
+        nodes = {'c1': [f'n{i}' for i in range(10)], 'c2': ['m0', 'm1']}
+        shards = shard_nodes(nodes, 3, Scheduler(1))
+
+        sizes = sorted(sum(map(len, shard.values())) for shard in shards)
+        self.assertEqual([4, 4, 4], sizes)
+
+    def test_every_node_assigned_once(self) -> None:
+        """Test each node is assigned to exactly one shard under its original cluster"""
+
+        nodes = {'c1': ['n0', 'n1', 'n2'], 'c2': ['m0']}
+        shards = shard_nodes(nodes, 2, Scheduler(1))
+
+        assigned = [(cluster, node) for shard in shards for cluster, cluster_nodes in shard.items() for node in cluster_nodes]
+        self.assertCountEqual([('c1', 'n0'), ('c1', 'n1'), ('c1', 'n2'), ('c2', 'm0')], assigned)
+
+    def test_empty_shards_dropped(self) -> None:
+        """Test no empty shards are returned when there are more workers than nodes"""
+
+        shards = shard_nodes({'c1': ['n0', 'n1']}, 4, Scheduler(1))
+        self.assertEqual(2, len(shards))
+
+
+class ShardOrder(TestCase):
+    """Test shards preserve the order of the given nodes"""
+
+    def test_order_preserved(self) -> None:
+        """Test nodes keep their relative order within each shard"""
+
+        ranked = ['n5', 'n2', 'n9', 'n0', 'n7', 'n1']
+        for shard in shard_nodes({'c1': ranked}, 2, Scheduler(1)):
+            self.assertEqual([node for node in ranked if node in shard['c1']], shard['c1'])
+
+
+class ShardGroups(TestCase):
+    """Test node groups are kept together"""
+
+    def test_groups_not_split(self) -> None:
+        """Test all nodes in a group are assigned to the same shard"""
+
+        nodes = {'c1': ['r1-n1', 'r1-n2', 'r1-n3', 'r2-n1', 'r2-n2', 'r3-n1']}
+        shards = shard_nodes(nodes, 2, Scheduler(1, group_pattern=r'^(r\d+)-'))
+
+        for shard in shards:
+            racks = {node.split('-')[0] for node in shard['c1']}
+            for rack in racks:
+                self.assertTrue(all(node in shard['c1'] for node in nodes['c1'] if node.startswith(rack + '-')))
+
+        sizes = sorted(len(shard['c1']) for shard in shards)
+        self.assertEqual([3, 3], sizes)
@@ -0,0 +1,26 @@
+"""Tests for the `workers.split_budget` function"""
+
+from unittest import TestCase
+
+from shinigami.workers import split_budget
+
+
+class BudgetSplit(TestCase):
+    """Test budgets are split into near equal parts"""
+
+    def test_even_split(self) -> None:
+        """Test a divisible budget is split into equal parts"""
+
+        self.assertEqual([4, 4, 4], split_budget(12, 3))
+
+    def test_remainder_spread(self) -> None:
+        """Test the remainder is spread across the leading parts"""
+
+        self.assertEqual([3, 3, 2, 2], split_budget(10, 4))
+
+    def test_parts_sum_to_total(self) -> None:
+        """Test the parts always sum to the total budget"""
+
+        for total in range(1, 20):
+            for parts in range(1, total + 1):
+                self.assertEqual(total, sum(split_budget(total, parts)))